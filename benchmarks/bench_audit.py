@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark: transcript audit throughput and memory
+
+Writes synthetic session transcripts (Bash, Write, Edit and Read calls,
+with a multi-MB Write every few thousand lines) of two sizes and audits
+them with hooklib.audit, reporting lines per second and the peak Python
+allocation (tracemalloc, in a separate untimed run). Peak memory should
+not grow with transcript length; it is bounded by the longest line.
+
+Usage:
+  python3 benchmarks/bench_audit.py [--lines N] [--files F] [--jobs J]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from hooklib import audit
+
+MB = 1024 * 1024
+
+CALLS = [
+    ("Bash", {"command": "npm test -- --watch=false"}),
+    ("Bash", {"command": "npm run dev"}),
+    ("Bash", {"command": "git status && rm -rf build/"}),
+    ("Write", {"file_path": "src/app.ts", "content": "export const app = 1;\n" * 50}),
+    ("Edit", {"file_path": ".env", "old_string": "A=1", "new_string": "A=2"}),
+    ("Read", {"file_path": "README.md"}),
+]
+
+def line(cwd: str, number: int) -> str:
+    """One transcript line: a tool call, a user turn or a huge Write."""
+    if number % 5000 == 4999:
+        name, tool_input = "Write", {"file_path": "dist/bundle.js", "content": "x" * (2 * MB)}
+    elif number % 3 == 0:
+        return json.dumps({"type": "user", "message": {"role": "user", "content": "continue"}})
+    else:
+        name, tool_input = CALLS[number % len(CALLS)]
+    return json.dumps({
+        "type": "assistant", "cwd": cwd, "sessionId": "bench",
+        "message": {"role": "assistant", "content": [
+            {"type": "text", "text": "Running the next step."},
+            {"type": "tool_use", "id": f"toolu_{number}", "name": name, "input": tool_input},
+        ]},
+    })
+
+def write_transcripts(directory: Path, files: int, lines: int, cwd: str) -> int:
+    """Write `files` transcripts of `lines` lines; returns total bytes."""
+    directory.mkdir(parents=True)
+    size = 0
+    for index in range(files):
+        path = directory / f"session-{index}.jsonl"
+        with open(path, "w") as f:
+            for number in range(lines):
+                f.write(line(cwd, number) + "\n")
+        size += path.stat().st_size
+    return size
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--lines", type=int, default=20000, help="lines per transcript (small run)")
+    parser.add_argument("--files", type=int, default=4)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Path(tmp) / "project"
+        (project / ".git").mkdir(parents=True)
+        print(f"{'lines/file':>10} {'MB':>7} {'ms (1 proc)':>12} {'lines/s':>10} {'peak MB':>8} "
+              f"{'ms (' + str(args.jobs) + ' procs)':>14}")
+        for scale in (1, 5):
+            lines = args.lines * scale
+            directory = Path(tmp) / f"transcripts-{scale}"
+            size = write_transcripts(directory, args.files, lines, str(project))
+
+            start = time.perf_counter()
+            serial = audit.audit([str(directory)], workers=1)
+            serial_ms = (time.perf_counter() - start) * 1000
+
+            tracemalloc.start()
+            audit.audit([str(directory)], workers=1)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            start = time.perf_counter()
+            pooled = audit.audit([str(directory)], workers=args.jobs)
+            pool_ms = (time.perf_counter() - start) * 1000
+            assert serial == pooled
+
+            total_lines = lines * args.files
+            print(f"{lines:>10} {size / MB:>7.1f} {serial_ms:>12.0f} "
+                  f"{total_lines / serial_ms * 1000:>10,.0f} {peak / MB:>8.1f} {pool_ms:>14.0f}")
+
+if __name__ == "__main__":
+    main()
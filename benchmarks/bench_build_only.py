@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark: enforce-build-only.py command matching
+
+Compares the compiled single-pass matcher (BLOCKED_MATCHER.search over the
+raw command) against the original loop of re.search calls over
+BLOCKED_PATTERNS, on realistic and long commands, and checks both agree.
+
+The "check" column is the whole hook check as it runs today: prefilter,
+shell parse and matching per simple command, with the parse and verdict
+caches cleared before every call. It costs more than the matcher alone on
+short commands (the parse is per call, the loop only runs ~30 small
+regexes), and less on long ones. See bench_shell.py for the parser.
+
+Usage:
+  python3 benchmarks/bench_build_only.py [--iterations N]
+"""
+
+import argparse
+import importlib.util
+import re
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+
+def load_script(name: str):
+    """Load a hyphenated hook script as a module."""
+    spec = importlib.util.spec_from_file_location(
+        name.replace("-", "_"), SCRIPTS_DIR / f"{name}.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def build_corpus() -> dict:
+    """Build named commands, from one-liners to multi-KB scripts."""
+    heredoc_body = "\n".join(
+        f"line {i}: export VAR_{i}=value_{i} # configure service part {i}"
+        for i in range(150)
+    )
+    script_lines = [
+        "set -euo pipefail",
+        "cd /workspace/app",
+        "npm ci --prefer-offline",
+        "npm run lint && npm run typecheck",
+        "npx tsc --noEmit -p tsconfig.json",
+        "for f in src/**/*.ts; do echo \"checking $f\"; done",
+        "go test ./... -race -count=1",
+        "pytest -q tests/ --maxfail=1",
+    ]
+    long_script = "\n".join(script_lines * 60)
+
+    return {
+        "short-allowed": "npm run build",
+        "short-blocked": "npm run dev",
+        "go-test": "go test ./... -race -count=1",
+        "pipeline": "git log --oneline | head -20 && git status --short",
+        "heredoc-allowed": f"cat <<'EOF' > config.env\n{heredoc_body}\nEOF",
+        "heredoc-blocked-tail": f"cat <<'EOF' > notes.txt\n{heredoc_body}\nEOF\nuvicorn app:app --reload",
+        "script-4kb": "\n".join(script_lines * 10),
+        "script-16kb": long_script,
+        "script-16kb-blocked": long_script + "\ncargo watch -x check",
+    }
+
+def legacy_match(patterns: list, command: str) -> bool:
+    """The original is_dev_server_command loop."""
+    for pattern in patterns:
+        if re.search(pattern, command, re.IGNORECASE):
+            return True
+    return False
+
+def time_call(fn, command: str, iterations: int) -> float:
+    """Mean microseconds per call."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(command)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    module = load_script("enforce-build-only")
+    patterns = module.BLOCKED_PATTERNS
+
+    matcher = module.BLOCKED_MATCHER
+
+    def check(command: str):
+        module._verdicts.clear()
+        module.shell.clear_cache()
+        return module.match_dev_server_command(command)
+
+    print(f"{'command':<22} {'bytes':>7} {'loop us':>10} {'matcher us':>11} {'speedup':>8} "
+          f"{'check us':>9}  rule")
+    totals = [0.0, 0.0, 0.0]
+    for name, command in build_corpus().items():
+        old = legacy_match(patterns, command)
+        compiled = matcher.search(command) is not None
+        new = check(command)
+        if old != compiled or old != (new is not None):
+            raise SystemExit(f"Mismatch on {name}: loop={old} matcher={compiled} check={new}")
+
+        loop_us = time_call(lambda c: legacy_match(patterns, c), command, args.iterations)
+        matcher_us = time_call(matcher.search, command, args.iterations)
+        check_us = time_call(check, command, args.iterations)
+        for i, value in enumerate((loop_us, matcher_us, check_us)):
+            totals[i] += value
+        rule = new[0] if new else "-"
+        print(f"{name:<22} {len(command):>7} {loop_us:>10.1f} {matcher_us:>11.1f} "
+              f"{loop_us / matcher_us:>7.1f}x {check_us:>9.1f}  {rule}")
+
+    loop_us, matcher_us, check_us = totals
+    print(f"{'total':<22} {'':>7} {loop_us:>10.1f} {matcher_us:>11.1f} "
+          f"{loop_us / matcher_us:>7.1f}x {check_us:>9.1f}")
+
+if __name__ == "__main__":
+    main()
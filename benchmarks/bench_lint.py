@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark: bulk linting of task and skill files
+
+Builds a temporary project with N task files (a few of them large enough
+to be mapped) and M skills, then times lint-files.py's lint pass with one
+process against the process pool.
+
+Usage:
+  python3 benchmarks/bench_lint.py [--tasks N] [--skills M] [--jobs J] [--runs R]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from hooklib import lint
+
+TASK = """# Task: TASK-{number:03d} Generated task {number}
+
+**Status:** In Progress
+
+## Assignment
+Implement part {number} of the feature.
+{filler}
+## Report
+Changed three files.
+
+## Review
+Approved.
+"""
+
+SKILL = """---
+name: skill-{number}
+description: Generated skill {number}
+role: {role}
+keywords: [topic{number}:2, generated]
+---
+
+Preamble for skill {number}.
+
+## Usage
+Use it.
+
+## Patterns
+{filler}
+"""
+
+ROLES = ("dev", "ba", "design", "tech-lead", "pm", "tester")
+
+def build_tree(root: Path, tasks: int, skills: int):
+    """Write the task and skill files; every 100th task is 512 KB."""
+    tasks_dir = root / ".claude" / "tasks"
+    tasks_dir.mkdir(parents=True)
+    for number in range(1, tasks + 1):
+        filler = "- detail line\n" * (40000 if number % 100 == 0 else 20)
+        (tasks_dir / f"task-{number:03d}-generated.md").write_text(TASK.format(number=number, filler=filler))
+
+    skills_root = root / "skills"
+    for number in range(skills):
+        role = ROLES[number % len(ROLES)]
+        directory = skills_root / role / f"skill-{number}"
+        directory.mkdir(parents=True)
+        (directory / "SKILL.md").write_text(SKILL.format(number=number, role=role, filler="text\n" * 50))
+    return str(tasks_dir), [str(skills_root)]
+
+def measure(tasks_dir: str, roots: list, workers: int, runs: int) -> tuple:
+    """Median milliseconds and the result of one lint pass."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = lint.lint(tasks_dir, roots, workers)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--skills", type=int, default=1000)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="pool size")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tasks_dir, roots = build_tree(Path(tmp), args.tasks, args.skills)
+        serial_ms, serial = measure(tasks_dir, roots, 1, args.runs)
+        pool_ms, pooled = measure(tasks_dir, roots, args.jobs, args.runs)
+        assert serial == pooled
+
+        files = serial["files"]
+        print(f"{files} files ({args.tasks} tasks, {args.skills} skills), "
+              f"{serial['errors']} errors, {serial['warnings']} warnings")
+        for label, ms in (("1 process", serial_ms), (f"{args.jobs} processes", pool_ms)):
+            print(f"  {label:<13} {ms:8.1f} ms  ({files / ms * 1000:,.0f} files/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark: lazy payload decoding for large Write/Read payloads
+
+Dispatches 1, 10 and 50 MB hook payloads through the router's checks in a
+temporary project, decoding the payload two ways:
+- json: json.loads of the whole payload (the old path)
+- lazy: hooklib.payload.parse, which leaves large values undecoded until a
+  check reads them
+
+Cases: a Write of a source file (decided by file_path alone), a Write of a
+task file (content is validated, so it must be decoded) and a PostToolUse
+Read with a large tool_response. Reports the median milliseconds for decode
+plus dispatch and the peak memory allocated on top of the raw payload text.
+
+Usage:
+  python3 benchmarks/bench_payload.py [--runs N] [--sizes 1,10,50]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from hooklib import payload, router
+
+MB = 1024 * 1024
+
+LINE = 'export const value = compute("input", { retries: 3 }); // generated\n'
+
+TASK_HEADER = "# Task: TASK-001 Generated fixtures\n\n## Assignment\nLoad fixtures.\n\n## Report\n\n## Review\n\n"
+
+def filler(size: int) -> str:
+    """Source-like text of about `size` bytes."""
+    return LINE * (size // len(LINE))
+
+def build_cases(project: Path, size: int) -> list:
+    """(name, event, raw payload) for one payload size."""
+    text = filler(size)
+    tasks = project / ".claude" / "tasks"
+    base = {"cwd": str(project)}
+    return [
+        ("write-source", "PreToolUse", dict(base, hook_event_name="PreToolUse", tool_name="Write",
+            tool_input={"file_path": str(project / "src" / "generated.ts"), "content": text})),
+        ("write-task", "PreToolUse", dict(base, hook_event_name="PreToolUse", tool_name="Write",
+            tool_input={"file_path": str(tasks / "task-001-fixtures.md"), "content": TASK_HEADER + text})),
+        ("read-output", "PostToolUse", dict(base, hook_event_name="PostToolUse", tool_name="Read",
+            tool_input={"file_path": "big.log"}, tool_response={"type": "text", "file": {"content": text}})),
+    ]
+
+def run_once(decode, event: str, raw: str):
+    """Decode a payload and dispatch it; returns the merged result."""
+    return router.dispatch(event, decode(raw))
+
+def measure(decode, event: str, raw: str, runs: int) -> tuple:
+    """Median milliseconds and peak allocated MB for decode + dispatch."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        run_once(decode, event, raw)
+        times.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    run_once(decode, event, raw)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), peak / MB
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--sizes", default="1,10,50", help="payload sizes in MB")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Path(tmp) / "project"
+        (project / ".git").mkdir(parents=True)
+        (project / ".claude" / "tasks").mkdir(parents=True)
+        os.environ["S_CACHE_DIR"] = str(Path(tmp) / "cache")
+        saved_cwd = os.getcwd()
+        os.chdir(project)
+        try:
+            print(f"{'case':<14} {'MB':>4} {'json ms':>9} {'lazy ms':>9} {'json peak MB':>13} {'lazy peak MB':>13}")
+            for size in (int(s) for s in args.sizes.split(",")):
+                for name, event, body in build_cases(project, size * MB):
+                    raw = json.dumps(body)
+                    assert router.dispatch(event, json.loads(raw)) == router.dispatch(event, payload.parse(raw))
+                    json_ms, json_peak = measure(json.loads, event, raw, args.runs)
+                    lazy_ms, lazy_peak = measure(payload.parse, event, raw, args.runs)
+                    print(f"{name:<14} {size:>4} {json_ms:>9.1f} {lazy_ms:>9.1f} "
+                          f"{json_peak:>13.1f} {lazy_peak:>13.1f}")
+        finally:
+            os.chdir(saved_cwd)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: project root discovery stat counts
+
+Builds a synthetic deep directory tree with .git/ at the top and counts
+os.stat calls for one enforce-task-files.py check: the original walk
+(called three times per check) against the memoized lookup, cold and warm.
+Also checks the cache notices a .claude/ appearing and disappearing.
+
+Usage:
+  python3 benchmarks/bench_project_root.py [--depth N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from hooklib import project
+
+class StatCounter:
+    """Count os.stat calls (os.path.isdir goes through os.stat)."""
+
+    def __init__(self):
+        self.count = 0
+        self._stat = os.stat
+
+    def __enter__(self):
+        def counting_stat(*args, **kwargs):
+            self.count += 1
+            return self._stat(*args, **kwargs)
+        os.stat = counting_stat
+        return self
+
+    def __exit__(self, *exc):
+        os.stat = self._stat
+
+def legacy_get_project_root():
+    """The original get_project_root walk."""
+    current = os.getcwd()
+    while current != os.path.dirname(current):
+        if os.path.isdir(os.path.join(current, '.claude')):
+            return current
+        if os.path.isdir(os.path.join(current, '.git')):
+            return current
+        current = os.path.dirname(current)
+    return os.getcwd()
+
+def new_invocation():
+    """Forget in-process state, as a fresh hook process would."""
+    project._memo.clear()
+
+def measure(label: str, fn, calls: int = 3):
+    """Run fn `calls` times (one task-file check) and report stats/time."""
+    with StatCounter() as counter:
+        start = time.perf_counter()
+        for _ in range(calls):
+            root = fn()
+        elapsed = (time.perf_counter() - start) * 1e6
+    depth = len(Path(root).parts)
+    print(f"{label:<34} {counter.count:>6} {elapsed:>10.1f}  {depth}")
+    return root
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--depth", type=int, default=40)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["S_CACHE_DIR"] = os.path.join(tmp, "cache")
+        top = Path(tmp) / "repo"
+        (top / ".git").mkdir(parents=True)
+        deep = top
+        for i in range(args.depth):
+            deep = deep / f"level{i:02d}"
+        deep.mkdir(parents=True)
+        os.chdir(deep)
+
+        print(f"depth {args.depth}, one check = 3 root lookups")
+        print(f"{'variant':<34} {'stats':>6} {'us':>10}  root depth")
+        expected = measure("original walk", legacy_get_project_root)
+
+        new_invocation()
+        assert measure("memoized, cold cache file", project.get_project_root) == expected
+
+        new_invocation()
+        assert measure("memoized, warm cache file", project.get_project_root) == expected
+
+        marker = deep.parent / ".claude"
+        marker.mkdir()
+        new_invocation()
+        root = measure("after .claude/ appears", project.get_project_root)
+        assert root == str(deep.parent), root
+
+        marker.rmdir()
+        new_invocation()
+        root = measure("after .claude/ disappears", project.get_project_root)
+        assert root == expected, root
+
+if __name__ == "__main__":
+    main()
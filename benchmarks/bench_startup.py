@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark: hook process startup
+
+Wall time per hook event, before and after the fast-start packaging:
+- before: one `python3 <script>.py` process per script of the baseline
+  tree (git archive of --baseline into a temp dir), as the original
+  hooks.json ran them (sum and slowest of the processes)
+- after: one `python3 -I -S hook-router.py <event>` process of this tree
+
+--baseline is any git revision from before the hooks were reworked (the
+commit before the fast-start change, a release tag, ...); there is no
+default, since commit ids differ between clones.
+
+Usage:
+  python3 benchmarks/bench_startup.py --baseline REV [--runs N]
+"""
+
+import argparse
+import io
+import json
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from pathlib import Path
+
+PLUGIN_ROOT = Path(__file__).resolve().parent.parent
+SCRIPTS_DIR = PLUGIN_ROOT / "scripts"
+
+# (label, event, payload, original per-script commands)
+CASES = [
+    ("SessionStart", "SessionStart", {"source": "startup"},
+     [["session-rules.py"]]),
+    ("UserPromptSubmit @dev", "UserPromptSubmit",
+     {"prompt": "@dev add a react form with zustand state"},
+     [["refine-prompt.py"], ["discover-skills.py", "dev"], ["discover-skills.py", "ba"],
+      ["discover-skills.py", "design"], ["discover-skills.py", "tech-lead"]]),
+    ("PreToolUse Bash", "PreToolUse",
+     {"tool_name": "Bash", "tool_input": {"command": "npm test"}},
+     [["enforce-write.py"], ["enforce-build-only.py"]]),
+    ("PreToolUse Write", "PreToolUse",
+     {"tool_name": "Write", "tool_input": {"file_path": "src/app.ts", "content": "export {}"}},
+     [["enforce-write.py"], ["enforce-task-files.py"]]),
+    ("PreToolUse early exit", "PreToolUse",
+     {"tool_name": "Task", "tool_input": {"prompt": "explore"}},
+     [["enforce-write.py"], ["enforce-task-files.py"], ["enforce-build-only.py"]]),
+    ("PostToolUse Read", "PostToolUse",
+     {"tool_name": "Read", "tool_input": {"file_path": "README.md"}, "tool_output": "x" * 2000},
+     [["enforce-research.py"]]),
+]
+
+def extract_baseline(rev: str, target: str) -> Path:
+    """Write the tree of a git revision into target; returns its scripts dir."""
+    archive = subprocess.run(["git", "archive", rev], cwd=PLUGIN_ROOT, capture_output=True, check=True)
+    with tarfile.open(fileobj=io.BytesIO(archive.stdout)) as tar:
+        tar.extractall(target, filter="data")
+    return Path(target) / "scripts"
+
+def run_once(cmd: list, stdin: bytes) -> float:
+    """Run a command once and return wall time in ms."""
+    start = time.perf_counter()
+    subprocess.run(cmd, input=stdin, stdout=subprocess.DEVNULL,
+                   stderr=subprocess.DEVNULL, cwd=PLUGIN_ROOT, check=False)
+    return (time.perf_counter() - start) * 1000
+
+def median_ms(cmd: list, stdin: bytes, runs: int) -> float:
+    """Median wall time over several runs (after one warm-up)."""
+    run_once(cmd, stdin)
+    return statistics.median(run_once(cmd, stdin) for _ in range(runs))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--baseline", required=True, help="git revision of the original hooks")
+    args = parser.parse_args()
+
+    python = sys.executable
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            baseline_dir = extract_baseline(args.baseline, tmp)
+        except (OSError, subprocess.CalledProcessError) as e:
+            raise SystemExit(f"Cannot extract baseline {args.baseline}: {e}")
+
+        print(f"{'hook':<24} {'procs':>5} {'before sum':>11} {'before max':>11} {'after':>8}")
+        for label, event, payload, scripts in CASES:
+            stdin = json.dumps(payload).encode()
+            before = [
+                median_ms([python, str(baseline_dir / script[0])] + script[1:], stdin, args.runs)
+                for script in scripts
+            ]
+            after = median_ms(
+                [python, "-I", "-S", str(SCRIPTS_DIR / "hook-router.py"), event], stdin, args.runs
+            )
+            print(f"{label:<24} {len(scripts):>5} {sum(before):>9.1f}ms {max(before):>9.1f}ms {after:>6.1f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Benchmark: replay hook payloads through every hook script
+
+Replays a corpus of hook stdin payloads through each script the router
+registers for the payload's event (plus hook-router.py itself), both as
+subprocesses and in-process, and reports p50/p95/p99 latency, throughput
+and peak memory per hook and case:
+- subprocess: peak RSS of the child (os.wait4)
+- in-process: peak Python allocation during the call (tracemalloc, measured
+  in one extra untimed run so tracing does not skew latency)
+
+The built-in corpus covers SessionStart, UserPromptSubmit, PreToolUse
+(Write/Edit/Bash) and PostToolUse (Read/Grep), plus scale cases: a
+1000-skill index, multi-MB Write contents and long Bash heredocs.
+Recorded payloads can be added with --corpus (JSONL, one payload per
+line, event taken from hook_event_name).
+
+Usage:
+  python3 benchmarks/replay.py [--runs N] [--mode subprocess|inprocess|both]
+                               [--corpus FILE ...] [--only SUBSTRING] [--json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+PLUGIN_ROOT = Path(__file__).resolve().parent.parent
+SCRIPTS_DIR = PLUGIN_ROOT / "scripts"
+
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from hooklib import loader, router
+
+MB = 1024 * 1024
+
+def build_skill_root(root: Path, count: int) -> Path:
+    """Create a synthetic plugin root with `count` dev skills."""
+    skills_dir = root / "skills"
+    for i in range(count):
+        path = skills_dir / f"dev/skill-{i:04d}/SKILL.md"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        sections = "\n\n".join(
+            f"## Topic {j} for skill {i}\n\nUse pattern{i}x{j} with care.\n\n"
+            f"```bash\n# not a heading\nrun step {j}\n```"
+            for j in range(8)
+        )
+        keywords = f"kw{i}, topic{i % 50}, {'react' if i % 10 == 0 else f'lib{i}'}"
+        path.write_text(f"---\nname: skill-{i:04d}\nkeywords: [{keywords}]\n---\n\n"
+                        f"# Skill {i}\n\nIntro.\n\n{sections}\n")
+    return root
+
+def build_corpus(project: Path, big_skills_root: Path) -> list[dict]:
+    """Build the built-in replay corpus."""
+    tasks = project / ".claude" / "tasks"
+    heredoc = "\n".join(f"echo 'step {i}: configure module {i}'" for i in range(2000))
+    big_text = ("const value = computeSomething(input); // generated line\n" * (3 * MB // 56))
+    task_body = "# Task: TASK-001\n\n## Assignment\nDo it.\n\n## Report\n\n## Review\n"
+    base = {"session_id": "bench", "cwd": str(project)}
+
+    def case(name, event, payload, plugin_root=None):
+        return {
+            "name": name,
+            "event": event,
+            "payload": dict(base, hook_event_name=event, **payload),
+            "plugin_root": str(plugin_root or PLUGIN_ROOT),
+        }
+
+    return [
+        case("session-start", "SessionStart", {"source": "startup"}),
+        case("prompt-short", "UserPromptSubmit", {"prompt": "yes"}),
+        case("prompt-dev", "UserPromptSubmit", {"prompt": "@dev add a react form with zustand state"}),
+        case("prompt-dev-1000-skills", "UserPromptSubmit",
+             {"prompt": "@dev use kw42 and topic7 with react " * 20}, big_skills_root),
+        case("prompt-pasted-log", "UserPromptSubmit",
+             {"prompt": "@dev why does this fail?\n" + "ERROR at module.func (file.ts:10)\n" * 5000}),
+        case("write-source", "PreToolUse",
+             {"tool_name": "Write", "tool_input": {"file_path": str(project / "src/app.ts"), "content": "export {}\n"}}),
+        case("write-3mb", "PreToolUse",
+             {"tool_name": "Write", "tool_input": {"file_path": str(project / "src/generated.ts"), "content": big_text}}),
+        case("write-task", "PreToolUse",
+             {"tool_name": "Write", "tool_input": {"file_path": str(tasks / "task-001-bench.md"), "content": task_body}}),
+        case("edit-source", "PreToolUse",
+             {"tool_name": "Edit", "tool_input": {"file_path": str(project / "src/app.ts"),
+                                                  "old_string": "export {}", "new_string": "export const a = 1"}}),
+        case("bash-test", "PreToolUse", {"tool_name": "Bash", "tool_input": {"command": "npm test"}}),
+        case("bash-dev-server", "PreToolUse", {"tool_name": "Bash", "tool_input": {"command": "npm run dev"}}),
+        case("bash-heredoc", "PreToolUse",
+             {"tool_name": "Bash", "tool_input": {"command": f"cat <<'EOF' > run.sh\n{heredoc}\nEOF\nbash run.sh"}}),
+        case("read-small", "PostToolUse",
+             {"tool_name": "Read", "tool_input": {"file_path": "README.md"}, "tool_output": "# Title\n" * 50}),
+        case("read-3mb", "PostToolUse",
+             {"tool_name": "Read", "tool_input": {"file_path": "big.log"}, "tool_output": big_text}),
+        case("grep", "PostToolUse",
+             {"tool_name": "Grep", "tool_input": {"pattern": "TODO"}, "tool_output": "src/a.ts:1: TODO\n" * 200}),
+    ]
+
+def load_recorded(paths: list) -> list[dict]:
+    """Load recorded payloads (JSONL) into corpus cases."""
+    cases = []
+    for path in paths:
+        with open(path) as f:
+            for i, line in enumerate(f):
+                if not line.strip():
+                    continue
+                payload = json.loads(line)
+                cases.append({
+                    "name": f"{Path(path).stem}:{i + 1}",
+                    "event": payload.get("hook_event_name", ""),
+                    "payload": payload,
+                    "plugin_root": str(PLUGIN_ROOT),
+                })
+    return cases
+
+def targets_for(event: str) -> list[tuple[str, list]]:
+    """Get (script, argv) pairs to replay an event's payloads through."""
+    targets = []
+    for route in router.ROUTES.get(event, []):
+        target = (route["script"], list(route["args"]))
+        if target not in targets:
+            targets.append(target)
+    targets.append(("hook-router", [event]))
+    return targets
+
+# Children are forked from this small helper rather than from the benchmark:
+# on Linux a child's ru_maxrss starts at the RSS of the process it was forked
+# from, which would report the benchmark's own (growing) footprint.
+SPAWNER = """
+import json, os, sys, time
+for line in sys.stdin:
+    req = json.loads(line)
+    fd_in = os.open(req["stdin"], os.O_RDONLY)
+    fd_null = os.open(os.devnull, os.O_WRONLY)
+    start = time.perf_counter()
+    pid = os.fork()
+    if pid == 0:
+        os.chdir(req["cwd"])
+        os.dup2(fd_in, 0)
+        os.dup2(fd_null, 1)
+        os.dup2(fd_null, 2)
+        os.execve(req["cmd"][0], req["cmd"], req["env"])
+    _, _, usage = os.wait4(pid, 0)
+    elapsed = time.perf_counter() - start
+    os.close(fd_in)
+    os.close(fd_null)
+    print(json.dumps([elapsed, usage.ru_maxrss]), flush=True)
+"""
+
+class Spawner:
+    """Runs hook subprocesses from a small helper process."""
+
+    def __init__(self, tmp: Path):
+        self.stdin_path = str(tmp / "stdin.json")
+        self.proc = subprocess.Popen(
+            [sys.executable, "-I", "-S", "-c", SPAWNER],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+        )
+
+    def set_stdin(self, data: str):
+        """Write the payload every following run reads as stdin."""
+        with open(self.stdin_path, "w") as f:
+            f.write(data)
+
+    def run(self, script: str, argv: list, env: dict, cwd: str):
+        """Run a hook script once. Returns (seconds, peak RSS bytes)."""
+        cmd = [sys.executable, str(SCRIPTS_DIR / f"{script}.py")] + argv
+        if script == "hook-router":
+            cmd[1:1] = ["-I", "-S"]
+        req = {"cmd": cmd, "env": env, "cwd": cwd, "stdin": self.stdin_path}
+        self.proc.stdin.write(json.dumps(req) + "\n")
+        self.proc.stdin.flush()
+        elapsed, maxrss = json.loads(self.proc.stdout.readline())
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        return elapsed, maxrss if sys.platform == "darwin" else maxrss * 1024
+
+    def close(self):
+        self.proc.stdin.close()
+        self.proc.wait()
+
+def run_inprocess(script: str, argv: list, stdin: str) -> float:
+    """Run a hook script in-process. Returns seconds."""
+    start = time.perf_counter()
+    loader.run_script(script, argv, stdin)
+    return time.perf_counter() - start
+
+def inprocess_peak(script: str, argv: list, stdin: str) -> int:
+    """Peak Python allocation (bytes) of one in-process run."""
+    tracemalloc.start()
+    loader.run_script(script, argv, stdin)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+def summarize(times: list, memory: list) -> dict:
+    """Latency percentiles (ms), throughput and peak memory (MB)."""
+    return {
+        "runs": len(times),
+        "p50_ms": percentile(times, 50) * 1000,
+        "p95_ms": percentile(times, 95) * 1000,
+        "p99_ms": percentile(times, 99) * 1000,
+        "throughput": len(times) / sum(times) if sum(times) else 0.0,
+        "peak_mb": max(memory) / MB,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--mode", choices=["subprocess", "inprocess", "both"], default="both")
+    parser.add_argument("--corpus", nargs="*", default=[], help="recorded payload JSONL files")
+    parser.add_argument("--only", default="", help="only cases whose name contains this")
+    parser.add_argument("--json", action="store_true", help="print results as JSON lines")
+    args = parser.parse_args()
+
+    modes = ["subprocess", "inprocess"] if args.mode == "both" else [args.mode]
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        spawner = Spawner(Path(tmp))
+        project = Path(tmp) / "project"
+        (project / ".git").mkdir(parents=True)
+        (project / "src").mkdir()
+        big_skills_root = build_skill_root(Path(tmp) / "big-plugin", 1000)
+        os.environ["S_CACHE_DIR"] = str(Path(tmp) / "cache")
+
+        corpus = build_corpus(project, big_skills_root) + load_recorded(args.corpus)
+        corpus = [c for c in corpus if args.only in c["name"]]
+
+        if not args.json:
+            print(f"{'case':<24} {'hook':<28} {'mode':<10} {'p50':>8} {'p95':>8} {'p99':>8} "
+                  f"{'calls/s':>8} {'peak MB':>8}")
+
+        saved_cwd = os.getcwd()
+        os.chdir(project)
+        try:
+            for case in corpus:
+                stdin_text = json.dumps(case["payload"])
+                spawner.set_stdin(stdin_text)
+                env = dict(os.environ, CLAUDE_PLUGIN_ROOT=case["plugin_root"])
+                os.environ["CLAUDE_PLUGIN_ROOT"] = case["plugin_root"]
+
+                for script, argv in targets_for(case["event"]):
+                    hook = " ".join([script] + argv)
+                    for mode in modes:
+                        times, memory = [], []
+                        for _ in range(args.runs):
+                            if mode == "subprocess":
+                                elapsed, rss = spawner.run(script, argv, env, str(project))
+                                memory.append(rss)
+                            else:
+                                elapsed = run_inprocess(script, argv, stdin_text)
+                            times.append(elapsed)
+                        if mode == "inprocess":
+                            memory.append(inprocess_peak(script, argv, stdin_text))
+
+                        row = dict(case=case["name"], hook=hook, mode=mode, **summarize(times, memory))
+                        results.append(row)
+                        if args.json:
+                            print(json.dumps(row))
+                        else:
+                            print(f"{row['case']:<24} {hook:<28} {mode:<10} {row['p50_ms']:>7.1f}ms "
+                                  f"{row['p95_ms']:>6.1f}ms {row['p99_ms']:>6.1f}ms "
+                                  f"{row['throughput']:>8.1f} {row['peak_mb']:>8.1f}")
+        finally:
+            os.chdir(saved_cwd)
+            spawner.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Transcript Policy Audit
+
+Replays the tool calls of session transcripts through the write,
+build-only and task-file rules (see hooklib/audit.py) and reports how
+often each rule would have blocked, with examples. Use --config with a
+candidate s-config.json to try new protectedPaths before adopting them,
+and --command-pattern to try a new Bash rule (a regex matched against each
+simple command). The built-in dangerous-command and dev-server rules are
+code, not config: they always run and cannot be swapped for candidates.
+
+Usage:
+  python3 audit-transcripts.py [PATH ...] [--config FILE] [--command-pattern REGEX ...]
+                               [--examples N] [--jobs N] [--json]
+
+PATH is a transcript (.jsonl or .jsonl.gz) or a directory searched for
+them; the default is ~/.claude/projects.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hooklib import audit, loader
+
+def load_candidate(path: str) -> tuple:
+    """Get the (deny, allow) protectedPaths of a candidate config file."""
+    with open(path) as f:
+        values = json.load(f)
+    protected = values.get("protectedPaths") if isinstance(values, dict) else None
+    return loader.load_script("enforce-write").project_rules(protected if isinstance(protected, dict) else {})
+
+def print_report(result: dict):
+    """Print the audit as a table of rules followed by their examples."""
+    print(f"Audited {result['files']} transcripts: {result['lines']:,} lines, "
+          f"{result['tool_calls']:,} tool calls, {result['blocked']:,} would be blocked")
+    if result["skipped"]:
+        print(f"Skipped {result['skipped']:,} task file Edits (they depend on the file at the time)")
+    if result["bad_lines"]:
+        print(f"Ignored {result['bad_lines']:,} lines that are not valid JSON")
+    for error in result["errors"]:
+        print(f"Error: {error}", file=sys.stderr)
+    if not result["rules"]:
+        return
+
+    print(f"\n{'hits':>7}  {'check':<20} rule")
+    for entry in result["rules"]:
+        print(f"{entry['hits']:>7}  {entry['check']:<20} {entry['rule']}")
+
+    print("\nExamples:")
+    for entry in result["rules"]:
+        print(f"{entry['check']}: {entry['rule']}")
+        for match in entry["examples"]:
+            print(f"  {os.path.basename(match['file'])}:{match['line']}  {match['tool']}: {match['input']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit session transcripts against the S plugin rules")
+    parser.add_argument("paths", nargs="*", help="transcript files or directories")
+    parser.add_argument("--config", help="candidate s-config.json whose protectedPaths replace each project's")
+    parser.add_argument("--command-pattern", action="append", default=[], metavar="REGEX",
+                        help="candidate Bash rule, matched against each simple command (repeatable)")
+    parser.add_argument("--examples", type=int, default=3, help="examples kept per rule")
+    parser.add_argument("--jobs", type=int, default=0, help="worker processes (default: one per CPU)")
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    args = parser.parse_args()
+    if args.jobs < 0 or args.examples < 0:
+        parser.error("--jobs and --examples must not be negative")
+
+    candidate = None
+    if args.config:
+        try:
+            candidate = load_candidate(args.config)
+        except (OSError, ValueError) as e:
+            parser.error(f"cannot read --config: {e}")
+    for pattern in args.command_pattern:
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            parser.error(f"invalid --command-pattern {pattern!r}: {e}")
+
+    paths = args.paths or [os.path.join(os.path.expanduser("~"), ".claude", "projects")]
+    result = audit.audit(paths, candidate, args.jobs or None, args.examples, args.command_pattern)
+    if not result["files"]:
+        print(f"No transcripts found in {', '.join(paths)}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_report(result)
+    sys.exit(0)
+
+if __name__ == "__main__":
+    main()
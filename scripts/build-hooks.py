@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Hook Build Step
+
+Precompiles the hook scripts and hooklib to bytecode (__pycache__) so the
+first hook call after an install or update does not pay for compiling, and
+read-only installs still start from .pyc files. Also compiles the session
+start rules digest (hooklib.rules) and the skill registry
+(hooklib.skillcache) so the first session and the first @role prompt do
+not build them.
+
+Usage:
+  python3 build-hooks.py
+
+Run after installing or updating the plugin. Hooks are launched with
+`python3 -I -S` (isolated, no site-packages scan); see hooks/hooks.json.
+"""
+
+import compileall
+import os
+import py_compile
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+sys.path.insert(0, SCRIPTS_DIR)
+
+def main():
+    ok = compileall.compile_dir(
+        SCRIPTS_DIR,
+        quiet=1,
+        invalidation_mode=py_compile.PycInvalidationMode.TIMESTAMP,
+    )
+    if not ok:
+        print("Some hook files failed to compile", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"Compiled hook bytecode in {SCRIPTS_DIR}")
+
+    from hooklib import rules
+    plugin_root = os.environ.get("CLAUDE_PLUGIN_ROOT") or os.path.dirname(SCRIPTS_DIR)
+    compiled = rules.load(plugin_root)
+    print(f"Compiled rules digest v{compiled['digest_version']} "
+          f"({len(compiled['texts'])} rule files)")
+
+    from hooklib import skillcache
+    compiled = skillcache.load(plugin_root)
+    counts = ", ".join(f"{role}: {len(data['skills'])}"
+                       for role, data in sorted(compiled["index"]["roles"].items()))
+    print(f"Compiled skill registry ({counts})")
+    sys.exit(0)
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,15 @@
 Skill Discovery Script for Coze Toolkit
 
 Role-based skill discovery. Only loads skills for the specified role.
+Skills are found from their SKILL.md frontmatter (see
+hooklib/skillregistry.py). Only the sections of each matched skill (and its
+companion files) relevant to the prompt are injected, packed under a byte
+budget (S_SKILL_BUDGET or "skillBudget" in .claude/s-config.json).
 
 Usage:
   python3 discover-skills.py <role>
 
-Roles: dev, ba, design, pm, tester
+Roles: dev, ba, design, tech-lead, pm, tester
 """
 
 import json
@@ -15,7 +19,20 @@ import sys
 import os
 from pathlib import Path
 
-VALID_ROLES = ["dev", "ba", "design", "pm", "tester"]
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hooklib import config, metrics, skillcache
+from hooklib.keywords import KeywordMatcher, build_skill_matcher
+from hooklib.sections import pack_sections, prompt_terms
+from hooklib.skillregistry import ROLE_NAMES
+from hooklib.result import emit
+
+VALID_ROLES = list(ROLE_NAMES)
+
+MAX_SKILLS = 3
+
+# Bytes of skill text injected per prompt (~4 bytes per token)
+DEFAULT_CONTEXT_BUDGET = 8000
 
 def get_plugin_root():
     """Get the plugin root directory."""
@@ -24,39 +41,113 @@ def get_plugin_root():
         return Path(plugin_root)
     return Path(__file__).parent.parent
 
-def load_skill_index(plugin_root: Path) -> dict:
-    """Load the skill index file."""
-    index_path = plugin_root / "skills" / "skill-index.json"
-    if not index_path.exists():
-        return {"roles": {}}
-    with open(index_path) as f:
-        return json.load(f)
-
-def match_skills(prompt: str, skills: list) -> list[dict]:
+def match_skills(prompt: str, skills: list, matcher: KeywordMatcher = None) -> list[dict]:
     """Find skills that match the prompt based on keywords."""
-    prompt_lower = prompt.lower()
-    matched = []
+    if matcher is None:
+        matcher = build_skill_matcher(skills)
 
-    for skill in skills:
-        keywords = skill.get("keywords", [])
-        matches = [kw for kw in keywords if kw.lower() in prompt_lower]
-        if matches:
-            matched.append({
-                "skill": skill,
-                "matched_keywords": matches,
-                "score": len(matches)
-            })
+    matched = []
+    for i, (score, matches) in matcher.score(prompt).items():
+        matched.append({
+            "skill": skills[i],
+            "matched_keywords": matches,
+            "score": score
+        })
 
     matched.sort(key=lambda x: x["score"], reverse=True)
     return matched
 
-def read_skill_content(plugin_root: Path, skill_path: str) -> str:
-    """Read the skill file content."""
-    full_path = plugin_root / "skills" / skill_path
-    if not full_path.exists():
-        return ""
-    with open(full_path) as f:
-        return f.read()
+def get_context_budget() -> int:
+    """Get the skill context byte budget."""
+    budget = config.get("skillBudget", env="S_SKILL_BUDGET")
+    try:
+        return int(budget) if budget else DEFAULT_CONTEXT_BUDGET
+    except (TypeError, ValueError):
+        return DEFAULT_CONTEXT_BUDGET
+
+def render_sections(sections: list, indexes: list) -> str:
+    """Render picked sections in file order, keeping parent headings."""
+    parts = []
+    shown_parents = set()
+    for index in sorted(indexes):
+        section = sections[index]
+        if section["level"] == 2:
+            shown_parents.add(section["text"].split("\n", 1)[0])
+        elif section["parent"] and section["parent"] not in shown_parents:
+            parts.append(section["parent"])
+            shown_parents.add(section["parent"])
+        parts.append(section["text"])
+    return "\n\n".join(parts)
+
+def discover_skills(hook_input: dict, role: str):
+    """Build the skill context for a role's matching skills, or None."""
+    role = role.lower()
+    if role not in VALID_ROLES:
+        return None
+
+    prompt = hook_input.get("prompt", "")
+
+    if not prompt:
+        return None
+
+    plugin_root = get_plugin_root()
+    compiled = skillcache.load(plugin_root)
+    skill_index = compiled["index"]
+
+    # Get skills for the specified role only
+    role_data = skill_index.get("roles", {}).get(role, {})
+    role_skills = role_data.get("skills", [])
+
+    if not role_skills:
+        return None
+
+    # Find matching skills within this role
+    matches = match_skills(prompt, role_skills, compiled["matchers"].get(role))
+
+    if not matches:
+        return None
+
+    # Output matched skill content
+    role_name = role_data.get("name", role.upper())
+    output_parts = [
+        f"[COZE {role_name.upper()} SKILL CONTEXT]",
+        f"You are acting as a {role_name}. Follow these guidelines:",
+        ""
+    ]
+
+    top = matches[:MAX_SKILLS]
+    candidates = []
+    for match in top:
+        skill_path = match["skill"]["path"]
+        terms = prompt_terms(prompt, match["matched_keywords"])
+        candidates.append((skill_path, skillcache.skill_sections(compiled, match["skill"]), terms))
+
+    picked = pack_sections(candidates, get_context_budget())
+    if not picked:
+        return None  # nothing fits the budget: no empty context block
+
+    for match in top:
+        skill = match["skill"]
+        skill_name = skill["name"]
+        skill_path = skill["path"]
+
+        sections = skillcache.skill_sections(compiled, skill)
+        indexes = [i for key, i in picked if key == skill_path]
+        if not indexes:
+            continue
+
+        output_parts.append(f"=== {skill_name.upper()} ===")
+        output_parts.append(render_sections(sections, indexes))
+        if len(indexes) < len(sections):
+            output_parts.append(
+                f"({len(indexes)} of {len(sections)} sections shown; "
+                f"full skill: {skill_path})"
+            )
+        output_parts.append("")
+
+    output_parts.append("[END SKILL CONTEXT]")
+
+    return "\n".join(output_parts)
 
 def main():
     # Get role from command line argument
@@ -74,49 +165,7 @@ def main():
             sys.exit(0)
 
         hook_input = json.loads(input_data)
-        prompt = hook_input.get("prompt", "")
-
-        if not prompt:
-            sys.exit(0)
-
-        plugin_root = get_plugin_root()
-        skill_index = load_skill_index(plugin_root)
-
-        # Get skills for the specified role only
-        role_data = skill_index.get("roles", {}).get(role, {})
-        role_skills = role_data.get("skills", [])
-
-        if not role_skills:
-            sys.exit(0)
-
-        # Find matching skills within this role
-        matches = match_skills(prompt, role_skills)
-
-        if not matches:
-            sys.exit(0)
-
-        # Output matched skill content
-        role_name = role_data.get("name", role.upper())
-        output_parts = [
-            f"[COZE {role_name.upper()} SKILL CONTEXT]",
-            f"You are acting as a {role_name}. Follow these guidelines:",
-            ""
-        ]
-
-        for match in matches[:3]:
-            skill = match["skill"]
-            skill_name = skill["name"]
-            skill_path = skill["path"]
-
-            content = read_skill_content(plugin_root, skill_path)
-            if content:
-                output_parts.append(f"=== {skill_name.upper()} ===")
-                output_parts.append(content)
-                output_parts.append("")
-
-        output_parts.append("[END SKILL CONTEXT]")
-
-        print("\n".join(output_parts))
+        emit(metrics.timed(f"discover-skills {role}", discover_skills, hook_input, role))
         sys.exit(0)
 
     except json.JSONDecodeError:
@@ -4,12 +4,29 @@ Block Dev Server Commands Hook
 
 Blocks dev server commands (npm run dev, go run, etc.) that run indefinitely.
 Use build/test commands to validate code instead.
+
+Rules are matched against each simple command of the parsed Bash command
+(hooklib/shell.py), starting at the command name, so `sudo npm start` and
+`bash -c "npm run dev"` are caught while heredoc bodies and quoted
+arguments (`git commit -m "go run later"`) are not. Behind a package or
+module runner the rules are tried again on the command it runs, so
+`npx nodemon`, `python -m flask run`, `poetry run uvicorn` and
+`bundle exec rails server` are caught.
+
+A command that contains none of the rules' leading words is not parsed,
+and verdicts are memoized per command.
 """
 
 import json
 import sys
+import os
 import re
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hooklib import metrics, shell
+from hooklib.result import emit
+
 # DEV SERVER patterns to BLOCK (these run indefinitely)
 BLOCKED_PATTERNS = [
     # Node.js / JavaScript dev servers
@@ -54,49 +71,151 @@ BLOCKED_PATTERNS = [
     r'\btsx\s+watch\b',
 ]
 
+def compile_blocked_patterns(patterns: list) -> re.Pattern:
+    """Compile the patterns into one case-insensitive matcher.
+
+    Each pattern becomes a named group p<index>, so a single search tells
+    which rule fired. Patterns starting with \\b and a letter share one
+    lookahead on those first letters, which lets the scan skip most
+    positions with a single character-class test.
+    """
+    first_chars = set()
+    branches = []
+    for i, pattern in enumerate(patterns):
+        body = pattern[2:] if pattern.startswith(r'\b') else None
+        if body and body[0].isalpha():
+            first_chars.add(body[0].lower())
+            branches.append(f"(?P<p{i}>{body})")
+        else:
+            first_chars = None
+            break
+
+    if first_chars is None:
+        # Fall back to a plain alternation when a pattern has another shape
+        combined = "|".join(f"(?P<p{i}>{p})" for i, p in enumerate(patterns))
+    else:
+        combined = rf"(?=[{''.join(sorted(first_chars))}])\b(?:{'|'.join(branches)})"
+
+    return re.compile(combined, re.IGNORECASE)
+
+BLOCKED_MATCHER = compile_blocked_patterns(BLOCKED_PATTERNS)
+
+def leading_words(patterns: list) -> list:
+    """Get the word each pattern starts with (npm, uvicorn, ...)."""
+    return sorted({re.match(r'\\b([a-z][a-z-]*)', pattern).group(1) for pattern in patterns})
+
+# A command without any of these (in any case) is not parsed
+BLOCKED_HINTS = leading_words(BLOCKED_PATTERNS)
+
+# Package runners: name -> subcommands that run a command (none: the
+# runner itself does). `python -m` is handled separately
+RUNNERS = {
+    "npx": (), "bunx": (), "uvx": (),
+    "pnpm": ("dlx", "exec"), "yarn": ("dlx",), "npm": ("exec",),
+    "poetry": ("run",), "uv": ("run",), "pipenv": ("run",), "pipx": ("run",),
+    "bundle": ("exec",),
+}
+PYTHON = re.compile(r'python[\d.]*$')
+
+MAX_CACHED = 256
+
+_verdicts = {}  # command -> (pattern, matched_text) or None
+
+def run_target(words: list) -> list:
+    """Get the command a runner runs (`npx -y nodemon x` -> nodemon x,
+    `python -m flask run` -> flask run), or [] if words is not a runner."""
+    name = words[0]
+    subcommands = RUNNERS.get(name)
+    if subcommands is None:
+        if name.startswith("python") and PYTHON.match(name):
+            for i, word in enumerate(words[1:], 1):
+                if word == "-m":
+                    return words[i + 1:]
+                if not word.startswith("-"):
+                    break
+        return []
+    if subcommands:
+        if len(words) < 2 or words[1] not in subcommands:
+            return []
+        rest = words[2:]
+    else:
+        rest = words[1:]
+    while rest and rest[0].startswith("-"):
+        rest = rest[1:]
+    return rest
+
+def match_dev_server_command(command: str):
+    """Find the blocked rule a command runs (memoized).
+
+    Returns (pattern, matched_text) or None.
+    """
+    if command in _verdicts:
+        return _verdicts[command]
+    if len(_verdicts) >= MAX_CACHED:
+        _verdicts.clear()
+    matched = _verdicts[command] = find_dev_server(command)
+    return matched
+
+def find_dev_server(command: str):
+    """Match the blocked rules against each command and what its runners run."""
+    if not shell.mentions(command.lower(), BLOCKED_HINTS):
+        return None
+    for cmd in shell.parse(command):
+        words = shell.command_words(cmd)
+        while words:
+            match = BLOCKED_MATCHER.match(" ".join(words))
+            if match:
+                index = int(match.lastgroup[1:])
+                return BLOCKED_PATTERNS[index], match.group()
+            words = run_target(words)
+    return None
+
 def is_dev_server_command(command: str) -> bool:
     """Check if command is a blocked dev server command."""
-    for pattern in BLOCKED_PATTERNS:
-        if re.search(pattern, command, re.IGNORECASE):
-            return True
-    return False
+    return match_dev_server_command(command) is not None
 
-def main():
-    try:
-        input_data = sys.stdin.read()
-        if not input_data.strip():
-            sys.exit(0)
+def check_command(hook_input: dict):
+    """Check a Bash call. Returns a block decision or None."""
+    tool_name = hook_input.get("tool_name", "")
+    tool_input = hook_input.get("tool_input", {})
 
-        hook_input = json.loads(input_data)
-        tool_name = hook_input.get("tool_name", "")
-        tool_input = hook_input.get("tool_input", {})
+    # Only check Bash commands
+    if tool_name != "Bash":
+        return None
 
-        # Only check Bash commands
-        if tool_name != "Bash":
-            sys.exit(0)
-
-        command = tool_input.get("command", "")
-        if not command:
-            sys.exit(0)
+    command = tool_input.get("command", "")
+    if not command:
+        return None
 
-        # Check if it's a dev server command
-        if is_dev_server_command(command):
-            result = {
-                "decision": "block",
-                "reason": f"""BLOCKED: Dev server commands are not allowed.
+    # Check if it's a dev server command
+    matched = match_dev_server_command(command)
+    if matched:
+        pattern, matched_text = matched
+        return {
+            "decision": "block",
+            "reason": f"""BLOCKED: Dev server commands are not allowed.
 
 Command: {command}
+Matched rule: {pattern} ("{matched_text}")
 
 Dev servers run indefinitely and cannot validate code.
 Use build/test commands instead:
 - npm run build
 - npm run typecheck / npx tsc --noEmit
 - npm test / go test / pytest"""
-            }
-            print(json.dumps(result))
+        }
+
+    # Allow all other commands
+    return None
+
+def main():
+    try:
+        input_data = sys.stdin.read()
+        if not input_data.strip():
             sys.exit(0)
 
-        # Allow all other commands
+        hook_input = json.loads(input_data)
+        emit(metrics.timed("enforce-build-only", check_command, hook_input))
         sys.exit(0)
 
     except json.JSONDecodeError:
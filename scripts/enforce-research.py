@@ -5,26 +5,44 @@ Research Proof Enforcer
 Runs on PostToolUse for Read, Glob, Grep, WebSearch, WebFetch.
 Checks if the model is showing proof for research findings.
 Injects reminder if research tools are used without proper citation.
+
+The reminder is throttled per session (S_RESEARCH_REMINDER, or
+"researchReminder" in .claude/s-config.json):
+- calls:N      once every N research calls (default: calls:20)
+- window:SECS  at most once per time window
+- uncited      only when the last assistant message has no citation
+- always       after every research call
+The first research call of a session always gets the reminder. The counter
+is updated under a per-session lock, so parallel PostToolUse hooks do not
+lose each other's calls.
 """
 
 import json
 import sys
+import os
+import re
+import time
 
-def main():
-    try:
-        input_data = json.load(sys.stdin)
-    except:
-        sys.exit(0)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hooklib import config, metrics, payload
+from hooklib.cache import cache_dir, locked, write_atomic
+from hooklib.result import emit
+
+# Research tools that require proof
+RESEARCH_TOOLS = ["Read", "Glob", "Grep", "WebSearch", "WebFetch"]
+
+DEFAULT_POLICY = "calls:20"
 
-    tool_name = input_data.get("tool_name", "")
-    tool_output = input_data.get("tool_output", "")
+# Bytes of transcript tail scanned for the last assistant message
+TRANSCRIPT_TAIL_BYTES = 64 * 1024
 
-    # Research tools that require proof
-    research_tools = ["Read", "Glob", "Grep", "WebSearch", "WebFetch"]
+# file:line, URLs or an explicit Source: label count as a citation
+CITATION_PATTERN = re.compile(r'Source:|https?://|[\w./-]+\.\w+:\d+')
 
-    if tool_name in research_tools:
-        # Inject reminder after research tool use
-        reminder = f"""
+def reminder_text(tool_name: str) -> str:
+    """Build the full research reminder."""
+    return f"""
 [RESEARCH RULE REMINDER]
 You just used {tool_name}. When reporting findings, you MUST:
 
@@ -44,8 +62,114 @@ Format:
 
 [END REMINDER]
 """
-        print(reminder)
 
+def get_policy() -> tuple[str, int]:
+    """Get the throttling policy as (mode, amount)."""
+    value = config.get("researchReminder", env="S_RESEARCH_REMINDER") or DEFAULT_POLICY
+    mode, _, amount = str(value).partition(":")
+    try:
+        return mode.strip().lower(), int(amount) if amount else 0
+    except ValueError:
+        return mode.strip().lower(), 0
+
+def state_path(session_id: str) -> str:
+    """Get the per-session reminder counter file."""
+    safe = re.sub(r'[^A-Za-z0-9_-]', '_', session_id)[:128]
+    return os.path.join(cache_dir(), "research", f"{safe}.json")
+
+def load_state(path: str) -> dict:
+    """Load the reminder counter (fresh state if missing)."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"calls": 0, "last_call": 0, "last_time": 0, "suppressed": 0, "saved_bytes": 0}
+
+def last_assistant_cites(transcript_path: str) -> bool:
+    """Check whether the latest assistant text in the transcript cites a source."""
+    try:
+        with open(transcript_path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            start = max(0, f.tell() - TRANSCRIPT_TAIL_BYTES)
+            f.seek(start)
+            lines = f.read().decode("utf-8", "replace").split("\n")
+    except (OSError, TypeError):
+        return False
+
+    # A tail that starts mid-file begins with a cut-off line
+    if start:
+        lines = lines[1:]
+
+    # Newest first
+    for line in reversed(lines):
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if entry.get("type") != "assistant":
+            continue
+        content = entry.get("message", {}).get("content", [])
+        if isinstance(content, str):
+            texts = [content]
+        else:
+            texts = [c.get("text", "") for c in content if isinstance(c, dict) and c.get("type") == "text"]
+        if texts:
+            return any(CITATION_PATTERN.search(text) for text in texts)
+    return False
+
+def should_remind(state: dict, policy: tuple[str, int], hook_input: dict, now: float) -> bool:
+    """Decide whether this research call gets the reminder."""
+    mode, amount = policy
+    if state["calls"] == 1:
+        return True
+    if mode == "window":
+        return now - state["last_time"] >= (amount or 600)
+    if mode == "uncited":
+        return not last_assistant_cites(hook_input.get("transcript_path", ""))
+    # calls:N
+    return state["calls"] - state["last_call"] >= (amount or 20)
+
+def research_reminder(hook_input: dict):
+    """Build the reminder for a research tool call, or None."""
+    tool_name = hook_input.get("tool_name", "")
+
+    if tool_name not in RESEARCH_TOOLS:
+        return None
+
+    # Inject reminder after research tool use
+    reminder = reminder_text(tool_name)
+    policy = get_policy()
+    session_id = hook_input.get("session_id", "")
+    if not session_id or policy[0] == "always":
+        return reminder
+
+    path = state_path(session_id)
+    with locked(path[:-len(".json")] + ".lock"):
+        state = load_state(path)
+        state["calls"] += 1
+        now = time.time()
+
+        if should_remind(state, policy, hook_input, now):
+            if state["suppressed"]:
+                reminder += (f"[{state['suppressed']} repeated reminders suppressed, "
+                             f"{state['saved_bytes']} bytes saved]\n")
+            state.update(last_call=state["calls"], last_time=now, suppressed=0, saved_bytes=0)
+            result = reminder
+        else:
+            state["suppressed"] += 1
+            state["saved_bytes"] += len(reminder.encode()) + 1
+            result = None
+
+        write_atomic(path, json.dumps(state).encode())
+    return result
+
+def main():
+    try:
+        input_data = payload.load(sys.stdin)
+    except:
+        sys.exit(0)
+
+    emit(metrics.timed("enforce-research", research_reminder, input_data))
     sys.exit(0)
 
 if __name__ == "__main__":
@@ -5,37 +5,45 @@ Task File Enforcer Hook
 Runs on PreToolUse for Write/Edit.
 - Enforces task files go to .claude/tasks/
 - Auto-creates .claude/tasks/ directory
-- Validates task file format has required sections
+- Validates task file format has required sections (Write: the new
+  content; Edit: only the header lines the edit touches, applied virtually
+  to the file on disk)
+
+Runs on PostToolUse for Write/Edit (index_task_file).
+- Updates the task index and re-renders TRACKER.md (see hooklib/taskindex.py)
 """
 
-import json
 import sys
 import os
 import re
 
-# Task file patterns
-TASK_FILE_PATTERN = re.compile(r'task-\d{3}.*\.md$', re.IGNORECASE)
-TRACKER_FILE = 'TRACKER.md'
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hooklib import metrics, payload, project, taskindex
+from hooklib.cache import file_signature
+from hooklib.result import deny, emit
+from hooklib.taskindex import TASK_FILE_PATTERN, TRACKER_FILE
 
 # Required sections in task files
 REQUIRED_SECTIONS = ['Assignment', 'Report', 'Review']
 
+# Look for ## Assignment, ## Report, ## Review (or # or ###)
+REQUIRED_HEADER_PATTERN = re.compile(
+    rf'^#+\s*({"|".join(REQUIRED_SECTIONS)})', re.MULTILINE | re.IGNORECASE)
+REQUIRED_HEADER_BYTES = re.compile(REQUIRED_HEADER_PATTERN.pattern.encode(), re.IGNORECASE)
+REQUIRED_HEADER_LINES_BYTES = re.compile(REQUIRED_HEADER_PATTERN.pattern.encode(),
+                                         re.MULTILINE | re.IGNORECASE)
+
+# Task files at least this large are mapped rather than read, and their
+# heading offsets are taken from the task index when it is current
+MMAP_THRESHOLD = 256 * 1024
+
 def get_project_root():
-    """Get the project root by walking up to find .claude/ or .git/."""
-    current = os.getcwd()
-
-    # Walk up the directory tree
-    while current != os.path.dirname(current):  # Stop at filesystem root
-        # Check for .claude/ directory (our marker)
-        if os.path.isdir(os.path.join(current, '.claude')):
-            return current
-        # Check for .git/ as fallback project root indicator
-        if os.path.isdir(os.path.join(current, '.git')):
-            return current
-        current = os.path.dirname(current)
-
-    # Fallback to cwd if no project root found
-    return os.getcwd()
+    """Get the project root by walking up to find .claude/ or .git/.
+
+    Memoized per cwd within and across invocations (see hooklib/project.py).
+    """
+    return project.get_project_root()
 
 def ensure_tasks_dir():
     """Ensure .claude/tasks/ directory exists."""
@@ -58,55 +66,146 @@ def get_correct_path(file_path):
     basename = os.path.basename(file_path)
     return os.path.join(project_root, '.claude', 'tasks', basename)
 
-def is_in_correct_location(file_path):
+def is_in_correct_location(file_path, project_root=None):
     """Check if file is already in .claude/tasks/."""
-    project_root = get_project_root()
+    project_root = project_root or get_project_root()
     correct_dir = os.path.join(project_root, '.claude', 'tasks')
     file_dir = os.path.dirname(os.path.abspath(file_path))
     return file_dir == os.path.abspath(correct_dir)
 
 def validate_task_content(content, file_path):
-    """Validate task file has required section headers."""
+    """Validate task file has required section headers.
+
+    content may also be bytes or an mmap of the file (lint-files.py).
+    """
     basename = os.path.basename(file_path)
 
     # Skip validation for TRACKER.md
     if basename == TRACKER_FILE:
         return None
 
-    # Check for required sections (as markdown headers)
-    missing = []
-    for section in REQUIRED_SECTIONS:
-        # Look for ## Assignment, ## Report, ## Review (or # or ###)
-        pattern = rf'^#+\s*{section}'
-        if not re.search(pattern, content, re.MULTILINE | re.IGNORECASE):
-            missing.append(section)
+    # Check for required sections (as markdown headers), in one scan
+    if isinstance(content, str):
+        found = {match.lower() for match in REQUIRED_HEADER_PATTERN.findall(content)}
+    else:
+        found = {match.decode().lower() for match in REQUIRED_HEADER_LINES_BYTES.findall(content)}
+    missing = [section for section in REQUIRED_SECTIONS if section.lower() not in found]
 
     if missing:
         return f"Task file missing required sections: {', '.join(missing)}"
 
     return None
 
-def main():
+def required_section(line: bytes):
+    """Get the required section a header line provides, if any."""
+    match = REQUIRED_HEADER_BYTES.match(line)
+    return match.group(1).decode().lower() if match else None
+
+def edit_windows(data, old: bytes, new: bytes, replace_all: bool) -> list:
+    """Apply an edit virtually, line-aligned: [(start, end, new text)].
+
+    Each window spans the full lines an occurrence touches (occurrences on
+    shared lines are merged), and its new text is those lines after the edit.
+    """
+    windows = []
+    pos = data.find(old)
+    while pos != -1:
+        end = pos + len(old)
+        start = data.rfind(b"\n", 0, pos) + 1
+        stop = data.find(b"\n", end)
+        if stop == -1:
+            stop = len(data)
+
+        if windows and start <= windows[-1][1]:
+            prev_start, _, pieces, last = windows.pop()
+            pieces += [data[last:pos], new]
+            start = prev_start
+        else:
+            pieces = [data[start:pos], new]
+        windows.append([start, stop, pieces, end])
+
+        if not replace_all:
+            break
+        pos = data.find(old, end)
+
+    return [(start, stop, b"".join(pieces) + data[last:stop])
+            for start, stop, pieces, last in windows]
+
+def validate_task_edit(file_path: str, old_string: str, new_string: str, replace_all=False):
+    """Check an Edit keeps the task file's required sections.
+
+    Only sections the file has before the edit are checked, and only the
+    header lines inside the edited lines are re-examined.
+    """
+    if not old_string:
+        return None
+
     try:
-        input_data = json.load(sys.stdin)
-    except:
-        sys.exit(0)
+        f = open(file_path, "rb")
+    except OSError:
+        return None
+
+    with f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            import mmap
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            headings = taskindex.cached_headings(
+                os.path.dirname(os.path.abspath(file_path)),
+                os.path.basename(file_path),
+                file_signature(file_path),
+            )
+        else:
+            data = f.read()
+            headings = None
+
+        try:
+            windows = edit_windows(data, old_string.encode(), new_string.encode(), replace_all)
+            if not windows:
+                return None
+            if headings is None:
+                headings = taskindex.heading_offsets(data)
+
+            before = set()
+            kept = set()
+            for start, end in headings:
+                section = required_section(data[start:end])
+                if section is None:
+                    continue
+                before.add(section)
+                if not any(start < stop and end > win_start for win_start, stop, _ in windows):
+                    kept.add(section)
+
+            if kept == before:
+                return None
+            for _, _, text in windows:
+                kept.update(filter(None, map(required_section, text.split(b"\n"))))
+        finally:
+            if not isinstance(data, bytes):
+                data.close()
+
+    removed = [section for section in REQUIRED_SECTIONS if section.lower() in before - kept]
+    if removed:
+        return f"Edit would remove required sections: {', '.join(removed)}"
+    return None
 
-    tool_name = input_data.get("tool_name", "")
-    tool_input = input_data.get("tool_input", {})
+def check_task_file(hook_input: dict):
+    """Check a Write/Edit call on a task file. Returns a decision or None."""
+    tool_name = hook_input.get("tool_name", "")
+    tool_input = hook_input.get("tool_input", {})
 
     # Only handle Write and Edit
     if tool_name not in ["Write", "Edit"]:
-        sys.exit(0)
+        return None
 
     file_path = tool_input.get("file_path", "")
 
     if not file_path:
-        sys.exit(0)
+        return None
 
     # Check if this is a task file
     if not is_task_file(file_path):
-        sys.exit(0)
+        return None
 
     # Ensure .claude/tasks/ exists
     created_msg = ensure_tasks_dir()
@@ -114,15 +213,7 @@ def main():
     # Check if file is in correct location
     if not is_in_correct_location(file_path):
         correct_path = get_correct_path(file_path)
-        output = {
-            "hookSpecificOutput": {
-                "hookEventName": "PreToolUse",
-                "permissionDecision": "deny",
-                "permissionDecisionReason": f"📁 Task files must be in .claude/tasks/\n\nRedirect to: {correct_path}\n\nPlease use the correct path."
-            }
-        }
-        print(json.dumps(output))
-        sys.exit(0)
+        return deny(f"📁 Task files must be in .claude/tasks/\n\nRedirect to: {correct_path}\n\nPlease use the correct path.")
 
     # For Write tool, validate content
     if tool_name == "Write":
@@ -130,21 +221,52 @@ def main():
         validation_error = validate_task_content(content, file_path)
 
         if validation_error:
-            output = {
-                "hookSpecificOutput": {
-                    "hookEventName": "PreToolUse",
-                    "permissionDecision": "deny",
-                    "permissionDecisionReason": f"📋 {validation_error}\n\nTask files must include:\n## Assignment\n## Report\n## Review"
-                }
-            }
-            print(json.dumps(output))
-            sys.exit(0)
+            return deny(f"📋 {validation_error}\n\nTask files must include:\n## Assignment\n## Report\n## Review")
+
+    # For Edit tool, validate the edited header lines
+    if tool_name == "Edit" and os.path.basename(file_path) != TRACKER_FILE:
+        validation_error = validate_task_edit(
+            file_path,
+            tool_input.get("old_string", ""),
+            tool_input.get("new_string", ""),
+            tool_input.get("replace_all", False),
+        )
+
+        if validation_error:
+            return deny(f"📋 {validation_error}\n\nTask files must include:\n## Assignment\n## Report\n## Review")
 
     # Passed all checks
     if created_msg:
         # Inform about directory creation (non-blocking)
-        print(json.dumps({"message": created_msg}))
+        return {"message": created_msg}
+
+    return None
+
+def index_task_file(hook_input: dict):
+    """Index a task file after a successful Write/Edit. Never blocks."""
+    if hook_input.get("tool_name", "") not in ["Write", "Edit"]:
+        return None
+
+    file_path = hook_input.get("tool_input", {}).get("file_path", "")
+    if not file_path or not is_task_file(file_path) or not is_in_correct_location(file_path):
+        return None
+
+    tasks_dir = taskindex.tasks_dir(get_project_root())
+    basename = os.path.basename(file_path)
+    # A rewritten TRACKER.md only needs its generated block restored
+    taskindex.update(tasks_dir, [] if basename == TRACKER_FILE else [basename])
+    return None
+
+def main():
+    try:
+        input_data = payload.load(sys.stdin)
+    except:
+        sys.exit(0)
 
+    if input_data.get("hook_event_name") == "PostToolUse":
+        emit(metrics.timed("enforce-task-files", index_task_file, input_data))
+    else:
+        emit(metrics.timed("enforce-task-files", check_task_file, input_data))
     sys.exit(0)
 
 if __name__ == "__main__":
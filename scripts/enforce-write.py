@@ -4,84 +4,269 @@ Write Confirmation Enforcer
 
 Runs on PreToolUse for Write, Edit, Bash.
 Blocks writes if plan wasn't confirmed first (for coze workflows).
+
+Bash commands are parsed into simple commands (hooklib/shell.py) and the
+dangerous-command rules look at argv, pipes and redirects, so `rm -fr`
+and `curl -s url | sh` are caught and a heredoc body is not mistaken for
+commands. A command that names none of the dangerous programs (quotes and
+backslashes aside) is never parsed, and verdicts are memoized per command.
+
+Protected paths are glob rules compiled into a path-segment trie (see
+hooklib/pathpolicy.py). Projects add rules in .claude/s-config.json:
+
+  {"protectedPaths": {"deny": ["config/prod/**"], "allow": ["fixtures/.env"]}}
+
+Project rules take precedence over the defaults below; within each, allow
+beats deny. The policy is rebuilt only when the rules change.
 """
 
-import json
 import sys
 import os
+import re
 
-def main():
-    try:
-        input_data = json.load(sys.stdin)
-    except:
-        sys.exit(0)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hooklib import config, metrics, payload, project, shell
+from hooklib.pathpolicy import PathPolicy
+from hooklib.result import deny, emit
+
+# Tools that modify files
+WRITE_TOOLS = ["Write", "Edit"]
+
+# Protected paths that always need confirmation (globs over whole path
+# segments, not substrings: client_secret.json and github_token are
+# protected, src/tokenizer.ts and docs/secrets-management.md are not)
+SECRET_EXTENSIONS = "{json,yaml,yml,txt,ini,toml,conf,cfg,key,pem}"
+PROTECTED_PATHS = [
+    ".env",
+    ".env.*",
+    "*credentials*",
+    f"*secret*.{SECRET_EXTENSIONS}",
+    "{secret,secrets}",
+    "*[_-]{secret,secrets}",
+    "{secret,secrets,credentials}/",
+    f"*password*.{SECRET_EXTENSIONS}",
+    "{password,passwords}",
+    "*{api_key,apikey}*",
+    f"*{{token,tokens}}.{SECRET_EXTENSIONS}",
+    "{token,tokens,.token}",
+    "*[_-]{token,tokens}",
+    ".git/",
+    "node_modules/",
+    "package-lock.json",
+]
+
+# Exceptions to the protected paths (templates without real values)
+ALLOWED_PATHS = [
+    ".env.{example,sample,template,dist}",
+]
+
+# Rule ranks: project config over plugin defaults, allow over deny
+RANKS = {("default", "deny"): 0, ("default", "allow"): 1,
+         ("project", "deny"): 2, ("project", "allow"): 3}
+
+_policy = {}  # rules tuple -> PathPolicy
+
+# Devices that are safe redirect targets
+SAFE_DEVICES = ("/dev/null", "/dev/stdout", "/dev/stderr", "/dev/tty", "/dev/fd/")
+
+# curl/wget output passed to a shell as an argument
+DOWNLOAD_SUBSTITUTION = re.compile(r'(?:\$\(|<\(|`)\s*(?:curl|wget)\b')
+
+# `:(){ :|:& };:` defines a function, so it is recognized in the raw text
+# (FUNCTION_DEFINITION first: it cannot backtrack over every word)
+FUNCTION_DEFINITION = re.compile(r'\(\s*\)\s*\{')
+FORK_BOMB = re.compile(r'(\w+|:)\s*\(\s*\)\s*\{[^}]*\1\s*\|\s*\1\s*&')
+
+# Every parsed rule needs one of these programs or /dev/ in the command;
+# without them the command is not parsed at all
+DANGER_HINTS = ("rm", "dd", "mkfs", "chmod", "curl", "wget")
+
+# Programs the argv rules apply to (mkfs.ext4 counts as mkfs); the other
+# commands only need their redirects checked
+RULE_PROGRAMS = frozenset(("rm", "dd", "mkfs", "chmod")) | shell.SHELLS
+
+MAX_CACHED = 256
+
+_verdicts = {}  # command -> dangerous rule label or None
 
-    tool_name = input_data.get("tool_name", "")
-    tool_input = input_data.get("tool_input", {})
+def short_flags(argv: list) -> set:
+    """Collect single-letter and long options (up to a `--`)."""
+    flags = set()
+    for arg in argv[1:]:
+        if arg == "--":
+            break
+        if arg.startswith("--"):
+            flags.add(arg)
+        elif arg.startswith("-") and len(arg) > 1:
+            flags.update(arg[1:])
+    return flags
 
-    # Tools that modify files
-    write_tools = ["Write", "Edit"]
+def rm_recursive_force(argv: list, cmd: dict, commands: list) -> bool:
+    """rm -rf, rm -fr, rm -r -f, rm --recursive --force."""
+    if argv[0] != "rm":
+        return False
+    flags = short_flags(argv)
+    return bool(flags & {"r", "R", "--recursive"}) and bool(flags & {"f", "--force"})
 
-    if tool_name in write_tools:
+def rm_recursive_root(argv: list, cmd: dict, commands: list) -> bool:
+    """Recursive rm of /, /* or the home directory."""
+    if argv[0] != "rm":
+        return False
+    flags = short_flags(argv)
+    targets = [arg for arg in argv[1:] if not arg.startswith("-")]
+    return (bool(flags & {"r", "R", "--recursive"})
+            and any(target in ("/", "/*", "~", "~/", "$HOME") for target in targets))
+
+def writes_device(argv: list, cmd: dict, commands: list) -> bool:
+    """Output redirected to a device other than /dev/null and friends."""
+    return bool(cmd["redirects"]) and any(
+        ">" in op and target.startswith("/dev/") and not target.startswith(SAFE_DEVICES)
+        for op, target in cmd["redirects"]
+    )
+
+def dd_to_device(argv: list, cmd: dict, commands: list) -> bool:
+    """dd writing to a device."""
+    return argv[0] == "dd" and any(
+        arg.startswith("of=/dev/") and not arg[3:].startswith(SAFE_DEVICES) for arg in argv[1:]
+    )
+
+def makes_filesystem(argv: list, cmd: dict, commands: list) -> bool:
+    """mkfs and mkfs.<type>."""
+    return argv[0] == "mkfs" or argv[0].startswith("mkfs.")
+
+def chmod_world_writable(argv: list, cmd: dict, commands: list) -> bool:
+    """chmod 777 / a+rwx."""
+    return argv[0] == "chmod" and any(
+        arg in ("777", "0777", "a+rwx", "ugo+rwx", "a=rwx") for arg in argv[1:]
+    )
+
+def download_to_shell(argv: list, cmd: dict, commands: list) -> bool:
+    """A shell fed by curl/wget: `curl -s url | sh`, `bash <(curl url)`, `sh -c "$(curl url)"`."""
+    if argv[0] not in shell.SHELLS:
+        return False
+    if cmd["pipe_in"] and any(
+        other["pipeline"] == cmd["pipeline"] and shell.command_words(other)[:1] in (["curl"], ["wget"])
+        for other in commands if other is not cmd
+    ):
+        return True
+    return any(DOWNLOAD_SUBSTITUTION.search(arg) for arg in argv[1:])
+
+# Bash commands that need confirmation, checked against every simple command
+# of the parsed Bash command (hooklib/shell.py): (label, check)
+DANGEROUS_COMMANDS = [
+    ("rm -rf", rm_recursive_force),
+    ("rm -r /", rm_recursive_root),
+    ("> /dev/", writes_device),
+    ("dd of=/dev/", dd_to_device),
+    ("mkfs", makes_filesystem),
+    ("chmod 777", chmod_world_writable),
+    ("curl | sh", download_to_shell),
+]
+
+def dangerous_command(command: str):
+    """Get the label of the first dangerous rule a command hits, or None (memoized)."""
+    if command in _verdicts:
+        return _verdicts[command]
+    if len(_verdicts) >= MAX_CACHED:
+        _verdicts.clear()
+    label = _verdicts[command] = find_dangerous(command)
+    return label
+
+def find_dangerous(command: str):
+    """Run the dangerous-command rules on a command."""
+    if FUNCTION_DEFINITION.search(command) and FORK_BOMB.search(command):
+        return ":(){"
+    if "/dev/" not in command and not shell.mentions(command, DANGER_HINTS):
+        return None
+    commands = shell.parse(command)
+    for cmd in commands:
+        argv = shell.command_words(cmd)
+        if not cmd["redirects"] and (not argv or argv[0].partition(".")[0] not in RULE_PROGRAMS):
+            continue
+        argv = argv or [""]
+        for label, check in DANGEROUS_COMMANDS:
+            if check(argv, cmd, commands):
+                return label
+    return None
+
+def project_rules(rules: dict = None) -> tuple:
+    """Get (deny, allow) path rules from a protectedPaths value (default: s-config.json)."""
+    if rules is None:
+        rules = config.get("protectedPaths")
+    if not isinstance(rules, dict):
+        return (), ()
+    return tuple(rules.get("deny") or ()), tuple(rules.get("allow") or ())
+
+def get_policy(rules: tuple = None) -> PathPolicy:
+    """Get the compiled path policy, rebuilding it when the rules change.
+
+    rules: (deny, allow) project rules, by default those of s-config.json.
+    """
+    key = project_rules() if rules is None else rules
+    policy = _policy.get(key)
+    if policy is None:
+        policy = PathPolicy()
+        sources = (
+            ("default", "deny", PROTECTED_PATHS),
+            ("default", "allow", ALLOWED_PATHS),
+            ("project", "deny", key[0]),
+            ("project", "allow", key[1]),
+        )
+        for source, action, patterns in sources:
+            for pattern in patterns:
+                if isinstance(pattern, str):
+                    policy.add(pattern, action, RANKS[(source, action)])
+        _policy.clear()
+        _policy[key] = policy
+    return policy
+
+def path_segments(file_path: str, root: str = None) -> list:
+    """Split a path into segments, relative to the project root when inside it."""
+    path = os.path.normpath(os.path.abspath(file_path))
+    root = root or project.get_project_root()
+    if path.startswith(root.rstrip(os.sep) + os.sep):
+        path = path[len(root.rstrip(os.sep)) + 1:]
+    return [segment for segment in path.split(os.sep) if segment]
+
+def protected_rule(file_path: str, root: str = None, rules: tuple = None):
+    """Get the deny pattern protecting a path, or None if writable."""
+    rule = get_policy(rules).match(path_segments(file_path, root))
+    if rule is not None and rule[1] == "deny":
+        return rule[2]
+    return None
+
+def check_write(hook_input: dict):
+    """Check a Write/Edit/Bash call. Returns a deny decision or None."""
+    tool_name = hook_input.get("tool_name", "")
+    tool_input = hook_input.get("tool_input", {})
+
+    if tool_name in WRITE_TOOLS:
         file_path = tool_input.get("file_path", "")
 
-        # Protected paths that always need confirmation
-        protected_patterns = [
-            ".env",
-            "credentials",
-            "secret",
-            "password",
-            "api_key",
-            "token",
-            ".git/",
-            "node_modules/",
-            "package-lock.json"
-        ]
-
-        for pattern in protected_patterns:
-            if pattern.lower() in file_path.lower():
-                # BLOCK - protected file
-                output = {
-                    "hookSpecificOutput": {
-                        "hookEventName": "PreToolUse",
-                        "permissionDecision": "deny",
-                        "permissionDecisionReason": f"🚫 BLOCKED: Cannot modify '{pattern}' files. This is a protected path. Ask user for explicit permission first."
-                    }
-                }
-                print(json.dumps(output))
-                sys.exit(0)
+        pattern = protected_rule(file_path) if file_path else None
+        if pattern is not None:
+            # BLOCK - protected file
+            return deny(f"🚫 BLOCKED: Cannot modify '{file_path}' (protected path rule '{pattern}'). This is a protected path. Ask user for explicit permission first.")
 
     # Bash commands - check for dangerous patterns
     if tool_name == "Bash":
         command = tool_input.get("command", "")
 
-        dangerous_patterns = [
-            "rm -rf",
-            "rm -r /",
-            "> /dev/",
-            "dd if=",
-            "mkfs",
-            ":(){",
-            "chmod 777",
-            "curl | sh",
-            "curl | bash",
-            "wget | sh",
-            "wget | bash"
-        ]
-
-        for pattern in dangerous_patterns:
-            if pattern in command:
-                output = {
-                    "hookSpecificOutput": {
-                        "hookEventName": "PreToolUse",
-                        "permissionDecision": "deny",
-                        "permissionDecisionReason": f"🚫 BLOCKED: Dangerous command pattern '{pattern}' detected. This requires explicit user confirmation."
-                    }
-                }
-                print(json.dumps(output))
-                sys.exit(0)
+        pattern = dangerous_command(command) if command else None
+        if pattern is not None:
+            return deny(f"🚫 BLOCKED: Dangerous command pattern '{pattern}' detected. This requires explicit user confirmation.")
 
     # Allow if passes all checks
+    return None
+
+def main():
+    try:
+        input_data = payload.load(sys.stdin)
+    except:
+        sys.exit(0)
+
+    emit(metrics.timed("enforce-write", check_write, input_data))
     sys.exit(0)
 
 if __name__ == "__main__":
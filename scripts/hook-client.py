@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Hook Daemon Client
+
+Runs a hook script through the long-lived hook daemon instead of paying
+interpreter startup and imports for every hook.
+
+Usage:
+  python3 hook-client.py <script> [args...]
+
+Example (hooks.json):
+  python3 ${CLAUDE_PLUGIN_ROOT}/scripts/hook-client.py enforce-write
+
+If the daemon is down, it is started in the background and this call is
+evaluated in-process, so the output is always the same as the script's.
+Set S_HOOK_DAEMON_AUTOSTART=0 to never start the daemon.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hooklib import client
+
+def main():
+    if len(sys.argv) < 2:
+        sys.exit(0)
+
+    script = sys.argv[1]
+    argv = sys.argv[2:]
+    stdin_text = sys.stdin.read()
+
+    try:
+        stdout, stderr = client.request(script, argv, stdin_text)
+    except OSError:
+        if os.environ.get("S_HOOK_DAEMON_AUTOSTART", "1") != "0":
+            client.spawn_daemon()
+
+        # Fall back to in-process evaluation for this call
+        from hooklib import loader
+        try:
+            stdout, stderr = loader.run_script(script, argv, stdin_text)
+        except Exception as e:
+            stdout, stderr = "", f"[Hook client error: {e}]\n"
+
+    sys.stdout.write(stdout)
+    sys.stderr.write(stderr)
+    sys.exit(0)
+
+if __name__ == "__main__":
+    main()
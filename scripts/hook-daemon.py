@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Hook Daemon
+
+Optional long-lived server that keeps the hook scripts loaded in memory and
+answers hook-client.py requests over a Unix socket. It exits on its own after
+30 minutes without requests.
+
+Usage:
+  python3 hook-daemon.py serve    # Run in the foreground
+  python3 hook-daemon.py start    # Start in the background
+  python3 hook-daemon.py stop
+  python3 hook-daemon.py status
+
+Socket: $S_HOOK_SOCKET, else $XDG_RUNTIME_DIR/s-hooks.sock,
+else /tmp/s-hooks-<uid>.sock
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hooklib import client
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "status"
+    path = client.socket_path()
+
+    if command == "serve":
+        from hooklib import daemon
+        daemon.serve(path)
+    elif command == "start":
+        client.spawn_daemon()
+        print(f"Hook daemon starting on {path}")
+    elif command == "stop":
+        if client.stop_daemon():
+            print("Hook daemon stopped")
+        else:
+            print("Hook daemon not running")
+    elif command == "status":
+        from hooklib import daemon
+        state = "running" if daemon.is_running(path) else "not running"
+        print(f"Hook daemon {state} ({path})")
+    else:
+        print(__doc__)
+        sys.exit(1)
+
+    sys.exit(0)
+
+if __name__ == "__main__":
+    main()
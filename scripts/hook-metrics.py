@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Hook Metrics Report
+
+Summarizes the timing records hooks append to .claude/s-metrics.jsonl
+(enabled with S_HOOK_METRICS=1).
+
+Usage:
+  python3 hook-metrics.py [--session ID | --all] [--top N] [--json]
+
+By default only the most recent session is reported. The report ends with
+the hit rate of the session verdict cache (see hooklib/verdicts.py) and
+the checks that overran their latency budget (see hooklib/budgets.py),
+both kept even when metrics are off.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hooklib import budgets, metrics, verdicts
+
+def load_records(path: str) -> list[dict]:
+    """Load records from the metrics file and its rotated backup."""
+    records = []
+    for candidate in (path + ".1", path):
+        try:
+            with open(candidate) as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except OSError:
+            continue
+    return records
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+def summarize(records: list[dict]) -> list[dict]:
+    """Aggregate records per hook, slowest total first."""
+    by_hook = {}
+    for r in records:
+        by_hook.setdefault(r.get("hook", "?"), []).append(r)
+
+    rows = []
+    for hook, items in by_hook.items():
+        totals = [r.get("parse_ms", 0) + r.get("eval_ms", 0) for r in items]
+        rows.append({
+            "hook": hook,
+            "calls": len(items),
+            "total_ms": sum(totals),
+            "mean_ms": sum(totals) / len(totals),
+            "p95_ms": percentile(totals, 95),
+            "max_ms": max(totals),
+            "denies": sum(1 for r in items if r.get("decision") == "deny"),
+            "output_bytes": sum(r.get("output_bytes", 0) for r in items),
+        })
+    rows.sort(key=lambda row: row["total_ms"], reverse=True)
+    return rows
+
+def cache_line(stats: dict) -> str:
+    """Describe verdict cache stats in one line."""
+    lookups = stats["hits"] + stats["misses"]
+    return (f"Verdict cache: {stats['hits']}/{lookups} tool calls answered from cache "
+            f"({stats['hit_rate']:.0%}), {stats['entries']} verdicts cached")
+
+def summarize_overruns(records: list[dict]) -> list[dict]:
+    """Count budget overruns per hook, most first, with the latest input."""
+    by_hook = {}
+    for r in records:
+        row = by_hook.setdefault(r.get("hook", "?"), {
+            "hook": r.get("hook", "?"), "overruns": 0, "denied": 0, "budget_ms": 0, "last_input": "",
+        })
+        row["overruns"] += 1
+        row["denied"] += r.get("fallback") == "deny"
+        row["budget_ms"] = r.get("budget_ms", 0)
+        row["last_input"] = r.get("input", "")
+    return sorted(by_hook.values(), key=lambda row: row["overruns"], reverse=True)
+
+def print_overruns(rows: list[dict]):
+    """Print the budget overrun summary, if there were any."""
+    if not rows:
+        return
+    print()
+    print("Budget overruns:")
+    for row in rows:
+        print(f"  {row['overruns']:>4}x {row['hook']} (budget {row['budget_ms']} ms, "
+              f"{row['denied']} denied)  last: {row['last_input'] or '-'}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize S plugin hook metrics")
+    parser.add_argument("--session", help="session id to report (default: latest)")
+    parser.add_argument("--all", action="store_true", help="report every session")
+    parser.add_argument("--top", type=int, default=5, help="slowest invocations to list")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    path = metrics.metrics_path()
+    records = load_records(path)
+    if not records:
+        print(f"No hook metrics in {path}. Enable with S_HOOK_METRICS=1.")
+        stats = verdicts.stats("*" if args.all else args.session)
+        if stats["sessions"]:
+            print(cache_line(stats))
+        print_overruns(summarize_overruns(budgets.load_overruns(None if args.all else args.session)))
+        sys.exit(0)
+
+    if not args.all:
+        session = args.session or records[-1].get("session", "")
+        records = [r for r in records if r.get("session", "") == session]
+        scope = f"session {session or '(unknown)'}"
+        stats = verdicts.stats(session)
+        overruns = summarize_overruns(budgets.load_overruns(session))
+    else:
+        scope = "all sessions"
+        stats = verdicts.stats("*")
+        overruns = summarize_overruns(budgets.load_overruns())
+
+    rows = summarize(records)
+    slowest = sorted(records, key=lambda r: r.get("parse_ms", 0) + r.get("eval_ms", 0),
+                     reverse=True)[:args.top]
+
+    if args.json:
+        print(json.dumps({"scope": scope, "hooks": rows, "slowest": slowest,
+                          "verdict_cache": stats, "overruns": overruns}, indent=2))
+        sys.exit(0)
+
+    # hook-router records include the time of the checks they ran
+    checks = [row for row in rows if row["hook"] != "hook-router"]
+    print(f"Hook metrics for {scope} ({len(records)} records)")
+    print()
+    print(f"{'hook':<28} {'calls':>6} {'total ms':>10} {'mean':>8} {'p95':>8} {'max':>8} "
+          f"{'denies':>6} {'out KB':>8}")
+    for row in rows:
+        print(f"{row['hook']:<28} {row['calls']:>6} {row['total_ms']:>10.1f} {row['mean_ms']:>8.2f} "
+              f"{row['p95_ms']:>8.2f} {row['max_ms']:>8.2f} {row['denies']:>6} "
+              f"{row['output_bytes'] / 1024:>8.1f}")
+    print()
+    print(f"Checks total: {sum(row['total_ms'] for row in checks):.1f} ms")
+    print()
+    print(f"Slowest {len(slowest)} invocations:")
+    for r in slowest:
+        print(f"  {r.get('parse_ms', 0) + r.get('eval_ms', 0):8.2f} ms  {r.get('hook')} "
+              f"{r.get('event')} {r.get('tool') or ''} -> {r.get('decision')}")
+    if stats["sessions"]:
+        print()
+        print(cache_line(stats))
+    print_overruns(overruns)
+    sys.exit(0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Hook Router
+
+Single hook entry point per event. Parses the payload once and runs every
+registered check for the event in-process (see hooklib/router.py).
+
+Usage:
+  python3 -I -S hook-router.py <event>
+
+Events: SessionStart, UserPromptSubmit, PreToolUse, PostToolUse
+
+Kept tiny on purpose: the entry script runs as __main__ and is never
+bytecode-cached, so all logic lives in hooklib (imported from .pyc).
+"""
+
+import sys
+
+sys.path.insert(0, __file__.rpartition("/")[0] or ".")
+
+from hooklib import router
+
+def main():
+    # The watchdog may end the process, so only when run as a hook command
+    router.main(sys.argv, watchdog=__name__ == "__main__")
+    sys.exit(0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+"""
+Shared helpers for the S plugin hook scripts.
+
+The hook scripts in scripts/ stay runnable on their own; this package holds
+the pieces they share (script loading, routing, caches, the optional hook
+daemon).
+
+Modules here import lazily where they sit on the hook startup path: a hook
+that exits early should not pay for json, re or pathlib.
+"""
@@ -0,0 +1,267 @@
+"""
+Transcript Policy Audit
+
+Replays the tool calls of recorded session transcripts through the rules
+of enforce-write.py, enforce-build-only.py and enforce-task-files.py,
+offline, to show what they would have blocked: with each project's own
+protectedPaths, or with a candidate set in place of all of them.
+
+Candidate command patterns (regexes) can be audited too. They are tried
+on every simple command of a Bash call, after wrappers are stripped
+(hooklib/shell.py), and reported as check "candidate". The dangerous
+commands and dev-server patterns themselves live in code, not in
+s-config.json, so they always run as they are; a candidate pattern adds
+to them and cannot replace them.
+
+Each transcript is streamed through a generator pipeline: lines, then the
+tool_use blocks of assistant messages as PreToolUse inputs, then rule
+hits. Only counts and a few examples per rule are kept, so memory depends
+on the longest line, not on the length of the transcript. Transcripts are
+audited in parallel by a process pool.
+
+An Edit of a task file is checked against the file as it was on disk at
+the time, which a transcript does not record; those calls are counted as
+skipped.
+"""
+
+import json
+import os
+import re
+
+from hooklib import project
+
+# Examples are cut to this many characters of the command or path
+MAX_EXAMPLE_CHARS = 200
+
+TRANSCRIPT_SUFFIXES = (".jsonl", ".jsonl.gz")
+
+_roots = {}  # cwd -> project root
+_project_rules = {}  # project root -> (deny, allow) protectedPaths
+_scripts = {}  # script name -> module, loaded once per run
+_patterns = {}  # candidate command pattern -> compiled regex
+
+def checks(name: str):
+    """Get a hook script module (enforce-write, enforce-build-only, enforce-task-files)."""
+    module = _scripts.get(name)
+    if module is None:
+        from hooklib.loader import load_script
+        module = _scripts[name] = load_script(name)
+    return module
+
+def find_transcripts(paths: list) -> list:
+    """Expand files and directories into a sorted list of transcript files."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, dirs, files in os.walk(path):
+                dirs.sort()
+                found.extend(os.path.join(directory, name) for name in sorted(files)
+                             if name.endswith(TRANSCRIPT_SUFFIXES))
+        elif os.path.isfile(path):
+            found.append(path)
+    return found
+
+def read_lines(path: str):
+    """Yield (line number, raw line) of a transcript, gzipped or not."""
+    if path.endswith(".gz"):
+        import gzip
+        f = gzip.open(path, "rb")
+    else:
+        f = open(path, "rb")
+    with f:
+        yield from enumerate(f, 1)
+
+def tool_calls(lines, stats: dict):
+    """Yield (line number, PreToolUse hook input) for every tool_use block."""
+    for number, line in lines:
+        stats["lines"] += 1
+        if b'"tool_use"' not in line:
+            continue
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            stats["bad_lines"] += 1
+            continue
+        if not isinstance(entry, dict) or entry.get("type") != "assistant":
+            continue
+        message = entry.get("message")
+        content = message.get("content") if isinstance(message, dict) else None
+        if not isinstance(content, list):
+            continue
+        for block in content:
+            if (isinstance(block, dict) and block.get("type") == "tool_use"
+                    and isinstance(block.get("input"), dict)):
+                yield number, {
+                    "hook_event_name": "PreToolUse",
+                    "tool_name": block.get("name", ""),
+                    "tool_input": block["input"],
+                    "cwd": entry.get("cwd") or "",
+                    "session_id": entry.get("sessionId", ""),
+                }
+
+def root_for(cwd: str) -> str:
+    """Project root of a recorded cwd, found without touching the root cache."""
+    root = _roots.get(cwd)
+    if root is None:
+        root = project.walk_for_root(cwd)["root"] if cwd else os.sep
+        _roots[cwd] = root
+    return root
+
+def rules_for(root: str) -> tuple:
+    """The protectedPaths of a project's s-config.json, as it is now."""
+    rules = _project_rules.get(root)
+    if rules is None:
+        from hooklib.config import CONFIG_FILE
+        try:
+            with open(os.path.join(root, ".claude", CONFIG_FILE)) as f:
+                values = json.load(f)
+        except (OSError, ValueError):
+            values = {}
+        protected = values.get("protectedPaths") if isinstance(values, dict) else None
+        rules = checks("enforce-write").project_rules(protected if isinstance(protected, dict) else {})
+        _project_rules[root] = rules
+    return rules
+
+def command_hits(command: str, patterns: tuple):
+    """Yield the candidate command patterns any simple command of a Bash call matches."""
+    if not patterns:
+        return
+    from hooklib import shell
+
+    commands = [" ".join(cmd["words"]) for cmd in shell.parse(command)]
+    for pattern in patterns:
+        regex = _patterns.get(pattern)
+        if regex is None:
+            regex = _patterns[pattern] = re.compile(pattern, re.IGNORECASE)
+        if any(regex.search(text) for text in commands):
+            yield pattern
+
+def evaluate(hook_input: dict, candidate: tuple, stats: dict, commands: tuple = ()):
+    """Yield the (check, rule) pairs a tool call would have hit.
+
+    commands: candidate command patterns tried on Bash calls.
+    """
+    tool_name = hook_input["tool_name"]
+    tool_input = hook_input["tool_input"]
+    cwd = hook_input["cwd"]
+
+    if tool_name in ("Write", "Edit"):
+        file_path = tool_input.get("file_path")
+        if not isinstance(file_path, str) or not file_path:
+            return
+        stats["evaluated"] += 1
+        path = os.path.join(cwd, file_path) if cwd else file_path
+        root = root_for(cwd)
+
+        writer = checks("enforce-write")
+        pattern = writer.protected_rule(path, root, candidate if candidate is not None else rules_for(root))
+        if pattern is not None:
+            yield "enforce-write", f"protected path '{pattern}'"
+
+        tasks = checks("enforce-task-files")
+        if tasks.is_task_file(path):
+            if not tasks.is_in_correct_location(path, root):
+                yield "enforce-task-files", "task file outside .claude/tasks/"
+            elif tool_name == "Write":
+                content = tool_input.get("content")
+                if tasks.validate_task_content(content if isinstance(content, str) else "", path):
+                    yield "enforce-task-files", "missing required sections"
+            elif os.path.basename(path) != tasks.TRACKER_FILE:
+                stats["skipped"] += 1
+
+    elif tool_name == "Bash":
+        command = tool_input.get("command")
+        if not isinstance(command, str) or not command:
+            return
+        stats["evaluated"] += 1
+
+        label = checks("enforce-write").dangerous_command(command)
+        if label is not None:
+            yield "enforce-write", f"dangerous command '{label}'"
+        matched = checks("enforce-build-only").match_dev_server_command(command)
+        if matched:
+            yield "enforce-build-only", f"dev server {matched[0]}"
+        for pattern in command_hits(command, commands):
+            yield "candidate", f"command {pattern}"
+
+def example(path: str, number: int, hook_input: dict) -> dict:
+    """Describe a matched call for the report."""
+    tool_input = hook_input["tool_input"]
+    text = tool_input.get("command") or tool_input.get("file_path") or ""
+    if len(text) > MAX_EXAMPLE_CHARS:
+        text = text[:MAX_EXAMPLE_CHARS] + "..."
+    return {
+        "file": path,
+        "line": number,
+        "session": hook_input["session_id"],
+        "tool": hook_input["tool_name"],
+        "input": text,
+    }
+
+def empty_result() -> dict:
+    """Counters for one or more audited transcripts."""
+    return {"files": 0, "lines": 0, "bad_lines": 0, "tool_calls": 0, "evaluated": 0,
+            "blocked": 0, "skipped": 0, "errors": [], "rules": {}}
+
+def audit_file(path: str, candidate: tuple = None, examples: int = 3, commands: tuple = ()) -> dict:
+    """Audit one transcript."""
+    result = empty_result()
+    result["files"] = 1
+    rules = result["rules"]
+    try:
+        for number, hook_input in tool_calls(read_lines(path), result):
+            result["tool_calls"] += 1
+            hit = False
+            for check, rule in evaluate(hook_input, candidate, result, commands):
+                hit = True
+                entry = rules.setdefault((check, rule), {"check": check, "rule": rule,
+                                                        "hits": 0, "examples": []})
+                entry["hits"] += 1
+                if len(entry["examples"]) < examples:
+                    entry["examples"].append(example(path, number, hook_input))
+            result["blocked"] += hit
+    except (OSError, EOFError) as e:
+        result["errors"].append(f"{path}: {e}")
+    return result
+
+def merge(total: dict, result: dict, examples: int):
+    """Add one transcript's result to the running total."""
+    for key, value in result.items():
+        if key == "rules":
+            for rule_key, entry in value.items():
+                current = total["rules"].setdefault(rule_key, {**entry, "hits": 0, "examples": []})
+                current["hits"] += entry["hits"]
+                room = examples - len(current["examples"])
+                current["examples"].extend(entry["examples"][:max(room, 0)])
+        else:
+            total[key] += value
+
+def audit(paths: list, candidate: tuple = None, workers: int = None, examples: int = 3,
+          commands: tuple = ()) -> dict:
+    """Audit every transcript under paths; rules are listed by hits, most first.
+
+    candidate: (deny, allow) protectedPaths used instead of each project's.
+    commands: candidate command patterns (regexes), reported next to the
+        built-in rules.
+    """
+    from functools import partial
+
+    files = find_transcripts(paths)
+    worker = partial(audit_file, candidate=candidate, examples=examples, commands=tuple(commands))
+    total = empty_result()
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(files) < 2:
+        for result in map(worker, files):
+            merge(total, result, examples)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        for name in ("enforce-write", "enforce-build-only", "enforce-task-files"):
+            checks(name)  # loaded once here, inherited by forked workers
+        with ProcessPoolExecutor(min(workers, len(files))) as pool:
+            for result in pool.map(worker, files):
+                merge(total, result, examples)
+
+    total["rules"] = sorted(total["rules"].values(), key=lambda entry: (-entry["hits"], entry["rule"]))
+    return total
@@ -0,0 +1,142 @@
+"""
+Hook Latency Budgets
+
+How long each check may run, and what the router answers when it runs
+over. Budgets come from "hookBudgets" in .claude/s-config.json, in
+milliseconds per hook script (or per route label, "discover-skills dev"),
+with "default" for the rest:
+
+  {"hookBudgets": {"default": 3000, "enforce-write": 1000,
+                   "discover-skills": {"ms": 800, "onOverrun": "allow"}}}
+
+A check that overruns falls back to its route's default (router.register
+fail=): protection checks fail closed and deny the tool call, advisory
+checks fail open and are ignored. onOverrun "allow" or "deny" in a budget
+entry overrides that. Budgets are only read for a check still running after
+router.MIN_BUDGET (50 ms), which is therefore also the shortest budget.
+
+Hangs outside any check (finding the project root on a stalled mount,
+reading the config itself) are caught by the router process's watchdog,
+WATCHDOG_MS or S_HOOK_WATCHDOG_MS.
+
+Every overrun is appended to overruns.jsonl in the user cache dir, whether
+or not metrics are on, and hook-metrics.py lists them.
+"""
+
+import os
+import time
+
+from hooklib.cache import cache_dir
+
+OVERRUNS_FILE = "overruns.jsonl"
+MAX_OVERRUNS_BYTES = 256 * 1024
+
+# Milliseconds the whole router process may take before the watchdog answers
+WATCHDOG_MS = 10000
+
+FALLBACKS = {"open": "allow", "closed": "deny"}
+
+# Characters of the command, path or prompt kept in an overrun record
+MAX_INPUT_CHARS = 120
+
+def overruns_path() -> str:
+    """Get the overrun log."""
+    return os.path.join(cache_dir(), OVERRUNS_FILE)
+
+def watchdog_seconds() -> float:
+    """Seconds before the router watchdog answers for a hung process."""
+    try:
+        return int(os.environ.get("S_HOOK_WATCHDOG_MS", WATCHDOG_MS)) / 1000
+    except ValueError:
+        return WATCHDOG_MS / 1000
+
+def budget(label: str, script: str, seconds: float, fail: str) -> tuple:
+    """Get a route's (seconds, fallback) from hookBudgets, else its registered defaults.
+
+    fallback is "allow" or "deny".
+    """
+    from hooklib import config
+
+    fallback = FALLBACKS[fail]
+    budgets = config.get("hookBudgets")
+    if not isinstance(budgets, dict):
+        return seconds, fallback
+
+    for key in (label, script, "default"):
+        if key in budgets:
+            entry = budgets[key]
+            if isinstance(entry, dict):
+                if entry.get("onOverrun") in ("allow", "deny"):
+                    fallback = entry["onOverrun"]
+                entry = entry.get("ms")
+            if isinstance(entry, (int, float)) and not isinstance(entry, bool) and entry > 0:
+                seconds = entry / 1000
+            break
+    return seconds, fallback
+
+def fallback_result(label: str, seconds: float, fallback: str,
+                    setting: str = "hookBudgets in .claude/s-config.json"):
+    """The result that stands in for a check that overran its budget."""
+    if fallback != "deny":
+        return None
+    from hooklib.result import deny
+
+    return deny(f"⏱️ BLOCKED: {label} did not finish within {seconds * 1000:.0f} ms, so the "
+                f"call is blocked to be safe. Retry, or raise {setting} if it is legitimately slow.")
+
+def input_summary(hook_input: dict) -> str:
+    """The part of a payload that most likely made a check slow."""
+    tool_input = hook_input.get("tool_input")
+    text = ""
+    if isinstance(tool_input, dict):
+        text = tool_input.get("command") or tool_input.get("file_path") or ""
+    text = text if isinstance(text, str) else ""
+    text = text or hook_input.get("prompt") or ""
+    return text[:MAX_INPUT_CHARS] if isinstance(text, str) else ""
+
+def record_overrun(label: str, hook_input: dict, seconds: float, fallback: str, event: str = ""):
+    """Append an overrun to the log (rotated to .1 past MAX_OVERRUNS_BYTES)."""
+    import json
+
+    line = json.dumps({
+        "ts": round(time.time(), 3),
+        "session": hook_input.get("session_id", ""),
+        "event": event or hook_input.get("hook_event_name", ""),
+        "hook": label,
+        "tool": hook_input.get("tool_name", ""),
+        "budget_ms": round(seconds * 1000),
+        "fallback": fallback,
+        "input": input_summary(hook_input),
+    }) + "\n"
+    path = overruns_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            if os.path.getsize(path) > MAX_OVERRUNS_BYTES:
+                os.replace(path, path + ".1")
+        except OSError:
+            pass
+        with open(path, "a") as f:
+            f.write(line)
+    except OSError:
+        pass
+
+def load_overruns(session_id: str = None) -> list:
+    """Overrun records, oldest first; one session's, or all (None)."""
+    import json
+
+    records = []
+    path = overruns_path()
+    for candidate in (path + ".1", path):
+        try:
+            with open(candidate) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(record, dict) and session_id in (None, record.get("session")):
+                        records.append(record)
+        except OSError:
+            continue
+    return records
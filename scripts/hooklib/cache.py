@@ -0,0 +1,91 @@
+"""
+Cache Files
+
+Location and atomic read/write helpers for the plugin's on-disk caches.
+Caches are disposable: any read error is treated as a miss.
+"""
+
+import os
+from contextlib import contextmanager
+
+# Mode of new files written into the user's project (before the umask)
+SHARED_FILE_MODE = 0o644
+
+def cache_dir() -> str:
+    """Get the user cache directory for the plugin."""
+    override = os.environ.get("S_CACHE_DIR")
+    if override:
+        return override
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "s-plugin")
+
+def file_signature(path: str):
+    """Cheap change signature for a file: (mtime_ns, size), or None if missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def read_pickle(path: str):
+    """Read a pickled cache file. Returns None on any error."""
+    import pickle
+
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+def write_atomic(path: str, data: bytes, shared: bool = False):
+    """Write a file atomically (temp file + rename). Errors are ignored.
+
+    Cache files are private (0o600). A shared file lives in the user's
+    project (TRACKER.md, the task index): a new one gets SHARED_FILE_MODE
+    less the umask, an existing one keeps its mode.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        keep = None
+        if shared:
+            try:
+                keep = os.stat(path).st_mode & 0o7777
+            except OSError:
+                pass
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, SHARED_FILE_MODE if shared else 0o600)
+        try:
+            if keep is not None:
+                os.fchmod(fd, keep)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass
+
+@contextmanager
+def locked(path: str):
+    """Hold an exclusive lock on a lock file, for a read-modify-write of
+    state that several hook processes update at once."""
+    try:
+        import fcntl
+    except ImportError:  # no flock (Windows): atomic writes only
+        yield
+        return
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a") as lock:
+        fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+def write_pickle(path: str, value):
+    """Write a pickled cache file atomically."""
+    import pickle
+
+    write_atomic(path, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
@@ -0,0 +1,97 @@
+"""
+Hook Daemon Client
+
+Minimal client side of the hook daemon protocol. Only imports socket/json/os
+so the per-call cost stays at interpreter startup plus one round trip.
+
+Protocol: the client sends one JSON request and shuts down its write side;
+the daemon answers with one JSON object and closes the connection.
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+
+# Environment forwarded to the daemon with every request
+FORWARDED_ENV = ["CLAUDE_PLUGIN_ROOT", "CLAUDE_PROJECT_DIR", "S_HOOK_METRICS", "S_HOOK_PROFILE"]
+
+CONNECT_TIMEOUT = 0.2
+REQUEST_TIMEOUT = 10.0
+
+def socket_path() -> str:
+    """Get the Unix socket path for the hook daemon."""
+    override = os.environ.get("S_HOOK_SOCKET")
+    if override:
+        return override
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, "s-hooks.sock")
+    return f"/tmp/s-hooks-{os.getuid()}.sock"
+
+def request(script: str, argv: list, stdin_text: str) -> tuple[str, str]:
+    """Run a hook script through the daemon. Raises OSError if it is down."""
+    payload = {
+        "script": script,
+        "argv": argv,
+        "stdin": stdin_text,
+        "cwd": os.getcwd(),
+        "env": {k: os.environ[k] for k in FORWARDED_ENV if k in os.environ},
+    }
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(socket_path())
+        sock.settimeout(REQUEST_TIMEOUT)
+        sock.sendall(json.dumps(payload).encode())
+        sock.shutdown(socket.SHUT_WR)
+
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        sock.close()
+
+    try:
+        response = json.loads(b"".join(chunks))
+    except ValueError as e:
+        raise ConnectionError(f"Bad daemon response: {e}")
+    return response.get("stdout", ""), response.get("stderr", "")
+
+def spawn_daemon():
+    """Start the hook daemon in the background (fire and forget)."""
+    daemon_script = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        "hook-daemon.py",
+    )
+    try:
+        subprocess.Popen(
+            [sys.executable, daemon_script, "serve"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+            close_fds=True,
+        )
+    except OSError:
+        pass
+
+def stop_daemon() -> bool:
+    """Ask a running daemon to shut down. Returns False if none was running."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(socket_path())
+        sock.sendall(json.dumps({"command": "stop"}).encode())
+        sock.shutdown(socket.SHUT_WR)
+        sock.recv(65536)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
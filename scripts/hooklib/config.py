@@ -0,0 +1,92 @@
+"""
+Plugin Config
+
+Shared loader for .claude/s-config.json (written by /s:config). The parsed
+config is cached by file signature (mtime, size), so repeated lookups in one
+process, or across daemon requests, cost one stat.
+
+Environment variables, where a hook documents one, override the file.
+"""
+
+import os
+
+from hooklib.cache import file_signature
+from hooklib.project import get_project_root
+
+CONFIG_FILE = "s-config.json"
+
+DEFAULTS = {
+    "autoAccept": False,
+    "refine": {
+        "minLength": 10,
+        "skip": [],
+        "maxEcho": 4000,
+    },
+    "protectedPaths": {
+        "deny": [],
+        "allow": [],
+    },
+}
+
+_cache = {}  # path -> (signature, config)
+
+def config_path() -> str:
+    """Get the project's config file."""
+    return os.path.join(get_project_root(), ".claude", CONFIG_FILE)
+
+def same_kind(default, value) -> bool:
+    """Check a config value can stand in for its default (any number for a number)."""
+    if isinstance(default, bool) or isinstance(value, bool):
+        return isinstance(default, bool) and isinstance(value, bool)
+    if isinstance(default, (int, float)):
+        return isinstance(value, (int, float))
+    return isinstance(value, type(default))
+
+def merge_defaults(defaults: dict, values: dict) -> dict:
+    """Overlay config values on defaults (one level of nested dicts).
+
+    A section whose default is an object stays one, and so do the types of
+    its keys: a value of the wrong type ("refine": "off", "minLength": "5")
+    is ignored in favor of the default, so hooks can rely on DEFAULTS' shape.
+    """
+    merged = dict(defaults)
+    for key, value in values.items():
+        default = defaults.get(key)
+        if not isinstance(default, dict):
+            merged[key] = value
+        elif isinstance(value, dict):
+            merged[key] = dict(default)
+            for name, item in value.items():
+                if name not in default or same_kind(default[name], item):
+                    merged[key][name] = item
+    return merged
+
+def load_config() -> dict:
+    """Load the config, re-reading the file only when it changed."""
+    path = config_path()
+    signature = file_signature(path)
+
+    cached = _cache.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    values = {}
+    if signature is not None:
+        import json
+        try:
+            with open(path) as f:
+                values = json.load(f)
+        except (OSError, ValueError):
+            values = {}
+        if not isinstance(values, dict):
+            values = {}
+
+    config = merge_defaults(DEFAULTS, values)
+    _cache[path] = (signature, config)
+    return config
+
+def get(key: str, default=None, env: str = None):
+    """Get a config value; `env` names an environment override."""
+    if env and os.environ.get(env):
+        return os.environ[env]
+    return load_config().get(key, default)
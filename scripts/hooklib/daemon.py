@@ -0,0 +1,131 @@
+"""
+Hook Daemon Server
+
+Long-lived hook server on a Unix socket. Hook scripts are loaded once and kept
+in memory (reloaded when their file changes); each request runs the script's
+main() in-process and returns exactly what the standalone script prints.
+
+Requests are handled one at a time because each one switches cwd and the
+forwarded environment before running the script. For the same reason the
+router runs its checks inline here (router.INLINE): no check thread may
+outlive its request and read the next one's cwd, environment or project.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import time
+
+from hooklib import client, loader, metrics
+
+# Shut down after this many seconds without a request
+IDLE_TIMEOUT = 30 * 60
+
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+
+class HookRequestHandler(socketserver.StreamRequestHandler):
+    """Handle one hook request: run the script, reply with its output."""
+
+    def handle(self):
+        self.server.last_request = time.monotonic()
+        raw = self.rfile.read(MAX_REQUEST_BYTES)
+        try:
+            req = json.loads(raw)
+            if req.get("command") == "stop":
+                self.server.idle = True
+                response = {"stdout": "", "stderr": ""}
+            else:
+                response = run_request(req)
+        except Exception as e:
+            response = {"stdout": "", "stderr": f"[Hook daemon error: {e}]\n"}
+        self.wfile.write(json.dumps(response).encode())
+
+class HookServer(socketserver.UnixStreamServer):
+    """Unix socket server that stops itself after IDLE_TIMEOUT."""
+
+    timeout = 60
+
+    def __init__(self, path):
+        self.last_request = time.monotonic()
+        self.idle = False
+        super().__init__(path, HookRequestHandler)
+
+    def handle_timeout(self):
+        if time.monotonic() - self.last_request > IDLE_TIMEOUT:
+            self.idle = True
+
+def run_request(req: dict) -> dict:
+    """Run one hook script request in the request's cwd and environment."""
+    saved_cwd = os.getcwd()
+    saved_env = {k: os.environ.get(k) for k in client.FORWARDED_ENV}
+    try:
+        os.chdir(req.get("cwd") or saved_cwd)
+        env = req.get("env", {})
+        for key in client.FORWARDED_ENV:
+            if key in env:
+                os.environ[key] = env[key]
+            else:
+                os.environ.pop(key, None)
+
+        stdout, stderr = loader.run_script(
+            req["script"], req.get("argv", []), req.get("stdin", "")
+        )
+        metrics.flush()  # Written relative to the request's project
+        return {"stdout": stdout, "stderr": stderr}
+    finally:
+        os.chdir(saved_cwd)
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+def is_running(path: str) -> bool:
+    """Check whether a daemon is accepting connections on the socket."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(client.CONNECT_TIMEOUT)
+        sock.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+def serve(path: str = None):
+    """Serve hook requests until idle for IDLE_TIMEOUT."""
+    path = path or client.socket_path()
+
+    if os.path.exists(path):
+        if is_running(path):
+            return  # Another daemon already owns the socket
+        os.unlink(path)  # Stale socket from a dead daemon
+
+    old_umask = os.umask(0o077)
+    try:
+        server = HookServer(path)
+    except OSError:
+        return  # Lost the race to another daemon starting up
+    finally:
+        os.umask(old_umask)
+
+    from hooklib import router
+    router.INLINE = True
+
+    # Preload scripts so the first request is warm
+    for name in loader.HOOK_SCRIPTS:
+        try:
+            loader.load_script(name)
+        except Exception:
+            pass
+
+    try:
+        while not server.idle:
+            server.handle_request()
+    finally:
+        server.server_close()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
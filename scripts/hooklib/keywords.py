@@ -0,0 +1,143 @@
+"""
+Keyword Automaton
+
+Aho-Corasick matcher over all skill keywords. One pass over the lowercased
+prompt finds every keyword; a hit only counts on token boundaries, so short
+keywords like "go" or "ts" do not fire inside "good" or "requirements".
+A keyword of PLURAL_MIN_LENGTH characters or more may be followed by a
+plural "s"/"es" ("requirements" still hits "requirement"), and "story"
+also matches "stories". Shorter keywords must match exactly, so "go" does
+not fire on "goes".
+"""
+
+from collections import deque
+
+# Keywords shorter than this never match with a plural suffix
+PLURAL_MIN_LENGTH = 4
+
+def is_token_char(ch: str) -> bool:
+    """Characters that continue a token (a hit must not touch them)."""
+    return ch.isalnum() or ch == "_"
+
+class KeywordMatcher:
+    """Multi-pattern matcher mapping keywords to weighted groups (skills)."""
+
+    def __init__(self):
+        self.goto = [{}]   # state -> {char: state}
+        self.fail = [0]    # state -> fallback state
+        self.out = [[]]    # state -> keyword ids ending here
+        self.keywords = []  # id -> (pattern, keyword, group, weight)
+
+    def add(self, keyword: str, group: int, weight: float = 1.0):
+        """Add a keyword for a group. Call build() after the last add()."""
+        keyword = keyword.lower().strip()
+        if not keyword:
+            return
+        self._insert(keyword, keyword, group, weight)
+        if len(keyword) > 2 and keyword[-1] == "y" and keyword[-2] not in "aeiou":
+            self._insert(keyword[:-1] + "ies", keyword, group, weight)
+
+    def _insert(self, pattern: str, keyword: str, group: int, weight: float):
+        """Insert one pattern into the trie."""
+        state = 0
+        for ch in pattern:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+            state = nxt
+        self.out[state].append(len(self.keywords))
+        self.keywords.append((pattern, keyword, group, weight))
+
+    def build(self):
+        """Compute failure links (breadth-first) and merge outputs."""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(ch, 0)
+                self.fail[nxt] = target if target != nxt else 0
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+        return self
+
+    def find(self, text: str) -> set:
+        """Find ids of patterns that occur in text on token boundaries."""
+        text = text.lower()
+        size = len(text)
+        goto, fail, out, keywords = self.goto, self.fail, self.out, self.keywords
+        root = goto[0]
+        found = set()
+        state = 0
+
+        for i, ch in enumerate(text):
+            if state == 0 and ch not in root:
+                continue
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+
+            for kid in out[state]:
+                if kid in found:
+                    continue
+                start = i - len(keywords[kid][0]) + 1
+                if start > 0 and is_token_char(text[start - 1]):
+                    continue
+                if ends_token(text, i + 1, size, len(keywords[kid][0]) >= PLURAL_MIN_LENGTH):
+                    found.add(kid)
+
+        return found
+
+    def score(self, text: str) -> dict:
+        """Score groups by the summed weight of distinct matched keywords.
+
+        Returns {group: (score, [keywords in index order])}.
+        """
+        scores = {}
+        for kid in sorted(self.find(text)):
+            _, keyword, group, weight = self.keywords[kid]
+            score, matched = scores.get(group, (0, []))
+            if keyword in matched:
+                continue  # Singular and plural both hit
+            matched.append(keyword)
+            scores[group] = (score + weight, matched)
+        return scores
+
+def ends_token(text: str, end: int, size: int, plural: bool = True) -> bool:
+    """Check a hit ending at `end` is followed by a boundary (or, if plural, by s/es)."""
+    if end >= size or not is_token_char(text[end]):
+        return True
+    if not plural:
+        return False
+    for suffix in ("s", "es"):
+        after = end + len(suffix)
+        if text.startswith(suffix, end) and (after >= size or not is_token_char(text[after])):
+            return True
+    return False
+
+def keyword_entries(skill: dict) -> list[tuple[str, float]]:
+    """Get (keyword, weight) pairs for a skill.
+
+    Keywords are plain strings (weight 1) or {"keyword": ..., "weight": ...}.
+    """
+    entries = []
+    for kw in skill.get("keywords", []):
+        if isinstance(kw, dict):
+            entries.append((kw.get("keyword", ""), float(kw.get("weight", 1))))
+        else:
+            entries.append((kw, 1.0))
+    return entries
+
+def build_skill_matcher(skills: list) -> KeywordMatcher:
+    """Build one keyword automaton over a list of skills (group = index)."""
+    matcher = KeywordMatcher()
+    for i, skill in enumerate(skills):
+        for keyword, weight in keyword_entries(skill):
+            matcher.add(keyword, i, weight)
+    return matcher.build()
@@ -0,0 +1,221 @@
+"""
+Bulk Linter
+
+Checks every task file and skill file of a project in one run, with the
+rules the hooks apply one tool call at a time: task files need the
+sections enforce-task-files.py requires, and each SKILL.md must give the
+skill registry (hooklib/skillregistry.py) a known role and usable
+frontmatter. Duplicate task ids and duplicate skill names within a role
+are found after the per-file pass.
+
+Files are linted across a process pool once there are enough of them to
+pay for starting the workers. Task files of MMAP_THRESHOLD bytes or more
+are mapped rather than read, as in the Edit check. Each problem is a dict
+with path, line (0 for the whole file), severity, code and message.
+"""
+
+import os
+
+from hooklib import skillregistry, taskindex
+
+ERROR = "error"
+WARNING = "warning"
+
+# Below this many files the pool costs more to start than it saves
+POOL_MIN_FILES = 200
+
+def problem(path: str, severity: str, code: str, message: str, line: int = 0) -> dict:
+    """Build a problem record."""
+    return {"path": path, "line": line, "severity": severity, "code": code, "message": message}
+
+def task_checks():
+    """Get the enforce-task-files module, whose validation the hook runs."""
+    from hooklib.loader import load_script
+    return load_script("enforce-task-files")
+
+def lint_task(path: str) -> tuple:
+    """Lint one task file. Returns ({"path", "id"} or None, problems)."""
+    checks = task_checks()
+    name = os.path.basename(path)
+    try:
+        f = open(path, "rb")
+    except OSError as e:
+        return None, [problem(path, ERROR, "unreadable", e.strerror or str(e))]
+
+    problems = []
+    with f:
+        if os.fstat(f.fileno()).st_size >= checks.MMAP_THRESHOLD:
+            import mmap
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            data = f.read()
+        try:
+            error = checks.validate_task_content(data, path)
+            if error:
+                problems.append(problem(path, ERROR, "missing-sections", error))
+            title = taskindex.TITLE_PATTERN.search(data)
+            if title is not None:
+                title_id = title.group(1).decode().upper()
+                title_line = data[:title.start()].count(b"\n") + 1
+        finally:
+            if not isinstance(data, bytes):
+                data.close()
+
+    file_id = taskindex.FILE_ID_PATTERN.match(name)
+    if title is None:
+        problems.append(problem(path, WARNING, "no-title",
+                                "No '# Task: TASK-NNN Title' line; the id is taken from the file name"))
+        task_id = f"TASK-{file_id.group(1)}" if file_id else name
+    else:
+        task_id = title_id
+        if file_id and taskindex.task_number(task_id) != taskindex.task_number(file_id.group(1)):
+            problems.append(problem(path, WARNING, "id-mismatch",
+                                    f"Title says {task_id} but the file name says task-{file_id.group(1)}",
+                                    title_line))
+    return {"path": path, "id": task_id}, problems
+
+def frontmatter_line(content: str, key: str) -> int:
+    """Line number of a frontmatter key, or 1 if it is not there."""
+    lines = content.split("\n", 64)[:64]
+    for number, line in enumerate(lines[1:], 2):
+        if line.startswith("---"):
+            break
+        if line.startswith(key + ":"):
+            return number
+    return 1
+
+def has_sections(content: str) -> bool:
+    """Check a skill file has a ## or ### heading outside code fences (see split_sections)."""
+    from hooklib.sections import HEADING_PATTERN, strip_frontmatter
+
+    in_fence = False
+    for line in strip_frontmatter(content).split("\n"):
+        if line.lstrip().startswith("```"):
+            in_fence = not in_fence
+        elif not in_fence and line.startswith("##"):
+            match = HEADING_PATTERN.match(line)
+            if match and len(match.group(1)) >= 2:
+                return True
+    return False
+
+def lint_skill(root: str, path: str) -> tuple:
+    """Lint one SKILL.md. Returns ({"path", "root", "name", "roles"} or None, problems)."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            content = f.read()
+    except UnicodeDecodeError:
+        return None, [problem(path, ERROR, "encoding", "Not valid UTF-8")]
+    except OSError as e:
+        return None, [problem(path, ERROR, "unreadable", e.strerror or str(e))]
+
+    problems = []
+    meta = skillregistry.parse_frontmatter(content)
+    if not meta:
+        problems.append(problem(path, WARNING, "no-frontmatter",
+                                "No frontmatter; name, role and keywords come from the directory", 1))
+
+    name = meta.get("name") or os.path.basename(os.path.dirname(path))
+    roles = skillregistry.skill_roles(meta, root, path)
+    role_key = "role" if "role" in meta else "roles" if "roles" in meta else None
+    role_line = frontmatter_line(content, role_key) if role_key else 0
+    if not roles:
+        problems.append(problem(path, ERROR, "no-role",
+                                "No role: set `role` or move the skill into a role directory", role_line))
+    for role in roles:
+        if role not in skillregistry.ROLE_NAMES:
+            problems.append(problem(path, ERROR, "unknown-role",
+                                    f"Unknown role {role!r} (known: {', '.join(skillregistry.ROLE_NAMES)})",
+                                    role_line))
+
+    if meta and not meta.get("description"):
+        problems.append(problem(path, WARNING, "no-description", "No description", 1))
+    if meta and not meta.get("keywords"):
+        problems.append(problem(path, WARNING, "no-keywords",
+                                "No keywords; the words of the name are used", 1))
+    for keyword in skillregistry.parse_keywords(meta.get("keywords")):
+        if isinstance(keyword, str) and ":" in keyword:
+            problems.append(problem(path, WARNING, "bad-weight",
+                                    f"Keyword {keyword!r} has no numeric weight",
+                                    frontmatter_line(content, "keywords")))
+
+    if not has_sections(content):
+        problems.append(problem(path, WARNING, "no-sections",
+                                "No ## sections; only the preamble can be injected"))
+    return {"path": path, "root": root, "name": name, "roles": roles}, problems
+
+def lint_file(job: tuple) -> tuple:
+    """Lint one (kind, root, path) job. Returns (kind, record, problems)."""
+    kind, root, path = job
+    if kind == "task":
+        return (kind,) + lint_task(path)
+    return (kind,) + lint_skill(root, path)
+
+def find_jobs(tasks_dir: str = None, roots: list = None) -> list:
+    """List the task files of a task directory and the SKILL.md files under skill roots."""
+    jobs = []
+    if tasks_dir:
+        try:
+            names = sorted(name for name in os.listdir(tasks_dir) if taskindex.is_task_name(name))
+        except OSError:
+            names = []
+        jobs.extend(("task", tasks_dir, os.path.join(tasks_dir, name)) for name in names)
+    if roots:
+        _, skills = skillregistry.scan(roots)
+        jobs.extend(("skill", root, skill_path) for root, skill_path, _ in skills)
+    return jobs
+
+def cross_check(tasks: list, skills: list) -> list:
+    """Find task ids used by several files and skill names repeated within a role."""
+    problems = []
+
+    by_id = {}
+    for record in tasks:
+        by_id.setdefault(taskindex.task_number(record["id"]), []).append(record)
+    for records in by_id.values():
+        for record in records[1:]:
+            problems.append(problem(record["path"], ERROR, "duplicate-id",
+                                    f"{record['id']} is also used by {os.path.basename(records[0]['path'])}"))
+
+    # Across roots a repeated name is a user override; within one root it is a mistake
+    seen = {}
+    for record in skills:
+        for role in record["roles"]:
+            first = seen.setdefault((record["root"], role, record["name"]), record)
+            if first is not record:
+                problems.append(problem(record["path"], ERROR, "duplicate-skill",
+                                        f"{role} skill {record['name']!r} is also defined in {first['path']}"))
+    return problems
+
+def run(jobs: list, workers: int = None) -> list:
+    """Lint every job, across a process pool when there are enough of them."""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) < POOL_MIN_FILES:
+        return [lint_file(job) for job in jobs]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    if any(kind == "task" for kind, _, _ in jobs):
+        task_checks()  # loaded once here, inherited by forked workers
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(min(workers, len(jobs))) as pool:
+        return list(pool.map(lint_file, jobs, chunksize=chunksize))
+
+def lint(tasks_dir: str = None, roots: list = None, workers: int = None) -> dict:
+    """Lint a task directory and skill roots. Returns {"files", "errors", "warnings", "problems"}."""
+    jobs = find_jobs(tasks_dir, roots)
+    records = {"task": [], "skill": []}
+    problems = []
+    for kind, record, found in run(jobs, workers):
+        if record is not None:
+            records[kind].append(record)
+        problems.extend(found)
+    problems.extend(cross_check(records["task"], records["skill"]))
+    problems.sort(key=lambda p: (p["path"], p["line"], p["code"]))
+
+    errors = sum(1 for p in problems if p["severity"] == ERROR)
+    return {
+        "files": len(jobs),
+        "errors": errors,
+        "warnings": len(problems) - errors,
+        "problems": problems,
+    }
@@ -0,0 +1,80 @@
+"""
+In-process Hook Script Loader
+
+Loads the hyphenated hook scripts as modules and runs their main() with
+redirected stdin/stdout/argv, so a long-lived process can answer with exactly
+what the standalone script would have printed.
+"""
+
+import os
+import sys
+import types
+from importlib.machinery import SourceFileLoader
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Scripts that may be run in-process (and therefore through the daemon)
+HOOK_SCRIPTS = (
+    "discover-skills",
+    "enforce-build-only",
+    "enforce-research",
+    "enforce-task-files",
+    "enforce-write",
+    "hook-router",
+    "refine-prompt",
+    "session-rules",
+)
+
+_loaded = {}  # name -> (mtime, module)
+
+# Bumped whenever a script is (re)loaded; caches derived from the scripts
+# (hooklib/verdicts.py) are rebuilt when it changes
+generation = 0
+
+def script_path(name: str) -> str:
+    """Get the path of a hook script by name (without .py)."""
+    return os.path.join(SCRIPTS_DIR, f"{name}.py")
+
+def load_script(name: str):
+    """Load a hook script as a module, reloading it when the file changes."""
+    global generation
+    if name not in HOOK_SCRIPTS:
+        raise ValueError(f"Unknown hook script: {name}")
+
+    path = script_path(name)
+    mtime = os.stat(path).st_mtime_ns
+    cached = _loaded.get(name)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    # SourceFileLoader keeps bytecode in __pycache__ even for hyphenated names
+    source_loader = SourceFileLoader("s_hook_" + name.replace("-", "_"), path)
+    module = types.ModuleType(source_loader.name)
+    module.__file__ = path
+    module.__loader__ = source_loader
+    source_loader.exec_module(module)
+    _loaded[name] = (mtime, module)
+    generation += 1
+    return module
+
+def run_script(name: str, argv: list, stdin_text: str) -> tuple[str, str]:
+    """Run a hook script's main() in-process and capture its output."""
+    import io
+    from contextlib import redirect_stderr, redirect_stdout
+
+    module = load_script(name)
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    saved_argv, saved_stdin = sys.argv, sys.stdin
+    sys.argv = [script_path(name)] + list(argv)
+    sys.stdin = io.StringIO(stdin_text)
+    try:
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                module.main()
+            except SystemExit:
+                pass
+    finally:
+        sys.argv, sys.stdin = saved_argv, saved_stdin
+
+    return stdout.getvalue(), stderr.getvalue()
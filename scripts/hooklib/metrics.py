@@ -0,0 +1,133 @@
+"""
+Hook Telemetry
+
+Opt-in timing records for hook runs, appended to .claude/s-metrics.jsonl in
+the project. Enable with S_HOOK_METRICS=1.
+
+Records are buffered in memory and written with one append when the process
+exits (or when the daemon finishes a request). The file is rotated to
+s-metrics.jsonl.1 once it grows past MAX_METRICS_BYTES.
+
+Set S_HOOK_PROFILE=1 to also dump a cProfile profile per invocation into
+.claude/s-profiles/.
+"""
+
+import os
+import time
+
+METRICS_FILE = "s-metrics.jsonl"
+PROFILES_DIR = "s-profiles"
+MAX_METRICS_BYTES = 1024 * 1024
+
+_buffer = []
+_atexit_registered = False
+
+def enabled() -> bool:
+    """Check whether metrics recording is on."""
+    return os.environ.get("S_HOOK_METRICS", "") not in ("", "0")
+
+def profiling() -> bool:
+    """Check whether per-invocation profiling is on."""
+    return os.environ.get("S_HOOK_PROFILE", "") not in ("", "0")
+
+def claude_dir() -> str:
+    """Get the project's .claude directory."""
+    from hooklib.project import get_project_root
+    return os.path.join(get_project_root(), ".claude")
+
+def metrics_path() -> str:
+    """Get the project's metrics file."""
+    return os.path.join(claude_dir(), METRICS_FILE)
+
+def classify(result) -> str:
+    """Describe a check result for the metrics record."""
+    from hooklib.result import is_deny
+
+    if result is None:
+        return "none"
+    if is_deny(result):
+        return "deny"
+    if isinstance(result, dict):
+        return "message"
+    return "context"
+
+def output_bytes(result) -> int:
+    """Size of a result as it would be printed."""
+    if result is None:
+        return 0
+    if isinstance(result, dict):
+        import json
+        return len(json.dumps(result).encode()) + 1
+    return len(result.encode()) + 1
+
+def record(hook: str, hook_input: dict, result, parse_ms: float, eval_ms: float, event: str = ""):
+    """Buffer one timing record (no-op unless metrics are enabled)."""
+    global _atexit_registered
+
+    if not enabled():
+        return
+
+    _buffer.append({
+        "ts": round(time.time(), 3),
+        "session": hook_input.get("session_id", ""),
+        "event": event or hook_input.get("hook_event_name", ""),
+        "hook": hook,
+        "tool": hook_input.get("tool_name", ""),
+        "decision": classify(result),
+        "parse_ms": round(parse_ms, 3),
+        "eval_ms": round(eval_ms, 3),
+        "output_bytes": output_bytes(result),
+    })
+
+    if not _atexit_registered:
+        import atexit
+        atexit.register(flush)
+        _atexit_registered = True
+
+def timed(hook: str, check, hook_input: dict, *args, parse_ms: float = 0.0, event: str = ""):
+    """Run a check function and record its timing."""
+    if not enabled():
+        return check(hook_input, *args)
+
+    start = time.perf_counter()
+    result = check(hook_input, *args)
+    record(hook, hook_input, result, parse_ms, (time.perf_counter() - start) * 1000, event)
+    return result
+
+def flush():
+    """Append buffered records to the metrics file in one write."""
+    if not _buffer:
+        return
+
+    import json
+
+    lines = "".join(json.dumps(r) + "\n" for r in _buffer)
+    _buffer.clear()
+    try:
+        path = metrics_path()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            if os.path.getsize(path) > MAX_METRICS_BYTES:
+                os.replace(path, path + ".1")
+        except OSError:
+            pass
+        with open(path, "a") as f:
+            f.write(lines)
+    except OSError:
+        pass
+
+def profile_call(name: str, fn, *args):
+    """Run fn under cProfile and dump the stats to .claude/s-profiles/."""
+    import cProfile
+
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(fn, *args)
+    finally:
+        try:
+            directory = os.path.join(claude_dir(), PROFILES_DIR)
+            os.makedirs(directory, exist_ok=True)
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            profiler.dump_stats(os.path.join(directory, f"{name}-{stamp}-{os.getpid()}.prof"))
+        except OSError:
+            pass
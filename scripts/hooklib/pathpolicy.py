@@ -0,0 +1,154 @@
+"""
+Path Policy
+
+Compiles allow/deny glob rules into a trie over path segments. A path is
+matched by walking its segments once, carrying the set of trie states that
+are still live, so a check costs time proportional to the path's depth, not
+to the number of rules. Globs of the common shapes `*.ext` and `name*` are
+indexed by their literal suffix or prefix; only other globs are tried one
+by one.
+
+Rule syntax (gitignore-like, case-insensitive):
+- `*`, `?`, `[...]` match within one segment; `**` matches any segments
+- `{a,b}` expands to one rule per alternative
+- a pattern without `/` matches at any depth (`*.pem` == `**/*.pem`)
+- a trailing `/` matches everything below a directory (`.git/`)
+- other patterns are anchored at the project root
+
+When several rules match, the highest rank wins; callers rank project
+rules above plugin defaults and, within a source, allow above deny.
+"""
+
+from fnmatch import fnmatchcase
+
+GLOB_CHARS = frozenset("*?[")
+
+def expand_braces(pattern: str) -> list:
+    """Expand `{a,b}` alternatives (not nested) into separate patterns."""
+    start = pattern.find("{")
+    end = pattern.find("}", start + 1)
+    if start == -1 or end == -1:
+        return [pattern]
+    head, tail = pattern[:start], pattern[end + 1:]
+    return [
+        expanded
+        for option in pattern[start + 1:end].split(",")
+        for expanded in expand_braces(head + option + tail)
+    ]
+
+def pattern_segments(pattern: str) -> list:
+    """Split a rule pattern into trie segments (see module docstring)."""
+    pattern = pattern.strip().lower()
+    if pattern.endswith("/"):
+        pattern += "**"
+    if "/" not in pattern.rstrip("*").rstrip("/"):
+        pattern = "**/" + pattern
+    return [segment for segment in pattern.lstrip("/").split("/") if segment]
+
+class PathPolicy:
+    """Segment trie of ranked allow/deny rules."""
+
+    def __init__(self):
+        self.literal = [{}]  # state -> {segment: state}
+        self.suffixes = [{}]  # state -> {literal suffix of a `*suffix` glob: state}
+        self.prefixes = [{}]  # state -> {literal prefix of a `prefix*` glob: state}
+        self.globs = [[]]    # state -> [(glob, state)] for other globs
+        self.star = [None]   # state -> state after a `**` (loops on any segment)
+        self.loops = [False]  # state -> True for `**` states
+        self.rule = [None]   # state -> (rank, action, pattern) ending here
+
+    def _new_state(self, loops: bool = False) -> int:
+        """Append an empty state."""
+        self.literal.append({})
+        self.suffixes.append({})
+        self.prefixes.append({})
+        self.globs.append([])
+        self.star.append(None)
+        self.loops.append(loops)
+        self.rule.append(None)
+        return len(self.rule) - 1
+
+    def add(self, pattern: str, action: str, rank: int):
+        """Add a rule ("allow" or "deny") with a precedence rank."""
+        for expanded in expand_braces(pattern):
+            segments = pattern_segments(expanded)
+            if segments:
+                self._insert(segments, (rank, action, pattern))
+
+    def _insert(self, segments: list, rule: tuple):
+        """Insert one expanded pattern."""
+        state = 0
+        for segment in segments:
+            if segment == "**":
+                if self.star[state] is None:
+                    self.star[state] = self._new_state(loops=True)
+                state = self.star[state]
+            elif GLOB_CHARS.isdisjoint(segment):
+                state = self._child(self.literal[state], segment)
+            elif segment[0] == "*" and GLOB_CHARS.isdisjoint(segment[1:]):
+                state = self._child(self.suffixes[state], segment[1:])
+            elif segment[-1] == "*" and GLOB_CHARS.isdisjoint(segment[:-1]):
+                state = self._child(self.prefixes[state], segment[:-1])
+            else:
+                for glob, nxt in self.globs[state]:
+                    if glob == segment:
+                        break
+                else:
+                    nxt = self._new_state()
+                    self.globs[state].append((segment, nxt))
+                state = nxt
+
+        current = self.rule[state]
+        if current is None or rule[0] > current[0]:
+            self.rule[state] = rule
+
+    def _child(self, edges: dict, key: str) -> int:
+        """Follow an indexed edge, creating its state if needed."""
+        nxt = edges.get(key)
+        if nxt is None:
+            nxt = edges[key] = self._new_state()
+        return nxt
+
+    def _closure(self, states: set) -> set:
+        """Add the states reachable by matching `**` against no segment."""
+        pending = list(states)
+        while pending:
+            star = self.star[pending.pop()]
+            if star is not None and star not in states:
+                states.add(star)
+                pending.append(star)
+        return states
+
+    def match(self, segments: list):
+        """Get the winning (rank, action, pattern) for a path, or None."""
+        states = self._closure({0})
+        for segment in segments:
+            segment = segment.lower()
+            nxt = set()
+            for state in states:
+                if self.loops[state]:
+                    nxt.add(state)
+                target = self.literal[state].get(segment)
+                if target is not None:
+                    nxt.add(target)
+                suffixes = self.suffixes[state]
+                if suffixes:
+                    nxt.update(suffixes[segment[i:]] for i in range(len(segment) + 1)
+                               if segment[i:] in suffixes)
+                prefixes = self.prefixes[state]
+                if prefixes:
+                    nxt.update(prefixes[segment[:i]] for i in range(len(segment) + 1)
+                               if segment[:i] in prefixes)
+                for glob, target in self.globs[state]:
+                    if fnmatchcase(segment, glob):
+                        nxt.add(target)
+            if not nxt:
+                return None
+            states = self._closure(nxt)
+
+        best = None
+        for state in states:
+            rule = self.rule[state]
+            if rule is not None and (best is None or rule[0] > best[0]):
+                best = rule
+        return best
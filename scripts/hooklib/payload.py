@@ -0,0 +1,215 @@
+"""
+Lazy Hook Payload
+
+Decodes a hook payload without decoding its large values. Routing needs
+tool_name and file_path, but a Write payload carries the whole file in
+tool_input.content and a Read payload the whole output in tool_response;
+json.loads would copy every one of those megabytes into a new string
+first.
+
+parse() walks the raw text once: objects become LazyDict instances, small
+values are decoded as usual, and string or array values longer than
+LAZY_BYTES are only located. A string's end is found a chunk at a time:
+escaped backslashes and quotes are masked with str.replace and the first
+quote left is the closing one, so the scan runs at C speed in a few
+hundred KB of memory, where a regex slows down at every escape. A large
+value is decoded the first time a check reads it, so the task-file
+validation pays for `content` and the path checks never do.
+"""
+
+import json
+import re
+
+# Values whose raw JSON text is longer than this are decoded on first access
+LAZY_BYTES = 64 * 1024
+
+# Payloads shorter than this are decoded with json.loads directly
+MIN_LAZY_PAYLOAD = 256 * 1024
+
+# Strings are scanned in chunks growing from the first to the largest size
+FIRST_CHUNK = 256
+MAX_CHUNK = 256 * 1024
+
+CONTAINER_TOKEN = re.compile(r'[\[\]{}"]')
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+_decoder = json.JSONDecoder()
+
+class LazyDict(dict):
+    """A JSON object whose large values are decoded on first access.
+
+    Reads through get(), [], `in`, iteration, items(), == and json.dumps
+    see every key; only a C-level copy (dict(d), {**d}) would miss the
+    pending ones, so use copy(), which decodes them first.
+    """
+
+    def __init__(self, raw: str):
+        super().__init__()
+        self._raw = raw
+        self._pending = {}  # key -> (start, end) of the raw value
+
+    def _decode(self, key):
+        start, _ = self._pending.pop(key)
+        value, _ = _decoder.raw_decode(self._raw, start)  # no copy of the raw slice
+        dict.__setitem__(self, key, value)
+        return value
+
+    def _decode_all(self):
+        for key in list(self._pending):
+            self._decode(key)
+
+    def is_pending(self, key) -> bool:
+        """Check whether a key's value is still undecoded."""
+        return key in self._pending
+
+    def raw_size(self, key) -> int:
+        """Length of a pending value's raw JSON text (0 if decoded)."""
+        span = self._pending.get(key)
+        return span[1] - span[0] if span else 0
+
+    def __getitem__(self, key):
+        if key in self._pending:
+            return self._decode(key)
+        return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        if key in self._pending:
+            return self._decode(key)
+        return dict.get(self, key, default)
+
+    def __contains__(self, key):
+        return key in self._pending or dict.__contains__(self, key)
+
+    def __len__(self):
+        return dict.__len__(self) + len(self._pending)
+
+    def __iter__(self):
+        self._decode_all()
+        return dict.__iter__(self)
+
+    def keys(self):
+        self._decode_all()
+        return dict.keys(self)
+
+    def values(self):
+        self._decode_all()
+        return dict.values(self)
+
+    def items(self):
+        self._decode_all()
+        return dict.items(self)
+
+    def copy(self):
+        self._decode_all()
+        return dict(self)
+
+    def pop(self, key, *default):
+        if key in self._pending:
+            self._decode(key)
+        return dict.pop(self, key, *default)
+
+    def __eq__(self, other):
+        self._decode_all()
+        if isinstance(other, LazyDict):
+            other._decode_all()
+        return dict.__eq__(self, other)
+
+    def __repr__(self):
+        self._decode_all()
+        return dict.__repr__(self)
+
+def skip_whitespace(raw: str, i: int) -> int:
+    """Index of the next non-whitespace character."""
+    return WHITESPACE.match(raw, i).end()
+
+def string_end(raw: str, i: int) -> int:
+    """Index just past the JSON string starting at raw[i]."""
+    if not raw.startswith('"', i):
+        raise ValueError(f"expected string at {i}")
+    start = i + 1
+    size = FIRST_CHUNK
+    while True:
+        chunk = raw[start:start + size]
+        if not chunk:
+            raise ValueError(f"unterminated string at {i}")
+        masked = chunk.replace("\\\\", "  ").replace('\\"', "  ")
+        end = masked.find('"')
+        if end != -1:
+            return start + end + 1
+        # A trailing backslash escapes the first character of the next chunk
+        start += len(chunk) - (masked[-1] == "\\")
+        size = min(size * 2, MAX_CHUNK)
+
+def container_end(raw: str, i: int) -> int:
+    """Index just past the array or object starting at raw[i]."""
+    depth = 0
+    while True:
+        match = CONTAINER_TOKEN.search(raw, i)
+        if match is None:
+            raise ValueError(f"unterminated container at {i}")
+        ch = match.group()
+        if ch == '"':
+            i = string_end(raw, match.start())
+            continue
+        i = match.end()
+        depth += 1 if ch in "[{" else -1
+        if depth == 0:
+            return i
+
+def parse_object(raw: str, i: int) -> tuple:
+    """Parse the object at raw[i]; returns (LazyDict, index after it)."""
+    obj = LazyDict(raw)
+    i = skip_whitespace(raw, i + 1)
+    if raw.startswith("}", i):
+        return obj, i + 1
+
+    while True:
+        end = string_end(raw, i)
+        key = json.loads(raw[i:end]) if "\\" in raw[i:end] else raw[i + 1:end - 1]
+        i = skip_whitespace(raw, end)
+        if not raw.startswith(":", i):
+            raise ValueError(f"expected ':' at {i}")
+        i = skip_whitespace(raw, i + 1)
+
+        ch = raw[i:i + 1]
+        if ch == "{":
+            value, end = parse_object(raw, i)
+            dict.__setitem__(obj, key, value)
+        elif ch in ('"', "["):
+            end = string_end(raw, i) if ch == '"' else container_end(raw, i)
+            if end - i > LAZY_BYTES:
+                obj._pending[key] = (i, end)
+            else:
+                dict.__setitem__(obj, key, json.loads(raw[i:end]))
+        else:
+            value, end = _decoder.raw_decode(raw, i)
+            dict.__setitem__(obj, key, value)
+
+        i = skip_whitespace(raw, end)
+        if raw.startswith(",", i):
+            i = skip_whitespace(raw, i + 1)
+        elif raw.startswith("}", i):
+            return obj, i + 1
+        else:
+            raise ValueError(f"expected ',' or '}}' at {i}")
+
+def parse(raw: str):
+    """Decode a hook payload, leaving large values undecoded until read.
+
+    Small payloads and anything that is not a JSON object go through
+    json.loads (which raises json.JSONDecodeError on bad input).
+    """
+    start = skip_whitespace(raw, 0)
+    if len(raw) < MIN_LAZY_PAYLOAD or not raw.startswith("{", start):
+        return json.loads(raw)
+    try:
+        obj, end = parse_object(raw, start)
+    except (ValueError, IndexError):
+        return json.loads(raw)
+    if skip_whitespace(raw, end) != len(raw):
+        return json.loads(raw)
+    return obj
+
+def load(stream):
+    """Read and decode a hook payload from a file object (like json.load)."""
+    return parse(stream.read())
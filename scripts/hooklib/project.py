@@ -0,0 +1,99 @@
+"""
+Project Root Discovery
+
+Finds the project root (nearest ancestor of cwd with .claude/ or .git/).
+The answer is memoized in-process and cached across invocations in a small
+JSON file keyed by cwd.
+
+A cached answer is checked with one stat per directory between cwd and the
+root: creating or removing .claude/ or .git/ in a directory changes that
+directory's mtime, so unchanged mtimes prove the walk would give the same
+answer.
+"""
+
+import json
+import os
+import time
+
+from hooklib.cache import cache_dir, write_atomic
+
+ROOT_MARKERS = (".claude", ".git")
+
+# Entries kept in the cross-invocation cache file
+MAX_CACHED_ROOTS = 64
+
+# Seconds an in-process answer is trusted before re-checking (daemon)
+MEMO_TTL = 1.0
+
+_memo = {}  # cwd -> (checked_at, entry)
+
+def roots_cache_path() -> str:
+    """Get the cross-invocation project root cache file."""
+    return os.path.join(cache_dir(), "project-roots.json")
+
+def dir_mtime(path: str):
+    """Get a directory's mtime_ns, or None if it is gone."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+def walk_for_root(cwd: str) -> dict:
+    """Walk up from cwd to find the root, recording each directory's mtime."""
+    current = cwd
+    dirs = []
+
+    # Walk up the directory tree
+    while current != os.path.dirname(current):  # Stop at filesystem root
+        dirs.append([current, dir_mtime(current)])
+        for marker in ROOT_MARKERS:
+            if os.path.isdir(os.path.join(current, marker)):
+                return {"root": current, "dirs": dirs}
+        current = os.path.dirname(current)
+
+    # Fallback to cwd if no project root found
+    return {"root": cwd, "dirs": dirs}
+
+def is_valid(entry) -> bool:
+    """Check no directory on the walked path changed since it was cached."""
+    if not isinstance(entry, dict) or not entry.get("dirs"):
+        return False
+    return all(dir_mtime(path) == mtime for path, mtime in entry["dirs"])
+
+def load_roots_cache() -> dict:
+    """Read the cross-invocation cache ({} on any error)."""
+    try:
+        with open(roots_cache_path()) as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_root(cwd: str, entry: dict, cached: dict):
+    """Store an entry in the cross-invocation cache, keeping it small."""
+    cached.pop(cwd, None)
+    cached[cwd] = entry
+    while len(cached) > MAX_CACHED_ROOTS:
+        cached.pop(next(iter(cached)))
+    write_atomic(roots_cache_path(), json.dumps(cached).encode())
+
+def get_project_root(cwd: str = None) -> str:
+    """Get the project root by walking up to find .claude/ or .git/."""
+    cwd = cwd or os.getcwd()
+    now = time.monotonic()
+
+    memo = _memo.get(cwd)
+    if memo and now - memo[0] < MEMO_TTL:
+        return memo[1]["root"]
+
+    if memo and is_valid(memo[1]):
+        entry = memo[1]
+    else:
+        cached = load_roots_cache()
+        entry = cached.get(cwd)
+        if not is_valid(entry):
+            entry = walk_for_root(cwd)
+            save_root(cwd, entry, cached)
+
+    _memo[cwd] = (now, entry)
+    return entry["root"]
@@ -0,0 +1,69 @@
+"""
+Hook Results
+
+Check functions return one of:
+- None: nothing to say (allow)
+- dict: JSON hook output, printed with json.dumps
+- str: plain text, printed as-is (added to context for prompt/session hooks)
+
+merge() combines several results for one event under a deny-wins rule.
+"""
+
+def deny(reason: str) -> dict:
+    """Build a PreToolUse deny decision."""
+    return {
+        "hookSpecificOutput": {
+            "hookEventName": "PreToolUse",
+            "permissionDecision": "deny",
+            "permissionDecisionReason": reason
+        }
+    }
+
+def emit(result):
+    """Print a check result the way the standalone scripts do."""
+    if result is None:
+        return
+    if isinstance(result, dict):
+        import json
+        print(json.dumps(result))
+    else:
+        print(result)
+
+def is_deny(result) -> bool:
+    """Check if a result blocks the tool call."""
+    if not isinstance(result, dict):
+        return False
+    if result.get("decision") == "block":
+        return True
+    specific = result.get("hookSpecificOutput", {})
+    return specific.get("permissionDecision") == "deny"
+
+def merge(results: list, event: str = ""):
+    """Merge check results: the first deny wins outright.
+
+    Otherwise plain-text results are joined in order and JSON results are
+    merged (earlier checks keep their keys). If both kinds are present, the
+    text is carried as hookSpecificOutput.additionalContext.
+    """
+    results = [r for r in results if r is not None]
+
+    for result in results:
+        if is_deny(result):
+            return result
+
+    texts = [r for r in results if isinstance(r, str)]
+    merged = {}
+    for result in results:
+        if isinstance(result, dict):
+            for key, value in result.items():
+                merged.setdefault(key, value)
+
+    if not merged:
+        return "\n".join(texts) if texts else None
+
+    if texts:
+        specific = dict(merged.get("hookSpecificOutput", {}))
+        specific.setdefault("hookEventName", event)
+        specific["additionalContext"] = "\n".join(texts)
+        merged["hookSpecificOutput"] = specific
+    return merged
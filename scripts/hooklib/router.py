@@ -0,0 +1,456 @@
+"""
+Hook Router
+
+One entry point per hook event. The payload is parsed once and dispatched to
+every registered check whose matcher applies; results are merged with
+hooklib.result.merge (deny wins).
+
+Checks are the plain functions exported by the hook scripts. Adding a rule is
+one register() call.
+
+For tool events, main() first peeks at the raw payload for the tool name;
+when no route applies it exits before json, re or any check is imported.
+Full payloads are decoded with hooklib.payload, which leaves multi-megabyte
+values (Write content, Read output) undecoded until a check reads them.
+
+Checks run in their own threads, concurrently when several apply, each
+under its latency budget (hooklib/budgets.py). The router returns as soon
+as one check denies, so a tool call waits for the slowest check it needs,
+not the sum of all of them; of the checks finished by then, the first
+registered deny is the answer. A check that overruns its budget is answered
+by its route's fallback: protection checks fail closed (deny), advisory
+checks fail open (no result). It is left to finish in the background;
+threads cannot be killed, but they are daemonic and never delay the hook
+process's exit. A watchdog bounds the whole hook process the same way.
+
+Inside the hook daemon (INLINE), checks run one after another in the
+request's thread instead: cwd, environment and project root belong to one
+request at a time, and a thread left running past its budget would see
+the next request's. An inline overrun is judged when the check returns,
+with the same fallback, and the watchdog is never armed.
+
+Checks registered with cache= are answered from a per-session verdict
+cache (hooklib/verdicts.py) when the same tool input comes again.
+"""
+
+import sys
+
+ROUTES = {}  # event -> [route dict]
+
+_answer = None  # lock taken by whichever of handle() and the watchdog answers first
+
+TOOL_EVENTS = ("PreToolUse", "PostToolUse")
+
+# Seconds a check may run before the router stops waiting for it, unless
+# hookBudgets in s-config.json says otherwise
+CHECK_TIMEOUT = 5.0
+
+# Seconds every check gets before its budget is even looked up (the floor
+# of any budget)
+MIN_BUDGET = 0.05
+
+# Run checks in the calling thread (set by the hook daemon)
+INLINE = False
+
+def register(event: str, script: str, check: str, tools=None, prompt=None, args=(),
+             payload=True, timeout=CHECK_TIMEOUT, cache=None, fail="open"):
+    """Register a script's check function for an event.
+
+    tools: tool names the check applies to (PreToolUse/PostToolUse)
+    prompt: regex the prompt must match (UserPromptSubmit)
+    args: extra positional arguments passed after the hook input
+    payload: False if the check ignores the hook input, or a tuple of the
+        top-level string fields it reads; either skips JSON decoding when no
+        other check of the event needs the full payload
+    timeout: default budget in seconds (hookBudgets in s-config.json overrides)
+    cache: the tool_input fields the check's verdict depends on alone; the
+        verdict is then cached per session, keyed on tool name and fields
+    fail: what an overrun means: "open" (no result, for advisory checks)
+        or "closed" (deny, for protection checks)
+    """
+    ROUTES.setdefault(event, []).append({
+        "script": script,
+        "check": check,
+        "tools": frozenset(tools) if tools else None,
+        "prompt": prompt,
+        "args": tuple(args),
+        "payload": payload,
+        "timeout": timeout,
+        "cache": tuple(cache) if cache else None,
+        "fail": fail,
+    })
+
+register("SessionStart", "session-rules", "session_rules",
+         payload=("session_id", "source", "transcript_path"))
+
+register("UserPromptSubmit", "refine-prompt", "refine")
+register("UserPromptSubmit", "session-rules", "role_rules", prompt=r"^(?:/s:|@)dev(?:\s|$)", args=["dev"])
+register("UserPromptSubmit", "session-rules", "role_rules", prompt=r"^(?:/s:|@)ba(?:\s|$)", args=["ba"])
+register("UserPromptSubmit", "session-rules", "role_rules", prompt=r"^(?:/s:|@)design(?:\s|$)", args=["design"])
+register("UserPromptSubmit", "session-rules", "role_rules", prompt=r"^(?:/s:|@)tech-lead(?:\s|$)", args=["tech-lead"])
+register("UserPromptSubmit", "discover-skills", "discover_skills", prompt=r"^@dev\s", args=["dev"])
+register("UserPromptSubmit", "discover-skills", "discover_skills", prompt=r"^@ba\s", args=["ba"])
+register("UserPromptSubmit", "discover-skills", "discover_skills", prompt=r"^@design\s", args=["design"])
+register("UserPromptSubmit", "discover-skills", "discover_skills", prompt=r"^@tech-lead\s", args=["tech-lead"])
+register("UserPromptSubmit", "discover-skills", "discover_skills", prompt=r"^@pm\s", args=["pm"])
+register("UserPromptSubmit", "discover-skills", "discover_skills", prompt=r"^@tester\s", args=["tester"])
+
+register("PreToolUse", "enforce-write", "check_write", tools=["Write", "Edit", "Bash"],
+         cache=("file_path", "command"), fail="closed")
+register("PreToolUse", "enforce-task-files", "check_task_file", tools=["Write", "Edit"], fail="closed")
+register("PreToolUse", "enforce-build-only", "check_command", tools=["Bash"], cache=("command",),
+         fail="closed")
+
+register("PostToolUse", "enforce-task-files", "index_task_file", tools=["Write", "Edit"])
+register("PostToolUse", "enforce-research", "research_reminder",
+         tools=["Read", "Glob", "Grep", "WebSearch", "WebFetch"])
+
+def applies(route: dict, hook_input: dict) -> bool:
+    """Check whether a route's matcher applies to the payload."""
+    if route["tools"] is not None and hook_input.get("tool_name", "") not in route["tools"]:
+        return False
+    if route["prompt"] is not None:
+        import re
+        if not re.search(route["prompt"], hook_input.get("prompt", "")):
+            return False
+    return True
+
+def has_route_for_tool(event: str, tool_name: str) -> bool:
+    """Check whether any route of a tool event could apply to a tool."""
+    return any(
+        route["tools"] is None or tool_name in route["tools"]
+        for route in ROUTES.get(event, [])
+    )
+
+def peek_field(raw: str, field: str):
+    """Read a top-level string field from a raw payload without parsing it.
+
+    Only trusted when the key occurs exactly once (a nested key of the same
+    name would be ambiguous) and the value has no escapes; returns None when
+    unsure.
+    """
+    key = f'"{field}"'
+    if raw.count(key) != 1:
+        return None
+    pos = raw.find(key) + len(key)
+    rest = raw[pos:pos + 4096].lstrip()
+    if not rest.startswith(":"):
+        return None
+    rest = rest[1:].lstrip()
+    if not rest.startswith('"'):
+        return None
+    end = rest.find('"', 1)
+    if end == -1 or "\\" in rest[1:end]:
+        return None
+    return rest[1:end]
+
+def peek_tool_name(raw: str):
+    """Read the top-level tool_name from a raw payload without parsing it."""
+    return peek_field(raw, "tool_name")
+
+def peek_payload(raw: str, fields: set):
+    """Read only the given string fields; None if any needs a real parse."""
+    hook_input = {}
+    for field in fields:
+        value = peek_field(raw, field)
+        if value is None:
+            if f'"{field}"' in raw:
+                return None
+            continue
+        hook_input[field] = value
+    return hook_input
+
+def get_check(route: dict):
+    """Resolve a route to its check function."""
+    from hooklib import loader
+    return getattr(loader.load_script(route["script"]), route["check"])
+
+def route_label(route: dict) -> str:
+    """Name of a route for messages and metrics ("discover-skills dev")."""
+    return " ".join((route["script"],) + route["args"])
+
+def report_error(route: dict, error: Exception):
+    """Report a failed check on stderr."""
+    print(f"[{route['script']} error: {error}]", file=sys.stderr)
+
+def call_check(route: dict, check, hook_input: dict, event: str = ""):
+    """Call a resolved check with its route's extra arguments."""
+    from hooklib import metrics
+
+    return metrics.timed(route_label(route), check, hook_input, *route["args"], event=event)
+
+def report_overrun(label: str, limit: tuple, hook_input: dict, event: str):
+    """Report and log a check that overran its (seconds, fallback) budget.
+
+    Returns the fallback result (a deny, or None).
+    """
+    from hooklib import budgets
+
+    seconds, fallback = limit
+    print(f"[{label} overran its {seconds * 1000:.0f} ms budget: {fallback}]", file=sys.stderr)
+    budgets.record_overrun(label, hook_input, seconds, fallback, event)
+    return budgets.fallback_result(label, seconds, fallback)
+
+def run_inline(routes: list, checks: dict, hook_input: dict, event: str = "") -> tuple:
+    """Run resolved checks one after another in the calling thread (see INLINE).
+
+    Same results as run_routes: a check that took longer than its budget
+    is replaced by its fallback, whatever it returned.
+    """
+    import time
+    from hooklib import budgets
+    from hooklib.result import is_deny
+
+    results = {}
+    overran = set()
+    for index, check in checks.items():
+        route = routes[index]
+        start = time.perf_counter()
+        try:
+            result = call_check(route, check, hook_input, event)
+        except Exception as e:
+            report_error(route, e)
+            continue
+        elapsed = time.perf_counter() - start
+        if elapsed > MIN_BUDGET:
+            label = route_label(route)
+            limit = budgets.budget(label, route["script"], route["timeout"], route["fail"])
+            if elapsed > limit[0]:
+                overran.add(index)
+                result = report_overrun(label, limit, hook_input, event)
+                if result is None:
+                    continue
+        results[index] = result
+        if is_deny(result):
+            break
+    return results, overran
+
+def run_routes(routes: list, hook_input: dict, event: str = "") -> tuple:
+    """Run checks in parallel threads under their budgets.
+
+    Returns ({route index: result}, indexes of checks that overran). Checks
+    that failed are left out; one that overran has its fallback result, if
+    any. Stops waiting at the first deny, with the results of every check
+    finished by then: merged in route order, the same checks give the same
+    deny whichever thread was fastest. Uses the built-in _thread module:
+    the threading module alone would add ~5 ms to every hook process.
+    Runs them inline instead when INLINE is set.
+    """
+    import _thread
+    import time
+    from hooklib import budgets
+    from hooklib.result import is_deny
+
+    # Resolve every check first: script imports are not thread-safe
+    checks = {}
+    for index, route in enumerate(routes):
+        try:
+            checks[index] = get_check(route)
+        except Exception as e:
+            report_error(route, e)
+    if INLINE:
+        return run_inline(routes, checks, hook_input, event)
+
+    finished = []  # (index, ok, result) in completion order
+    wake = _thread.allocate_lock()
+    wake.acquire()
+
+    def worker(index: int, route: dict, check):
+        try:
+            finished.append((index, True, call_check(route, check, hook_input, event)))
+        except Exception as e:
+            report_error(route, e)
+            finished.append((index, False, None))
+        try:
+            wake.release()
+        except RuntimeError:
+            pass  # already signalled
+
+    # Budgets are read only for checks still running after MIN_BUDGET, so a
+    # fast hook never loads the config for them
+    limits = {}  # route index -> (seconds, fallback)
+    start = time.perf_counter()
+    deadlines = {}
+    for index, check in checks.items():
+        deadlines[index] = start + MIN_BUDGET
+        _thread.start_new_thread(worker, (index, routes[index], check))
+
+    results = {}
+    overran = set()
+    seen = 0
+    while deadlines:
+        denied = False
+        while seen < len(finished):
+            index, ok, result = finished[seen]
+            seen += 1
+            if deadlines.pop(index, None) is None or not ok:
+                continue  # finished after its timeout, or failed
+            results[index] = result
+            denied = denied or is_deny(result)
+        if denied:
+            return results, overran
+        now = time.perf_counter()
+        for index, deadline in list(deadlines.items()):
+            if deadline > now:
+                continue
+            label = route_label(routes[index])
+            if index not in limits:
+                route = routes[index]
+                limits[index] = budgets.budget(label, route["script"], route["timeout"], route["fail"])
+                if start + limits[index][0] > now:
+                    deadlines[index] = start + limits[index][0]
+                    continue
+            del deadlines[index]
+            overran.add(index)
+            result = report_overrun(label, limits[index], hook_input, event)
+            if result is not None:
+                results[index] = result
+                return results, overran
+        if deadlines:
+            wake.acquire(timeout=min(deadlines.values()) - now)
+    return results, overran
+
+def dispatch(event: str, hook_input: dict):
+    """Run every applicable check for an event and merge the results."""
+    from hooklib.result import is_deny, merge
+
+    routes = [route for route in ROUTES.get(event, []) if applies(route, hook_input)]
+
+    results = {}
+    keys = {}  # route index -> verdict cache key of a cacheable miss
+    state = None
+    if any(route["cache"] for route in routes):
+        from hooklib import verdicts
+        state = verdicts.load(hook_input.get("session_id", ""))
+    if state is not None:
+        for index, route in enumerate(routes):
+            key = route["cache"] and verdicts.fingerprint(route_label(route), hook_input, route["cache"])
+            if not key:
+                continue
+            hit, result = verdicts.lookup(state, key)
+            if hit:
+                results[index] = result
+            else:
+                keys[index] = key
+
+    pending = [index for index in range(len(routes)) if index not in results]
+    if any(is_deny(result) for result in results.values()):
+        pending = []
+    if state is not None:
+        verdicts.count(state, hit=not pending)
+
+    ran, overran = run_routes([routes[index] for index in pending], hook_input, event) if pending else ({}, ())
+    for position, result in ran.items():
+        index = pending[position]
+        results[index] = result
+        if index in keys and position not in overran:
+            verdicts.store(state, keys[index], result)
+
+    if state is not None:
+        verdicts.save(state)
+    return merge([results[index] for index in sorted(results)], event)
+
+def handle(event: str, raw: str):
+    """Parse the payload, dispatch it and print the merged result."""
+    import time
+    from hooklib import metrics
+    from hooklib.result import emit
+
+    start = time.perf_counter()
+    routes = ROUTES.get(event, [])
+    hook_input = None
+    if routes and not any(route["payload"] is True for route in routes):
+        fields = set()
+        for route in routes:
+            fields.update(route["payload"] or ())
+        hook_input = peek_payload(raw, fields)
+    if hook_input is None:
+        from hooklib import payload
+
+        try:
+            hook_input = payload.parse(raw) if raw.strip() else {}
+        except ValueError:
+            return
+
+        if not isinstance(hook_input, dict):
+            return
+
+    event = event or hook_input.get("hook_event_name", "")
+    parsed = time.perf_counter()
+    result = dispatch(event, hook_input)
+    done = time.perf_counter()
+
+    metrics.record("hook-router", hook_input, result,
+                   (parsed - start) * 1000, (done - parsed) * 1000, event)
+    claim_answer()
+    emit(result)
+
+def claim_answer():
+    """Take the right to answer from the watchdog (if it already fired, wait for its exit)."""
+    global _answer
+    lock, _answer = _answer, None
+    if lock is not None and not lock.acquire(blocking=False):
+        lock.acquire()
+
+def start_watchdog(event: str, tool_name, session_id):
+    """Answer with the fallback and exit if the process hangs past its budget.
+
+    Deny if a fail-closed check could apply to the call, else print nothing.
+    Only for a standalone hook process: it ends the process with os._exit,
+    so it is never armed inside the daemon (INLINE).
+    """
+    if INLINE:
+        return
+    import _thread
+    import time
+    from hooklib import budgets
+    from hooklib.result import emit
+
+    global _answer
+    seconds = budgets.watchdog_seconds()
+    lock = _answer = _thread.allocate_lock()
+
+    def watch():
+        time.sleep(seconds)
+        if not lock.acquire(blocking=False):
+            return
+        import os
+
+        closed = any(route["fail"] == "closed" and (route["tools"] is None or tool_name is None
+                                                    or tool_name in route["tools"])
+                     for route in ROUTES.get(event, []))
+        fallback = "deny" if closed else "allow"
+        hook_input = {"session_id": session_id or "", "tool_name": tool_name or ""}
+        print(f"[hook-router overran its {seconds * 1000:.0f} ms watchdog: {fallback}]", file=sys.stderr)
+        budgets.record_overrun("hook-router", hook_input, seconds, fallback, event)
+        emit(budgets.fallback_result("hook-router", seconds, fallback, "S_HOOK_WATCHDOG_MS"))
+        sys.stdout.flush()
+        os._exit(0)
+
+    _thread.start_new_thread(watch, ())
+
+def main(argv: list, watchdog: bool = False):
+    """Hook entry point: read the payload, dispatch, print the result.
+
+    watchdog: bound the whole process by the watchdog budget (standalone
+    hook processes only; ignored inside the daemon, see INLINE).
+    """
+    raw = sys.stdin.read()
+    event = argv[1] if len(argv) > 1 else ""
+
+    tool_name = None
+    if event in TOOL_EVENTS:
+        tool_name = peek_tool_name(raw)
+        if tool_name is not None and not has_route_for_tool(event, tool_name):
+            return
+
+    if watchdog and ROUTES.get(event):
+        start_watchdog(event, tool_name, peek_field(raw, "session_id"))
+
+    from hooklib import metrics
+
+    if metrics.profiling():
+        metrics.profile_call(f"hook-router-{event or 'event'}", handle, event, raw)
+    else:
+        handle(event, raw)
+    claim_answer()
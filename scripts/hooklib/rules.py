@@ -0,0 +1,209 @@
+"""
+Rules Digest
+
+Compact digest of rules/*.md for session start: the title, tagline and key
+points of each rule file. The digest is compiled at build time (or on first
+use) and cached with the rule files' signatures, so it is rebuilt only when
+a rule file is edited, added or removed. The full rule text is kept in the
+same cache for the role commands that need it.
+
+The cache and the per-session records use marshal, which is built in: the
+session start path then imports neither json, pickle nor re.
+
+Digests and rule texts carry a content version, recorded per session, so a
+resumed session is not injected twice.
+"""
+
+import os
+
+from hooklib.cache import cache_dir, file_signature, write_atomic
+
+CACHE_VERSION = 1
+
+# Role command -> rule files (without .md) injected in full
+ROLE_RULES = {
+    "dev": ["research"],
+    "ba": ["research"],
+    "design": ["research"],
+    "tech-lead": ["research", "atomic-tasks"],
+}
+
+SAFE_ID_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_-")
+
+_memory = {}  # cache path -> compiled rules
+
+def rules_dir(plugin_root: str) -> str:
+    """Get the plugin's rules directory."""
+    return os.path.join(plugin_root, "rules")
+
+def cache_path(plugin_root: str) -> str:
+    """Get the cache file for a plugin root."""
+    import zlib
+
+    digest = zlib.crc32(os.path.realpath(plugin_root).encode())
+    return os.path.join(cache_dir(), f"rules-{digest:08x}.marshal")
+
+def content_version(text: str) -> str:
+    """Short content hash used as a digest or rule version."""
+    import hashlib
+
+    return hashlib.sha1(text.encode()).hexdigest()[:12]
+
+def digest_rule(text: str) -> dict:
+    """Extract a rule file's title, tagline and key points.
+
+    Key points are the ### headings or bold numbered items of the first
+    ## section that has any, each with its first bullet as a summary.
+    """
+    import re
+
+    heading_number = re.compile(r'^\d+\.\s*')
+    numbered_point = re.compile(r'^\d+\.\s+\*\*(.+?)\*\*')
+    title = ""
+    tagline = ""
+    points = []
+    in_fence = False
+    summarized = True
+
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            in_fence = not in_fence
+            continue
+        if in_fence or not stripped or stripped == "---":
+            continue
+
+        if stripped.startswith("# "):
+            title = title or stripped[2:].strip()
+            continue
+        if stripped.startswith("## "):
+            if points:
+                break
+            continue
+
+        point = None
+        if stripped.startswith("### "):
+            point = heading_number.sub("", stripped[4:].strip())
+        else:
+            match = numbered_point.match(stripped)
+            if match:
+                point = match.group(1)
+        if point:
+            points.append(point)
+            summarized = False
+            continue
+
+        if stripped.startswith("- ") and points and not summarized:
+            points[-1] = f"{points[-1]}: {stripped[2:].strip()}"
+            summarized = True
+        elif not tagline and not points and not stripped.startswith(("-", ">")):
+            tagline = stripped.replace("**", "")
+
+    return {"title": title, "tagline": tagline, "points": points}
+
+def render_digest(digests: dict) -> str:
+    """Render the digests of all rule files."""
+    parts = []
+    for name, digest in digests.items():
+        header = digest["title"] or name
+        if digest["tagline"]:
+            header = f"{header} - {digest['tagline']}"
+        parts.append(header)
+        parts.extend(f"- {point}" for point in digest["points"])
+    return "\n".join(parts)
+
+def compile_rules(plugin_root: str) -> dict:
+    """Read every rule file and build the digest."""
+    directory = rules_dir(plugin_root)
+    sources = {directory: file_signature(directory)}
+    texts = {}
+
+    try:
+        names = sorted(name for name in os.listdir(directory) if name.endswith(".md"))
+    except OSError:
+        names = []
+    for name in names:
+        path = os.path.join(directory, name)
+        sources[path] = file_signature(path)
+        try:
+            with open(path) as f:
+                texts[name[:-3]] = f.read()
+        except OSError:
+            continue
+
+    digest = render_digest({name: digest_rule(text) for name, text in texts.items()})
+    return {
+        "version": CACHE_VERSION,
+        "sources": sources,
+        "digest": digest,
+        "digest_version": content_version(digest),
+        "texts": texts,
+        "text_versions": {name: content_version(text) for name, text in texts.items()},
+    }
+
+def is_fresh(compiled) -> bool:
+    """Check a compiled cache still matches its source files."""
+    if not isinstance(compiled, dict) or compiled.get("version") != CACHE_VERSION:
+        return False
+    return all(
+        file_signature(path) == signature
+        for path, signature in compiled["sources"].items()
+    )
+
+def read_marshal(path: str):
+    """Read a marshal file. Returns None on any error."""
+    import marshal
+
+    try:
+        with open(path, "rb") as f:
+            return marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+def write_marshal(path: str, value):
+    """Write a marshal file atomically."""
+    import marshal
+
+    write_atomic(path, marshal.dumps(value))
+
+def load(plugin_root: str) -> dict:
+    """Get the compiled rules, rebuilding the cache if a rule file changed."""
+    path = cache_path(plugin_root)
+
+    compiled = _memory.get(path)
+    if compiled is not None and is_fresh(compiled):
+        return compiled
+
+    compiled = read_marshal(path)
+    if not is_fresh(compiled):
+        compiled = compile_rules(plugin_root)
+        write_marshal(path, compiled)
+
+    _memory[path] = compiled
+    return compiled
+
+def session_path(session_id: str) -> str:
+    """Get the per-session injection record."""
+    safe = "".join(c if c in SAFE_ID_CHARS else "_" for c in session_id[:128])
+    return os.path.join(cache_dir(), "sessions", f"{safe}.marshal")
+
+def load_session(session_id: str) -> dict:
+    """Load what was injected in a session (empty if unknown)."""
+    state = read_marshal(session_path(session_id)) if session_id else None
+    return state if isinstance(state, dict) else {}
+
+def save_session(session_id: str, state: dict):
+    """Record what was injected in a session."""
+    if session_id:
+        write_marshal(session_path(session_id), state)
+
+def transcript_has(transcript_path: str, marker: str) -> bool:
+    """Check whether a transcript already contains a marker."""
+    import mmap
+
+    try:
+        with open(transcript_path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return data.find(marker.encode()) != -1
+    except (OSError, TypeError, ValueError):
+        return False
@@ -0,0 +1,168 @@
+"""
+Skill Sections
+
+Splits SKILL.md files into heading sections (## and ###, ignoring headings
+inside code fences), ranks them against a prompt and packs the best ones
+under a byte budget. Sections whose text already appeared in another skill
+are dropped.
+"""
+
+import hashlib
+import math
+import re
+
+HEADING_PATTERN = re.compile(r'^(#{1,3})\s+(.+?)\s*$')
+TOKEN_PATTERN = re.compile(r'[a-z0-9_]+')
+
+# Heading hits count more than body hits
+HEADING_WEIGHT = 3
+
+# Sections scoring below this fraction of a skill's best section are dropped
+MIN_RELATIVE_SCORE = 0.3
+
+STOPWORDS = {
+    "the", "and", "for", "with", "that", "this", "from", "into", "are", "was",
+    "you", "your", "our", "can", "use", "using", "add", "make", "new", "please",
+    "how", "what", "when", "which", "should", "would", "could", "need", "want",
+    "dev", "all", "any", "not", "but", "have", "has", "get", "set", "some",
+}
+
+def normalize_token(token: str) -> str:
+    """Fold simple plurals so "forms" and "form" compare equal."""
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+def tokenize(text: str) -> frozenset:
+    """Get the set of normalized tokens in a text."""
+    return frozenset(normalize_token(t) for t in TOKEN_PATTERN.findall(text.lower()))
+
+def strip_frontmatter(content: str) -> str:
+    """Remove a leading YAML frontmatter block."""
+    if content.startswith("---\n"):
+        end = content.find("\n---", 4)
+        if end != -1:
+            return content[end + 4:].lstrip("\n")
+    return content
+
+def make_section(heading: str, parent: str, level: int, lines: list) -> dict:
+    """Build a section record with precomputed tokens and content hash."""
+    text = "\n".join(lines).strip("\n")
+    normalized = " ".join(text.split()).lower()
+    return {
+        "heading": heading,
+        "parent": parent,
+        "level": level,
+        "text": text,
+        "size": len(text.encode()),
+        "heading_tokens": tokenize(heading + " " + (parent or "")),
+        "tokens": tokenize(text),
+        "hash": hashlib.sha1(normalized.encode()).hexdigest(),
+    }
+
+def split_sections(content: str) -> list[dict]:
+    """Split a markdown file into sections at level 2 and 3 headings.
+
+    The text before the first such heading is the preamble (level 0).
+    Level 3 sections remember their level 2 parent heading.
+    """
+    sections = []
+    heading, parent, level = "", None, 0
+    current_h2 = None
+    lines = []
+    in_fence = False
+
+    for line in strip_frontmatter(content).split("\n"):
+        if line.lstrip().startswith("```"):
+            in_fence = not in_fence
+        match = None if in_fence else HEADING_PATTERN.match(line)
+        if match and len(match.group(1)) >= 2:
+            if any(l.strip() for l in lines):
+                sections.append(make_section(heading, parent, level, lines))
+            level = len(match.group(1))
+            heading = match.group(2)
+            if level == 2:
+                current_h2 = line
+                parent = None
+            else:
+                parent = current_h2
+            lines = [line]
+        else:
+            lines.append(line)
+
+    if any(l.strip() for l in lines):
+        sections.append(make_section(heading, parent, level, lines))
+    return sections
+
+def prompt_terms(prompt: str, keywords: list) -> frozenset:
+    """Get the terms a section is ranked against."""
+    terms = {t for t in tokenize(prompt) if len(t) > 2 and t not in STOPWORDS}
+    for keyword in keywords:
+        terms.update(tokenize(keyword))
+    return frozenset(terms)
+
+def term_weights(sections: list, terms: frozenset) -> dict:
+    """Weight terms by rarity across a skill's sections (IDF).
+
+    A term that appears in every section (usually the skill's own name)
+    says little about which section is relevant.
+    """
+    weights = {}
+    for term in terms:
+        df = sum(1 for section in sections if term in section["tokens"])
+        if df:
+            weights[term] = math.log(1 + len(sections) / df)
+    return weights
+
+def score_section(section: dict, weights: dict) -> float:
+    """Score a section by weighted prompt terms in its heading and body."""
+    score = 0.0
+    for term, weight in weights.items():
+        if term in section["heading_tokens"]:
+            score += HEADING_WEIGHT * weight
+        if term in section["tokens"]:
+            score += weight
+    return score
+
+def pack_sections(candidates: list, budget: int) -> list:
+    """Pick (skill, section index) pairs under a byte budget.
+
+    candidates: [(skill_key, sections, terms)] in skill priority order.
+    Each skill's preamble is kept first when it fits; the remaining
+    sections are taken by score, best first, skipping duplicates and
+    sections far below the skill's best match.
+    """
+    picked = []
+    seen = set()
+    used = 0
+
+    def take(key, index, section):
+        nonlocal used
+        if section["hash"] in seen or used + section["size"] > budget:
+            return
+        seen.add(section["hash"])
+        used += section["size"]
+        picked.append((key, index))
+
+    ranked = []
+    for rank, (key, sections, terms) in enumerate(candidates):
+        weights = term_weights(sections, terms)
+        scored = []
+        for index, section in enumerate(sections):
+            if section["level"] == 0:
+                take(key, index, section)
+                continue
+            score = score_section(section, weights)
+            if score > 0:
+                scored.append((score, index, section))
+
+        best = max((score for score, _, _ in scored), default=0)
+        for score, index, section in scored:
+            if score >= best * MIN_RELATIVE_SCORE:
+                ranked.append((-score, rank, index, key, section))
+
+    ranked.sort(key=lambda r: r[:3])
+    for _, _, index, key, section in ranked:
+        take(key, index, section)
+
+    return picked
@@ -0,0 +1,539 @@
+"""
+Shell Command Parser
+
+Splits a Bash tool command into simple commands once, so the Bash checks
+can apply rules to argv lists instead of substrings of the raw text.
+
+- compound commands are split on &&, ||, ;, &, newlines, pipes and ( )
+- quotes and backslashes are removed the way the shell would
+- heredoc bodies are skipped (only $(...) in unquoted bodies is parsed),
+  unless a shell reads them as its script
+- $(...), `...`, <(...) and `sh -c '...'` / `su -c '...'` / `eval` strings
+  are parsed as further commands, and so is the argv of `find -exec ... ;`
+- the script a shell reads from stdin is parsed too: a heredoc or `<<<`
+  string (given to the shell, or to a `cat` piped into it) and the text of
+  an `echo` or `printf` piped into it
+- redirections are collected separately from the arguments
+
+Each simple command is a dict:
+  argv       words after leading assignments and shell keywords
+  words      argv without wrappers (sudo, env, xargs, ...), see command_words
+  env        leading NAME=value assignments
+  redirects  [(operator, target)]
+  pipe_in    True if stdin comes from the previous command's pipe
+  pipeline   id shared by the commands of one pipeline
+  depth      0 for top-level commands, more for nested ones
+
+parse() memoizes by command text (both Bash checks of one router call
+share a parse); the result must not be mutated.
+"""
+
+import os
+import re
+
+# A run of plain word characters and the blanks after it
+PLAIN_RUN = re.compile(r'([^\s\'"\\$`<>|&;()]+)([ \t]*)')
+HEREDOC_SUBSTITUTION = re.compile(r'\$\(|`')
+
+OPERATORS = ("&&", "||", ";;", "|&", ";", "|", "&", "(", ")")
+REDIRECTS = ("<<<", "<<-", "<<", ">>", ">&", "<&", "&>>", "&>", ">|", "<>", ">", "<")
+
+# Leading words that are syntax, not the command being run
+KEYWORDS = frozenset(("if", "then", "else", "elif", "do", "while", "until", "!", "{", "time"))
+CLOSERS = frozenset(("fi", "done", "esac", "}"))
+
+SHELLS = frozenset(("sh", "bash", "zsh", "dash", "ksh", "ash", "fish"))
+
+# Wrappers that run their arguments as a command: name -> options taking a
+# value (also as the last letter of combined options: sudo -iu user)
+WRAPPERS = {
+    "sudo": frozenset(("-u", "-g", "-h", "-p", "-C", "-D", "-r", "-t", "-U")),
+    "doas": frozenset(("-u", "-C")),
+    "env": frozenset(("-u", "-C", "-S")),
+    "nice": frozenset(("-n",)),
+    "timeout": frozenset(("-s", "-k")),
+    "stdbuf": frozenset(("-i", "-o", "-e")),
+    "nohup": frozenset(),
+    "exec": frozenset(("-a",)),
+    "command": frozenset(),
+    "builtin": frozenset(),
+    "time": frozenset(),
+    "xargs": frozenset(("-I", "-n", "-P", "-d", "-L", "-s", "-E", "-a")),
+}
+
+# find actions whose arguments, up to ; or +, are a command
+FIND_ACTIONS = frozenset(("-exec", "-execdir", "-ok", "-okdir"))
+
+# Commands whose piped output can be a shell's script
+ECHOES = frozenset(("echo", "printf"))
+ECHO_OPTION = re.compile(r'-[neE]+$')
+
+# Characters removed from a command before prefilter hints are looked up
+UNQUOTE = str.maketrans("", "", "\\'\"")
+ESCAPE = re.compile(r'\\.')
+
+MAX_DEPTH = 8
+MAX_CACHED = 256
+
+_parsed = {}  # command -> parsed commands
+_hint_patterns = {}  # hint word -> regex for it at a word start
+
+def parse(command: str) -> list:
+    """Parse a command string into simple commands (memoized)."""
+    cached = _parsed.get(command)
+    if cached is None:
+        if len(_parsed) >= MAX_CACHED:
+            _parsed.clear()
+        cached = _parsed[command] = Parser(command).parse()
+    return cached
+
+def clear_cache():
+    """Forget memoized parses."""
+    _parsed.clear()
+
+def mentions(text: str, hints) -> bool:
+    """Check whether text has one of the hint words (program names) at a word start.
+
+    Quotes, backslashes and line continuations are removed first, so
+    `r\\m` and `"rm"` still count; a text with backslashes is also searched
+    with escapes as blanks, for the ones echo and printf expand (`ls\\nrm`).
+    A substring test comes before each regex, and a word's regex is only
+    compiled once the substring is found, so a text without the words costs
+    a few C-level scans.
+    """
+    text = text.replace("\\\n", "")
+    if "\\" in text:
+        text += "\n" + ESCAPE.sub(" ", text)
+    text = text.translate(UNQUOTE)
+    for word in hints:
+        if word in text:
+            pattern = _hint_patterns.get(word)
+            if pattern is None:
+                pattern = _hint_patterns[word] = re.compile(r"\b" + re.escape(word))
+            if pattern.search(text):
+                return True
+    return False
+
+def is_assignment(word: str) -> bool:
+    """Check for a NAME=value word."""
+    name, eq, _ = word.partition("=")
+    return bool(eq) and name.isidentifier()
+
+def command_words(cmd: dict) -> list:
+    """Get argv without wrappers: `sudo -u x nohup npm start` -> npm start.
+
+    The command name is reduced to its basename (/usr/bin/rm -> rm).
+    """
+    return cmd["words"]
+
+def strip_wrappers(argv: list) -> list:
+    """Remove wrapper commands from an argv (computed once per parse)."""
+    while argv:
+        name = os.path.basename(argv[0]) if "/" in argv[0] else argv[0]
+        takes_value = WRAPPERS.get(name)
+        if takes_value is None:
+            break
+        i = 1
+        while i < len(argv) and (argv[i].startswith("-") or (name == "env" and is_assignment(argv[i]))):
+            if argv[i] == "--":
+                i += 1
+                break
+            i += option_size(argv[i], takes_value)
+        if name == "timeout" and i < len(argv):
+            i += 1  # the duration
+        elif name == "nice" and i < len(argv) and argv[i].lstrip("-").isdigit():
+            i += 1
+        argv = argv[i:]
+    if argv and "/" in argv[0]:
+        argv = [os.path.basename(argv[0])] + argv[1:]
+    return argv
+
+def option_size(arg: str, takes_value) -> int:
+    """Count the words an option uses: 2 if its value is the next word.
+
+    Combined short options are read like getopt does: the first letter that
+    takes a value uses the rest of the word, or the next word if it is last
+    (`-iu user`, but `-uroot`).
+    """
+    if arg in takes_value:
+        return 2
+    if arg.startswith("--") or not takes_value:
+        return 1
+    for j in range(1, len(arg)):
+        if "-" + arg[j] in takes_value:
+            return 2 if j == len(arg) - 1 else 1
+    return 1
+
+def reads_stdin_script(words: list) -> bool:
+    """Check whether a shell command runs the script it reads from stdin
+    (`bash`, `sh -s`, `bash -x -`; not `bash script.sh` or `sh -c ...`)."""
+    if not words or words[0] not in SHELLS:
+        return False
+    args = iter(words[1:])
+    for arg in args:
+        if arg == "-":
+            return True
+        if arg == "--":
+            return next(args, None) is None
+        if not arg.startswith(("-", "+")):
+            return False  # a script file
+        if arg.startswith("--"):
+            continue
+        if "c" in arg:
+            return False
+        if "s" in arg:
+            return True
+        if arg.endswith("o"):
+            next(args, None)  # -o pipefail
+    return True
+
+def echoed_text(words: list) -> str:
+    """The text `echo ...` or `printf ...` writes, with \\n as newlines."""
+    args = words[1:]
+    if words[0] == "echo":
+        while args and ECHO_OPTION.match(args[0]):
+            args = args[1:]
+    return " ".join(args).replace("\\n", "\n")
+
+def balanced_end(text: str, start: int) -> int:
+    """Index just past the ")" closing the "(" at text[start]."""
+    depth = 0
+    i = start
+    size = len(text)
+    while i < size:
+        ch = text[i]
+        if ch == "\\":
+            i += 2
+            continue
+        if ch == "'":
+            end = text.find("'", i + 1)
+            i = size if end == -1 else end + 1
+            continue
+        if ch == '"':
+            i += 1
+            while i < size and text[i] != '"':
+                i += 2 if text[i] == "\\" else 1
+            i += 1
+            continue
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return size
+
+def backtick_end(text: str, start: int) -> int:
+    """Index just past the backtick closing the one at text[start]."""
+    i = start + 1
+    while i < len(text):
+        if text[i] == "\\":
+            i += 2
+            continue
+        if text[i] == "`":
+            return i + 1
+        i += 1
+    return len(text)
+
+class Parser:
+    """Single-pass splitter of one command string."""
+
+    def __init__(self, text: str, depth: int = 0, ids=None):
+        self.text = text
+        self.depth = depth
+        self.ids = ids if ids is not None else [0]
+        self.commands = []
+        self.nested = []       # inner command strings to parse after this level
+        self.words = []
+        self.redirects = []
+        self.word = None       # chars of the word being read, or None
+        self.quoted = False    # the current word had quotes (heredoc delimiters)
+        self.redirect = None   # operator waiting for its target word
+        self.heredocs = []     # pending [delimiter, strip_tabs, quoted, command index]
+        self.pipe_in = False
+        self.pipeline = self.next_id()
+
+    def next_id(self) -> int:
+        """Allocate a pipeline id (unique across nested parsers)."""
+        self.ids[0] += 1
+        return self.ids[0]
+
+    def parse(self) -> list:
+        """Split the text; nested commands follow the top-level ones."""
+        text = self.text
+        size = len(text)
+        i = 0
+        while i < size:
+            ch = text[i]
+
+            run = PLAIN_RUN.match(text, i)
+            if run and not (ch == "#" and self.word is None):
+                chunk, blanks = run.groups()
+                if blanks and self.word is None and self.redirect is None:
+                    self.words.append(chunk)  # a whole unquoted word
+                else:
+                    self.add_text(chunk)
+                    if blanks:
+                        self.end_word()
+                i = run.end()
+            elif ch == "#":
+                end = text.find("\n", i)
+                i = size if end == -1 else end
+            elif ch in " \t":
+                self.end_word()
+                i += 1
+                while i < size and text[i] in " \t":
+                    i += 1
+            elif ch == "\n":
+                self.end_word()
+                self.end_command()
+                i = self.skip_heredocs(i + 1)
+                self.new_pipeline()
+            elif ch == "\\":
+                if text.startswith("\\\n", i):
+                    i += 2
+                else:
+                    self.add_text(text[i + 1:i + 2])
+                    i += 2
+            elif ch == "'":
+                end = text.find("'", i + 1)
+                end = size if end == -1 else end
+                self.add_text(text[i + 1:end], quoted=True)
+                i = end + 1
+            elif ch == '"':
+                i = self.read_double_quoted(i)
+            elif ch == "`":
+                end = backtick_end(text, i)
+                self.nested.append(text[i + 1:end - 1])
+                self.add_text(text[i:end])
+                i = end
+            elif ch == "$" and text.startswith("$(", i):
+                end = balanced_end(text, i + 1)
+                if not text.startswith("$((", i):
+                    self.nested.append(text[i + 2:end - 1])
+                self.add_text(text[i:end])
+                i = end
+            elif ch in "<>" and text.startswith("(", i + 1):
+                end = balanced_end(text, i + 1)
+                self.nested.append(text[i + 2:end - 1])
+                self.add_text(text[i:end])
+                i = end
+            elif ch in "<>&" and text.startswith(REDIRECTS, i):
+                op = next(op for op in REDIRECTS if text.startswith(op, i))
+                if self.word is not None and "".join(self.word).isdigit():
+                    self.word = None  # file descriptor prefix (2>, 1>&)
+                self.end_word()
+                self.redirect = op
+                i += len(op)
+            elif ch in "|&;()":
+                op = next(op for op in OPERATORS if text.startswith(op, i))
+                self.end_word()
+                self.end_command()
+                if op in ("|", "|&"):
+                    self.pipe_in = True
+                else:
+                    self.new_pipeline()
+                i += len(op)
+            else:
+                self.add_text(ch)
+                i += 1
+
+        self.end_word()
+        self.end_command()
+
+        if self.depth < MAX_DEPTH:
+            for inner in self.nested:
+                self.commands.extend(Parser(inner, self.depth + 1, self.ids).parse())
+        return self.commands
+
+    def add_text(self, chunk: str, quoted: bool = False):
+        """Append to the current word."""
+        if self.word is None:
+            self.word = []
+            self.quoted = False
+        self.word.append(chunk)
+        self.quoted = self.quoted or quoted
+
+    def read_double_quoted(self, i: int) -> int:
+        """Read a "..." string starting at text[i]; returns the index after it."""
+        text = self.text
+        size = len(text)
+        i += 1
+        start = i
+        chunks = []
+        while i < size and text[i] != '"':
+            ch = text[i]
+            if ch == "\\" and i + 1 < size and text[i + 1] in '"\\$`\n':
+                chunks.append(text[start:i])
+                if text[i + 1] != "\n":
+                    chunks.append(text[i + 1])
+                i += 2
+                start = i
+            elif ch == "$" and text.startswith("$(", i):
+                end = balanced_end(text, i + 1)
+                if not text.startswith("$((", i):
+                    self.nested.append(text[i + 2:end - 1])
+                i = end
+            elif ch == "`":
+                end = backtick_end(text, i)
+                self.nested.append(text[i + 1:end - 1])
+                i = end
+            else:
+                i += 1
+        chunks.append(text[start:i])
+        self.add_text("".join(chunks), quoted=True)
+        return i + 1
+
+    def end_word(self):
+        """Finish the current word as an argument or a redirect target."""
+        if self.word is None:
+            return
+        word = "".join(self.word)
+        if self.redirect is not None:
+            self.redirects.append((self.redirect, word))
+            if self.redirect in ("<<", "<<-"):
+                self.heredocs.append([word, self.redirect == "<<-", self.quoted, None])
+            self.redirect = None
+        else:
+            self.words.append(word)
+        self.word = None
+
+    def end_command(self):
+        """Finish the current simple command."""
+        words = self.words
+        env = []
+        while words and (words[0] in KEYWORDS or is_assignment(words[0])):
+            if words[0] not in KEYWORDS:
+                env.append(words[0])
+            words = words[1:]
+        if len(words) == 1 and words[0] in CLOSERS:
+            words = []
+
+        if words or self.redirects:
+            cmd = {
+                "argv": words,
+                "words": strip_wrappers(words),
+                "env": env,
+                "redirects": self.redirects,
+                "pipe_in": self.pipe_in,
+                "pipeline": self.pipeline,
+                "depth": self.depth,
+            }
+            for heredoc in self.heredocs:
+                if heredoc[3] is None:
+                    heredoc[3] = len(self.commands)
+            if reads_stdin_script(cmd["words"]):
+                self.queue_stdin_scripts(cmd)
+            self.commands.append(cmd)
+            self.queue_inline_scripts(cmd["words"])
+            self.add_find_actions(cmd["words"])
+
+        self.words = []
+        self.redirects = []
+        self.pipe_in = False
+
+    def queue_inline_scripts(self, words: list):
+        """Queue the script of `sh -c '...'`, `su -c '...'` and `eval ...` for parsing."""
+        name = words[0] if words else ""
+        if name == "eval":
+            self.nested.append(" ".join(words[1:]))
+        elif name in SHELLS or name == "su":
+            for i, word in enumerate(words[1:], 1):
+                if word.startswith("--command="):
+                    self.nested.append(word.partition("=")[2])
+                    break
+                if i == len(words) - 1:
+                    break
+                if word == "--command" or (word.startswith("-") and not word.startswith("--")
+                                           and (word.endswith("c") if name == "su" else "c" in word)):
+                    self.nested.append(words[i + 1])
+                    break
+
+    def queue_stdin_scripts(self, cmd: dict):
+        """Queue the stdin script of a shell: its `<<<` strings, or the text
+        of the echo, printf or `cat <<< ...` piped into it."""
+        sources = [cmd]
+        if cmd["pipe_in"] and self.commands and self.commands[-1]["pipeline"] == cmd["pipeline"]:
+            previous = self.commands[-1]
+            if previous["words"][:1] == ["cat"] and len(previous["words"]) == 1:
+                sources.append(previous)
+            elif previous["words"] and previous["words"][0] in ECHOES:
+                self.nested.append(echoed_text(previous["words"]))
+        for source in sources:
+            self.nested.extend(target for op, target in source["redirects"] if op == "<<<")
+
+    def feeds_shell(self, index: int) -> bool:
+        """Check whether the stdin of commands[index] is run as a script: it
+        is a shell reading stdin, or a plain `cat` piped into one."""
+        cmd = self.commands[index]
+        if reads_stdin_script(cmd["words"]):
+            return True
+        if cmd["words"] != ["cat"] or index + 1 == len(self.commands):
+            return False
+        following = self.commands[index + 1]
+        return (following["pipe_in"] and following["pipeline"] == cmd["pipeline"]
+                and reads_stdin_script(following["words"]))
+
+    def add_find_actions(self, words: list):
+        """Add the commands of `find -exec ... ;` (and -execdir, -ok, -okdir)."""
+        if not words or words[0] != "find":
+            return
+        action = None
+        for word in words[1:] + [";"]:
+            if action is None:
+                if word in FIND_ACTIONS:
+                    action = []
+            elif word in (";", "+"):
+                if action:
+                    self.commands.append({
+                        "argv": action,
+                        "words": strip_wrappers(action),
+                        "env": [],
+                        "redirects": [],
+                        "pipe_in": False,
+                        "pipeline": self.next_id(),
+                        "depth": self.depth + 1,
+                    })
+                    self.queue_inline_scripts(action)
+                action = None
+            else:
+                action.append(word)
+
+    def new_pipeline(self):
+        """Start a new pipeline after a non-pipe operator."""
+        self.pipe_in = False
+        self.pipeline = self.next_id()
+
+    def skip_heredocs(self, i: int) -> int:
+        """Skip the bodies of pending heredocs starting at text[i].
+
+        The body of a heredoc a shell reads as its script is parsed instead.
+        """
+        text = self.text
+        for delimiter, strip_tabs, quoted, index in self.heredocs:
+            script = index is not None and self.feeds_shell(index)
+            start = body_end = i
+            while i < len(text):
+                end = text.find("\n", i)
+                end = len(text) if end == -1 else end
+                line = text[i:end]
+                i = end + 1
+                if (line.lstrip("\t") if strip_tabs else line) == delimiter:
+                    break
+                body_end = end
+                if not script and not quoted and HEREDOC_SUBSTITUTION.search(line):
+                    self.scan_substitutions(line)
+            if script:
+                self.nested.append(text[start:body_end])
+        self.heredocs = []
+        return min(i, len(text))
+
+    def scan_substitutions(self, line: str):
+        """Queue $(...) and `...` found in an unquoted heredoc line."""
+        for match in HEREDOC_SUBSTITUTION.finditer(line):
+            start = match.start()
+            if line.startswith("$(", start):
+                self.nested.append(line[start + 2:balanced_end(line, start + 1) - 1])
+            else:
+                self.nested.append(line[start + 1:backtick_end(line, start) - 1])
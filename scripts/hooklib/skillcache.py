@@ -0,0 +1,169 @@
+"""
+Compiled Skill Cache
+
+Holds the skill registry (hooklib/skillregistry.py), one prebuilt keyword
+matcher per role and the heading sections of every skill. The cache is
+checked with one stat per skill directory and file; when something
+changed, the registry is rebuilt from the manifest in the cache, so only
+the changed files are reparsed.
+
+The cache is two files under the user cache dir: a small head pickle
+(sources, registry, matchers) loaded on every prompt, and a body of
+separately pickled blobs (each skill's sections and the manifest) read at
+their offsets. A prompt only unpickles the sections of the skills it
+matched, so the cost of a warm prompt barely grows with the number of
+skills.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+
+from hooklib import skillregistry
+from hooklib.cache import cache_dir, file_signature, read_pickle, write_atomic, write_pickle
+from hooklib.keywords import build_skill_matcher
+
+CACHE_VERSION = 4
+
+_memory = {}  # cache path -> compiled skills (for long-lived processes)
+
+def cache_path(plugin_root: Path, roots: list) -> str:
+    """Get the cache head file for a plugin root and its skill directories."""
+    key = "\0".join([str(Path(plugin_root).resolve())] + roots)
+    digest = hashlib.sha1(key.encode()).hexdigest()[:12]
+    return os.path.join(cache_dir(), f"skills-{digest}.pickle")
+
+def body_path(path: str) -> str:
+    """Get the cache body file for a head file."""
+    return path + ".sections"
+
+def is_fresh(compiled) -> bool:
+    """Check a compiled cache still matches its source files."""
+    if not isinstance(compiled, dict) or compiled.get("version") != CACHE_VERSION:
+        return False
+    return all(
+        file_signature(path) == signature
+        for path, signature in compiled["sources"].items()
+    )
+
+def join_sections(files: dict, skill: dict) -> list:
+    """A skill's sections followed by the headed sections of its companions.
+
+    A companion's preamble is not the skill's, so it is left out.
+    """
+    sections = list(files[skill["path"]]["sections"])
+    for path in skill["companions"]:
+        sections.extend(section for section in files[path]["sections"] if section["level"] > 0)
+    return sections
+
+def read_blob(compiled: dict, span):
+    """Unpickle one blob of the cache body, or None if the body changed."""
+    import pickle
+
+    path = compiled.get("body_path")
+    if not span or not path or file_signature(path) != compiled.get("body"):
+        return None
+    try:
+        with open(path, "rb") as f:
+            f.seek(span[0])
+            return pickle.loads(f.read(span[1]))
+    except Exception:
+        return None
+
+def skill_sections(compiled: dict, skill: dict) -> list:
+    """Get a skill's sections, reading them from the cache body on first use."""
+    sections = compiled["sections"]
+    key = skill["path"]
+    if key not in sections:
+        loaded = read_blob(compiled, compiled.get("offsets", {}).get("sections", {}).get(key))
+        if loaded is None:
+            # Body missing or rewritten by another process: parse the files
+            files = {path: skillregistry.read_file(path, path == key)
+                     for path in [key] + skill["companions"]}
+            loaded = join_sections(files, skill)
+        sections[key] = loaded
+    return sections[key]
+
+def compile_skills(plugin_root: Path, previous: dict = None, roots: list = None) -> dict:
+    """Build the registry, per-role matchers and per-skill sections."""
+    manifest = None
+    if isinstance(previous, dict) and previous.get("version") == CACHE_VERSION:
+        manifest = previous.get("files")
+        if manifest is None:
+            manifest = read_blob(previous, previous["offsets"].get("manifest"))
+    registry = skillregistry.build(plugin_root, manifest, roots)
+    files = registry["files"]
+
+    matchers = {}
+    sections = {}
+    for role, role_data in registry["roles"].items():
+        skills = role_data["skills"]
+        matchers[role] = build_skill_matcher(skills)
+        for skill in skills:
+            if skill["path"] not in sections:
+                sections[skill["path"]] = join_sections(files, skill)
+
+    return {
+        "version": CACHE_VERSION,
+        "roots": registry["roots"],
+        "sources": registry["sources"],
+        "files": files,
+        "reparsed": registry["reparsed"],
+        "index": {"roles": registry["roles"]},
+        "matchers": matchers,
+        "sections": sections,
+    }
+
+def write_cache(path: str, compiled: dict):
+    """Write the body blobs, then the head that records their offsets."""
+    import pickle
+
+    blobs = []
+    position = 0
+
+    def add(value) -> tuple:
+        nonlocal position
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        blobs.append(blob)
+        position += len(blob)
+        return (position - len(blob), len(blob))
+
+    offsets = {
+        "manifest": add(compiled["files"]),
+        "sections": {key: add(value) for key, value in compiled["sections"].items()},
+    }
+    write_atomic(body_path(path), b"".join(blobs))
+
+    head = {key: value for key, value in compiled.items()
+            if key not in ("files", "sections", "body_path")}
+    head["offsets"] = offsets
+    head["body"] = file_signature(body_path(path))
+    write_pickle(path, head)
+
+    compiled["offsets"] = offsets
+    compiled["body"] = head["body"]
+    compiled["body_path"] = body_path(path)
+
+def load(plugin_root: Path) -> dict:
+    """Get the compiled skills, rebuilding changed parts if a source changed.
+
+    Sections are read lazily; use skill_sections().
+    """
+    roots = skillregistry.skill_roots(plugin_root)
+    path = cache_path(plugin_root, roots)
+
+    compiled = _memory.get(path)
+    if compiled is not None and is_fresh(compiled):
+        return compiled
+
+    if compiled is None:
+        compiled = read_pickle(path)
+        if isinstance(compiled, dict):
+            compiled["sections"] = {}
+            compiled["body_path"] = body_path(path)
+    if not is_fresh(compiled):
+        compiled = compile_skills(plugin_root, compiled, roots)
+        write_cache(path, compiled)
+
+    _memory[path] = compiled
+    return compiled
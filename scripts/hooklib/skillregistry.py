@@ -0,0 +1,252 @@
+"""
+Skill Registry
+
+Builds the skill registry from the skill files themselves. Every SKILL.md
+under skills/ (and under user skill directories) declares its name, role
+and keywords in frontmatter:
+
+  ---
+  name: frontend-react
+  description: React components, state and styling
+  role: dev
+  keywords: [react:3, component, hook, tsx]
+  ---
+
+`keyword:N` gives a keyword the weight N (default 1). Without `role`, the
+first directory below the skills root is the role (skills/dev/backend-golang
+-> dev); without `keywords`, the words of the name are used. Other .md files
+next to a SKILL.md (frontend-react/PATTERNS.md) are companions: their
+sections are offered to prompts along with the skill's own.
+
+User skill directories come from "skillDirs" in .claude/s-config.json or
+S_SKILL_DIRS (os.pathsep separated). A user skill with the same role and
+name as a plugin skill replaces it.
+
+build() keeps a manifest of file signatures with the parsed result of each
+file, and reparses only the files whose signature changed.
+"""
+
+import os
+
+from hooklib.cache import file_signature
+from hooklib.sections import split_sections
+
+SKILL_FILE = "SKILL.md"
+
+# Role -> display name; the roles discover-skills answers for
+ROLE_NAMES = {
+    "dev": "Developer",
+    "ba": "Business Analyst",
+    "design": "Designer",
+    "tech-lead": "Technical Lead",
+    "pm": "Product Manager",
+    "tester": "Tester",
+}
+
+# Directories never scanned for skills
+SKIP_DIRS = frozenset(("__pycache__", "node_modules"))
+
+MAX_DEPTH = 8
+
+def unquote(value: str) -> str:
+    """Strip one pair of matching quotes."""
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+        return value[1:-1]
+    return value
+
+def parse_frontmatter(content: str) -> dict:
+    """Parse a skill file's frontmatter: `key: value`, `[a, b]` and `- item` lists.
+
+    Indented lines continue the previous value (folded `>` / `|` blocks).
+    """
+    if not content.startswith("---\n"):
+        return {}
+    end = content.find("\n---", 3)
+    if end == -1:
+        return {}
+
+    meta = {}
+    key = None
+    for line in content[4:end].split("\n"):
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        if key is not None and stripped.startswith("- "):
+            if not isinstance(meta[key], list):
+                meta[key] = []
+            meta[key].append(unquote(stripped[2:].strip()))
+            continue
+        if key is not None and line[0] in " \t":
+            if isinstance(meta[key], str):
+                meta[key] = (meta[key] + " " + stripped).strip()
+            continue
+
+        name, sep, value = line.partition(":")
+        if not sep:
+            key = None
+            continue
+        key = name.strip()
+        value = value.strip()
+        if value in ("|", ">", "|-", ">-"):
+            value = ""
+        if value.startswith("[") and value.endswith("]"):
+            meta[key] = [unquote(item.strip()) for item in value[1:-1].split(",") if item.strip()]
+        else:
+            meta[key] = unquote(value)
+    return meta
+
+def as_list(value) -> list:
+    """Frontmatter value as a list (comma-separated strings are split)."""
+    if isinstance(value, list):
+        return value
+    return [item.strip() for item in str(value or "").split(",") if item.strip()]
+
+def parse_keywords(value) -> list:
+    """Frontmatter keywords as skill index entries (`react:3` -> weight 3)."""
+    keywords = []
+    for item in as_list(value):
+        keyword, sep, weight = item.rpartition(":")
+        if sep and keyword.strip():
+            try:
+                keywords.append({"keyword": unquote(keyword.strip()), "weight": float(weight)})
+                continue
+            except ValueError:
+                pass
+        keywords.append(item)
+    return keywords
+
+def skill_roots(plugin_root) -> list:
+    """Get the plugin skills directory followed by the user skill directories."""
+    from hooklib import config
+    from hooklib.project import get_project_root
+
+    roots = [os.path.join(str(plugin_root), "skills")]
+    extra = config.get("skillDirs", env="S_SKILL_DIRS") or []
+    if isinstance(extra, str):
+        extra = extra.split(os.pathsep)
+    for directory in extra:
+        if not isinstance(directory, str) or not directory:
+            continue
+        directory = os.path.expanduser(directory)
+        if not os.path.isabs(directory):
+            directory = os.path.join(get_project_root(), directory)
+        directory = os.path.normpath(directory)
+        if directory not in roots:
+            roots.append(directory)
+    return roots
+
+def scan(roots: list) -> tuple:
+    """Walk the skill roots.
+
+    Returns (sources, skills): sources maps every scanned directory and
+    skill file to its signature (a new or removed file changes its
+    directory's signature); skills lists (root, SKILL.md path, companion
+    paths) in root order.
+    """
+    sources = {}
+    skills = []
+
+    def walk(root: str, directory: str, depth: int):
+        signature = file_signature(directory)
+        if signature is None:
+            return
+        sources[directory] = signature
+        try:
+            with os.scandir(directory) as entries:
+                entries = sorted(entries, key=lambda entry: entry.name)
+        except OSError:
+            return
+
+        docs = [entry.path for entry in entries
+                if entry.name.endswith(".md") and entry.is_file()]
+        skill_path = os.path.join(directory, SKILL_FILE)
+        if skill_path in docs:
+            companions = [path for path in docs if path != skill_path]
+            for path in docs:
+                sources[path] = file_signature(path)
+            skills.append((root, skill_path, companions))
+
+        if depth < MAX_DEPTH:
+            for entry in entries:
+                if (entry.is_dir() and not entry.name.startswith(".")
+                        and entry.name not in SKIP_DIRS):
+                    walk(root, entry.path, depth + 1)
+
+    for root in roots:
+        walk(root, root, 0)
+    return sources, skills
+
+def read_file(path: str, is_skill: bool) -> dict:
+    """Parse one skill or companion file for the manifest."""
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            content = f.read()
+    except OSError:
+        content = ""
+    return {
+        "signature": file_signature(path),
+        "meta": parse_frontmatter(content) if is_skill else {},
+        "sections": split_sections(content),
+    }
+
+def skill_roles(meta: dict, root: str, skill_path: str) -> list:
+    """Get a skill's roles: frontmatter `role`/`roles`, else its top directory."""
+    roles = as_list(meta.get("role") or meta.get("roles"))
+    if roles:
+        return [role.lower() for role in roles]
+    relative = os.path.relpath(os.path.dirname(skill_path), root)
+    if relative == os.curdir:
+        return []
+    return [relative.split(os.sep)[0].lower()]
+
+def build(plugin_root, previous: dict = None, roots: list = None) -> dict:
+    """Build the registry, reusing parsed files from a previous manifest.
+
+    Returns {"roots", "sources", "files" (the manifest), "roles",
+    "reparsed"}; "roles" has the shape of the old skill-index.json.
+    """
+    roots = roots if roots is not None else skill_roots(plugin_root)
+    sources, found = scan(roots)
+    previous = previous or {}
+
+    files = {}
+    reparsed = 0
+    for _, skill_path, companions in found:
+        for path in [skill_path] + companions:
+            old = previous.get(path)
+            if old is not None and old["signature"] == sources.get(path):
+                files[path] = old
+            else:
+                files[path] = read_file(path, path == skill_path)
+                reparsed += 1
+
+    roles = {}
+    for root, skill_path, companions in found:
+        meta = files[skill_path]["meta"]
+        name = meta.get("name") or os.path.basename(os.path.dirname(skill_path))
+        keywords = meta.get("keywords")
+        skill = {
+            "name": name,
+            "description": meta.get("description", ""),
+            "path": skill_path,
+            "companions": companions,
+            "keywords": (parse_keywords(keywords) if keywords
+                         else name.replace("-", " ").replace("_", " ").split()),
+        }
+        for role in skill_roles(meta, root, skill_path):
+            role_data = roles.setdefault(role, {"name": ROLE_NAMES.get(role, role), "skills": []})
+            skills = role_data["skills"]
+            for i, existing in enumerate(skills):
+                if existing["name"] == name:
+                    skills[i] = skill  # later roots override
+                    break
+            else:
+                skills.append(skill)
+
+    return {
+        "roots": roots,
+        "sources": sources,
+        "files": files,
+        "roles": roles,
+        "reparsed": reparsed,
+    }
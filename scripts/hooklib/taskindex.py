@@ -0,0 +1,229 @@
+"""
+Task Index
+
+Compact index of .claude/tasks/task-NNN-*.md: id, title, status, the byte
+range of each ## section and of every heading line, so the tech lead (and task-index.py) can
+answer status questions and read a single section without opening every
+task file.
+
+The index lives in .claude/tasks/.index.json. Every update runs under an
+exclusive lock on .index.lock and is written atomically, so dev agents
+finishing tasks in parallel cannot corrupt it or lose each other's updates.
+
+TRACKER.md is re-rendered from the index after each update. Only the block
+between the tracker markers is generated; anything written outside it is
+kept. Each task's table row is cached in the index, so a re-render formats
+only the rows of tasks that changed, and the file is rewritten only when
+the block differs.
+"""
+
+import json
+import os
+import re
+
+from hooklib import cache
+from hooklib.cache import file_signature, write_atomic
+
+INDEX_VERSION = 2
+INDEX_FILE = ".index.json"
+LOCK_FILE = ".index.lock"
+
+TASK_FILE_PATTERN = re.compile(r'task-\d{3}.*\.md$', re.IGNORECASE)
+TRACKER_FILE = 'TRACKER.md'
+
+TRACKER_BEGIN = "<!-- s:task-index:begin (generated from the task files, do not edit) -->"
+TRACKER_END = "<!-- s:task-index:end -->"
+
+TITLE_PATTERN = re.compile(rb'^#\s+(?:Task:?\s*)?(TASK-\d+)\b[\s:.\-]*(.*?)\s*$', re.IGNORECASE | re.MULTILINE)
+STATUS_PATTERN = re.compile(rb'^(?:#+|[-*])?\s*\**Status\**\s*:\s*\**\s*(.+?)\s*$', re.IGNORECASE | re.MULTILINE)
+SECTION_PATTERN = re.compile(rb'^(#{1,2})\s+(.+?)\s*$', re.MULTILINE)
+HEADING_LINE_PATTERN = re.compile(rb'^#.*$', re.MULTILINE)
+FILE_ID_PATTERN = re.compile(r'task-(\d+)', re.IGNORECASE)
+
+def tasks_dir(project_root: str) -> str:
+    """Get the project's task directory."""
+    return os.path.join(project_root, '.claude', 'tasks')
+
+def is_task_name(name: str) -> bool:
+    """Check if a file name is an indexed task file (not the tracker)."""
+    return bool(TASK_FILE_PATTERN.match(name))
+
+def locked(directory: str):
+    """Hold the index lock for a task directory."""
+    return cache.locked(os.path.join(directory, LOCK_FILE))
+
+def clean(value: bytes) -> str:
+    """Decode a matched header value and drop markdown decoration."""
+    return value.decode("utf-8", "replace").strip().strip("*[]").strip()
+
+def heading_offsets(data) -> list:
+    """Byte ranges ([start, end), without the newline) of every heading line."""
+    return [[m.start(), m.end()] for m in HEADING_LINE_PATTERN.finditer(data)]
+
+def parse_task(data: bytes, name: str) -> dict:
+    """Extract id, title, status and section byte ranges from a task file."""
+    title_match = TITLE_PATTERN.search(data)
+    status_match = STATUS_PATTERN.search(data)
+    file_id = FILE_ID_PATTERN.match(name)
+
+    sections = {}
+    starts = [(m.start(), clean(m.group(2))) for m in SECTION_PATTERN.finditer(data)
+              if len(m.group(1)) == 2]
+    for i, (start, heading) in enumerate(starts):
+        end = starts[i + 1][0] if i + 1 < len(starts) else len(data)
+        sections.setdefault(heading, [start, end])
+
+    if title_match:
+        task_id = title_match.group(1).decode().upper()
+    else:
+        task_id = f"TASK-{file_id.group(1)}" if file_id else name
+    return {
+        "id": task_id,
+        "title": clean(title_match.group(2)) if title_match else "",
+        "status": clean(status_match.group(1)) if status_match else "",
+        "sections": sections,
+        "headings": heading_offsets(data),
+    }
+
+def render_row(name: str, entry: dict) -> str:
+    """Render a task's TRACKER.md table row."""
+    title = entry["title"].replace("|", "\\|") or "-"
+    return f"| {entry['id']} | {title} | {entry['status'] or '-'} | [{name}]({name}) |"
+
+def read_index(directory: str) -> dict:
+    """Load the index (empty if missing, unreadable or outdated)."""
+    try:
+        with open(os.path.join(directory, INDEX_FILE)) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = None
+    if not isinstance(index, dict) or index.get("version") != INDEX_VERSION:
+        index = {"version": INDEX_VERSION, "tasks": {}}
+    return index
+
+def index_file(directory: str, name: str, index: dict) -> bool:
+    """Re-index one task file from disk. Returns True if the index changed."""
+    path = os.path.join(directory, name)
+    signature = file_signature(path)
+    tasks = index["tasks"]
+
+    if signature is None:
+        return tasks.pop(name, None) is not None
+    entry = tasks.get(name)
+    if entry and tuple(entry["signature"]) == signature:
+        return False
+
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return tasks.pop(name, None) is not None
+
+    entry = parse_task(data, name)
+    entry["signature"] = list(signature)
+    entry["row"] = render_row(name, entry)
+    tasks[name] = entry
+    return True
+
+def cached_headings(directory: str, name: str, signature):
+    """Get a task file's indexed heading ranges if the index is current for it."""
+    entry = read_index(directory)["tasks"].get(name)
+    if entry and signature is not None and tuple(entry["signature"]) == signature:
+        return entry["headings"]
+    return None
+
+def sync(directory: str, index: dict) -> bool:
+    """Re-index changed task files and drop deleted ones (stat-only when clean)."""
+    try:
+        names = {name for name in os.listdir(directory) if is_task_name(name)}
+    except OSError:
+        names = set()
+
+    changed = False
+    for name in names | set(index["tasks"]):
+        changed = index_file(directory, name, index) or changed
+    return changed
+
+def sorted_tasks(index: dict) -> list:
+    """Get (file name, entry) pairs ordered by task id."""
+    def key(item):
+        number = item[1]["id"].rpartition("-")[2]
+        return (int(number) if number.isdigit() else float("inf"), item[0])
+    return sorted(index["tasks"].items(), key=key)
+
+def render_tracker_block(index: dict) -> str:
+    """Render the generated TRACKER.md block."""
+    counts = {}
+    for entry in index["tasks"].values():
+        status = entry["status"] or "-"
+        counts[status] = counts.get(status, 0) + 1
+    summary = ", ".join(f"{status}: {count}" for status, count in sorted(counts.items()))
+
+    lines = [
+        TRACKER_BEGIN,
+        f"**Tasks:** {len(index['tasks'])}" + (f" ({summary})" if summary else ""),
+        "",
+        "| ID | Title | Status | File |",
+        "|----|-------|--------|------|",
+    ]
+    lines.extend(entry["row"] for _, entry in sorted_tasks(index))
+    lines.append(TRACKER_END)
+    return "\n".join(lines)
+
+def write_tracker(directory: str, block: str) -> bool:
+    """Replace the generated block of TRACKER.md. Returns True if written."""
+    path = os.path.join(directory, TRACKER_FILE)
+    try:
+        with open(path) as f:
+            current = f.read()
+    except OSError:
+        current = "# Task Tracker\n\n"
+
+    begin = current.find(TRACKER_BEGIN)
+    end = current.find(TRACKER_END, begin + 1) if begin != -1 else -1
+    if begin != -1 and end != -1:
+        updated = current[:begin] + block + current[end + len(TRACKER_END):]
+    else:
+        updated = current.rstrip("\n") + "\n\n" + block + "\n"
+
+    if updated == current:
+        return False
+    write_atomic(path, updated.encode(), shared=True)
+    return True
+
+def update(directory: str, names=None) -> dict:
+    """Re-index the given task files (or every changed one) and refresh TRACKER.md."""
+    with locked(directory):
+        index = read_index(directory)
+        if names is None or not index["tasks"]:
+            changed = sync(directory, index)
+        else:
+            changed = False
+            for name in names:
+                changed = index_file(directory, name, index) or changed
+
+        if changed:
+            write_atomic(os.path.join(directory, INDEX_FILE), json.dumps(index).encode(), shared=True)
+        write_tracker(directory, render_tracker_block(index))
+    return index
+
+def task_number(task_id: str) -> str:
+    """Normalize a task id for lookups (TASK-001, task-1 and 001 are equal)."""
+    return task_id.upper().removeprefix("TASK-").lstrip("0") or "0"
+
+def find_task(index: dict, task_id: str):
+    """Find a task by id. Returns (file name, entry), or (None, None)."""
+    number = task_number(task_id)
+    for name, entry in index["tasks"].items():
+        if task_number(entry["id"]) == number:
+            return name, entry
+    return None, None
+
+def read_section(directory: str, name: str, entry: dict, section: str) -> str:
+    """Read one section of a task file using its indexed byte range."""
+    for heading, (start, end) in entry["sections"].items():
+        if heading.lower() == section.lower():
+            with open(os.path.join(directory, name), "rb") as f:
+                f.seek(start)
+                return f.read(end - start).decode("utf-8", "replace")
+    return None
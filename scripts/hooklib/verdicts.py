@@ -0,0 +1,182 @@
+"""
+Verdict Cache
+
+Session-scoped LRU of check results for repeated tool calls. Agents rerun
+`npm test` and rewrite the same file many times; a check whose verdict
+depends only on a few tool_input fields (router.register(cache=...)) answers
+a repeat from this cache, without loading its script.
+
+Each session has one marshal file holding up to MAX_ENTRIES verdicts in
+least-recently-used order. It is rewritten only when a verdict was added, so
+a hit costs one read. Hit/miss counters for the report in hook-metrics.py
+are appended to a separate tally file, one byte per tool call.
+
+Verdicts are dropped when any of the plugin's scripts or the project's
+s-config.json changes. The scripts are listed once per process (in the
+daemon, again after it reloads a script); s-config.json is checked on every
+load. Hook processes of one session that run at the same time each save
+their copy; the last write wins, which only costs a few misses. A tool call
+counts as a hit when no check had to run.
+"""
+
+import os
+
+from hooklib import loader
+from hooklib.cache import cache_dir, file_signature
+from hooklib.rules import SAFE_ID_CHARS, read_marshal, write_marshal
+
+CACHE_VERSION = 2
+MAX_ENTRIES = 256
+
+# Longer fingerprints are stored as a SHA-1 of the text
+MAX_KEY_CHARS = 256
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HIT, MISS = b"+", b"-"
+
+_scripts = {}  # loader generation -> signature of the scripts
+
+def verdicts_dir() -> str:
+    """Get the directory of the per-session verdict files."""
+    return os.path.join(cache_dir(), "verdicts")
+
+def verdicts_path(session_id: str) -> str:
+    """Get a session's verdict file."""
+    safe = "".join(c if c in SAFE_ID_CHARS else "_" for c in session_id[:128])
+    return os.path.join(verdicts_dir(), f"{safe}.marshal")
+
+def tally_path(path: str) -> str:
+    """Get the hit/miss tally file next to a session's verdict file."""
+    return path[:-len(".marshal")] + ".tally"
+
+def scripts_signature() -> tuple:
+    """Change signature of the plugin's scripts, listed once per loader generation."""
+    cached = _scripts.get(loader.generation)
+    if cached is not None:
+        return cached
+
+    files = []
+    for directory in (SCRIPTS_DIR, os.path.join(SCRIPTS_DIR, "hooklib")):
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".py"):
+                        st = entry.stat()
+                        files.append((entry.name, st.st_mtime_ns, st.st_size))
+        except OSError:
+            continue
+    files.sort()
+    _scripts.clear()
+    signature = _scripts[loader.generation] = tuple(files)
+    return signature
+
+def rules_signature() -> tuple:
+    """Change signature of what verdicts depend on: the scripts and s-config.json."""
+    from hooklib import config
+
+    path = config.config_path()
+    return (CACHE_VERSION, scripts_signature(), path, file_signature(path))
+
+def fingerprint(label: str, hook_input: dict, fields: tuple):
+    """Key for a check's verdict: check, tool name and the given tool_input fields.
+
+    Values are used verbatim apart from surrounding whitespace (a deny
+    message quotes them). Returns None if a field is not a string.
+    """
+    tool_input = hook_input.get("tool_input")
+    if not isinstance(tool_input, dict):
+        return None
+    parts = [label, hook_input.get("tool_name", "")]
+    for field in fields:
+        value = tool_input.get(field)
+        if value is None:
+            continue
+        if not isinstance(value, str):
+            return None
+        parts.append(f"{field}={value.strip()}")
+    key = "\0".join(parts)
+    if len(key) > MAX_KEY_CHARS:
+        import hashlib
+        key = hashlib.sha1(key.encode()).hexdigest()
+    return key
+
+def load(session_id: str):
+    """Load a session's cache, emptied if the rules changed; None without a session."""
+    if not session_id:
+        return None
+    path = verdicts_path(session_id)
+    signature = rules_signature()
+    state = read_marshal(path)
+    if not isinstance(state, dict) or state.get("signature") != signature:
+        state = {"signature": signature, "entries": {}}
+    state["path"] = path
+    return state
+
+def lookup(state: dict, key: str):
+    """Get (True, verdict) for a cached key, else (False, None)."""
+    entries = state["entries"]
+    if key in entries:
+        entries[key] = entries.pop(key)  # most recently used last
+        return True, entries[key]
+    return False, None
+
+def count(state: dict, hit: bool):
+    """Count a tool call as answered from the cache alone (hit) or not."""
+    path = tally_path(state["path"])
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+        try:
+            os.write(fd, HIT if hit else MISS)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+def store(state: dict, key: str, verdict):
+    """Cache a verdict, evicting the least recently used beyond MAX_ENTRIES."""
+    entries = state["entries"]
+    entries.pop(key, None)
+    entries[key] = verdict
+    while len(entries) > MAX_ENTRIES:
+        del entries[next(iter(entries))]
+    state["added"] = True
+
+def save(state: dict):
+    """Write a session's cache back if a verdict was added."""
+    if not state.pop("added", False):
+        return
+    path = state.pop("path")
+    write_marshal(path, state)
+    state["path"] = path
+
+def stats(session_id: str = None) -> dict:
+    """Hit/miss counts for one session, the latest (None) or all ("*")."""
+    try:
+        with os.scandir(verdicts_dir()) as entries:
+            files = [entry for entry in entries if entry.name.endswith(".tally")]
+    except OSError:
+        files = []
+
+    if session_id is None:
+        files = sorted(files, key=lambda entry: entry.stat().st_mtime_ns)[-1:]
+    elif session_id != "*":
+        files = [entry for entry in files if entry.path == tally_path(verdicts_path(session_id))]
+
+    totals = {"sessions": 0, "hits": 0, "misses": 0, "entries": 0}
+    for entry in files:
+        try:
+            with open(entry.path, "rb") as f:
+                tally = f.read()
+        except OSError:
+            continue
+        state = read_marshal(entry.path[:-len(".tally")] + ".marshal")
+        totals["sessions"] += 1
+        totals["hits"] += tally.count(HIT)
+        totals["misses"] += tally.count(MISS)
+        if isinstance(state, dict):
+            totals["entries"] += len(state.get("entries", {}))
+    lookups = totals["hits"] + totals["misses"]
+    totals["hit_rate"] = totals["hits"] / lookups if lookups else 0.0
+    return totals
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Task and Skill Linter
+
+Checks every task file in .claude/tasks/ and every SKILL.md under the
+plugin's skills/ and the configured skillDirs (see hooklib/lint.py) in one
+run, for CI or after editing files by hand.
+
+Usage:
+  python3 lint-files.py [--tasks | --skills] [--jobs N] [--json] [--strict]
+
+Exit status: 0 when clean, 1 when there are errors (or warnings with
+--strict), 2 on usage errors.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hooklib import lint, project, skillregistry, taskindex
+
+def get_plugin_root() -> str:
+    """Get the plugin root (CLAUDE_PLUGIN_ROOT or the parent of scripts/)."""
+    return os.environ.get("CLAUDE_PLUGIN_ROOT") or os.path.dirname(
+        os.path.dirname(os.path.abspath(__file__)))
+
+def format_problem(p: dict) -> str:
+    """Render a problem as `path:line: severity: message [code]`."""
+    path = os.path.relpath(p["path"])
+    location = f"{path}:{p['line']}" if p["line"] else path
+    return f"{location}: {p['severity']}: {p['message']} [{p['code']}]"
+
+def main():
+    parser = argparse.ArgumentParser(description="Lint S plugin task and skill files")
+    scope = parser.add_mutually_exclusive_group()
+    scope.add_argument("--tasks", action="store_true", help="only lint .claude/tasks/")
+    scope.add_argument("--skills", action="store_true", help="only lint skill files")
+    parser.add_argument("--jobs", type=int, default=0, help="worker processes (default: one per CPU)")
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    parser.add_argument("--strict", action="store_true", help="fail on warnings too")
+    args = parser.parse_args()
+    if args.jobs < 0:
+        parser.error("--jobs must be positive")
+
+    tasks_dir = None if args.skills else taskindex.tasks_dir(project.get_project_root())
+    roots = None if args.tasks else skillregistry.skill_roots(get_plugin_root())
+    result = lint.lint(tasks_dir, roots, args.jobs or None)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        for p in result["problems"]:
+            print(format_problem(p))
+        print(f"Linted {result['files']} files: {result['errors']} errors, "
+              f"{result['warnings']} warnings")
+
+    failed = result["errors"] or (args.strict and result["warnings"])
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,30 @@
 Prompt Refinement Hook for S Plugin
 
 Applies to ALL user prompts. Asks user if they want enhancement before proceeding.
+
+Skipped entirely (no template rendering) when .claude/s-config.json has
+"autoAccept": true, or the prompt matches a "refine.skip" regex:
+
+  {"autoAccept": false, "refine": {"minLength": 10, "skip": ["^@ba\\s"], "maxEcho": 4000}}
+
+The prompt is already in the conversation, so one longer than "maxEcho"
+characters is not echoed back: the instructions refer to the user's
+message and show a head/tail excerpt. A long prompt that is mostly pasted
+material (code blocks, stack traces, log lines) is not refined at all.
+Both are decided by one pass over its lines.
 """
 
 import json
 import sys
+import os
 import re
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hooklib import metrics
+from hooklib.config import load_config
+from hooklib.result import emit
+
 # Skip refinement for these exact patterns (confirmations, short responses)
 SKIP_PATTERNS = [
     "yes", "no", "ok", "approved", "confirm", "cancel",
@@ -38,43 +56,122 @@ SKIP_COMMAND_PATTERNS = [
     r'^/vim',
 ]
 
-def should_skip(prompt: str) -> bool:
+SKIP_COMMAND_MATCHER = re.compile("|".join(SKIP_COMMAND_PATTERNS), re.IGNORECASE)
+
+# Longer prompts cannot equal a SKIP_PATTERNS entry, so are never lowercased
+MAX_SKIP_PATTERN = max(len(pattern) for pattern in SKIP_PATTERNS)
+
+# Prompts longer than this (refine.maxEcho) are referenced, not echoed
+MAX_ECHO_CHARS = 4000
+
+# Characters of a long prompt shown from its start and its end
+EXCERPT_HEAD_CHARS = 1200
+EXCERPT_TAIL_CHARS = 400
+
+# A long prompt with at least this share of pasted material is not refined
+PAYLOAD_SHARE = 0.9
+
+# Lines that are pasted output rather than instructions: indented (code,
+# trace frames), trace headers, timestamps, log levels, markup and data
+PAYLOAD_LINE = re.compile(
+    r'\s|Traceback |File "|at |Caused by|\d{4}-\d\d-\d\d|\d\d:\d\d:\d\d'
+    r'|\[?(?:TRACE|DEBUG|INFO|WARN|WARNING|ERROR|FATAL|CRITICAL)\b|[\[\]{}<>|]|#\d|\$ '
+)
+
+_config_skip = {}  # tuple of config patterns -> compiled matcher
+
+def config_skip_matcher(patterns: list):
+    """Compile the config's refine.skip regexes once per distinct list."""
+    key = tuple(patterns)
+    if key not in _config_skip:
+        valid = []
+        for pattern in patterns:
+            try:
+                re.compile(pattern)
+                valid.append(f"(?:{pattern})")
+            except re.error:
+                print(f"[Refinement: ignoring invalid skip pattern {pattern!r}]", file=sys.stderr)
+        _config_skip[key] = re.compile("|".join(valid), re.IGNORECASE) if valid else None
+    return _config_skip[key]
+
+def should_skip(prompt: str, config: dict = None) -> bool:
     """Check if prompt should skip refinement."""
-    prompt_lower = prompt.lower().strip()
+    refine_config = (config or {}).get("refine", {})
+    prompt = prompt.strip()
 
     # Skip short prompts
-    if len(prompt_lower) < 10:
+    if len(prompt) < refine_config.get("minLength", 10):
         return True
 
     # Skip exact confirmation patterns
-    if prompt_lower in SKIP_PATTERNS:
+    if len(prompt) <= MAX_SKIP_PATTERN and prompt.lower() in SKIP_PATTERNS:
         return True
 
     # Skip built-in commands
-    for pattern in SKIP_COMMAND_PATTERNS:
-        if re.match(pattern, prompt, re.IGNORECASE):
-            return True
-
-    return False
-
-def main():
-    try:
-        input_data = sys.stdin.read()
-        if not input_data.strip():
-            sys.exit(0)
-
-        hook_input = json.loads(input_data)
-        prompt = hook_input.get("prompt", "").strip()
+    if SKIP_COMMAND_MATCHER.match(prompt):
+        return True
 
-        if not prompt:
-            sys.exit(0)
+    # Skip project-configured patterns
+    matcher = config_skip_matcher(refine_config.get("skip", []))
+    if matcher and matcher.search(prompt):
+        return True
 
-        # Check if should skip
-        if should_skip(prompt):
-            sys.exit(0)
+    return False
 
-        # For all other prompts, ask user if they want enhancement
-        output = f"""<prompt-refinement>
+def payload_share(prompt: str) -> float:
+    """Share of a prompt's characters in code fences or pasted-output lines."""
+    payload = 0
+    in_fence = False
+    for line in prompt.split("\n"):
+        if line.startswith("```"):
+            in_fence = not in_fence
+            payload += len(line) + 1
+        elif in_fence or not line or PAYLOAD_LINE.match(line):
+            payload += len(line) + 1
+    return payload / (len(prompt) + 1)
+
+def excerpt(prompt: str) -> str:
+    """The start and end of a long prompt, cut at line breaks where possible."""
+    head = prompt[:EXCERPT_HEAD_CHARS]
+    cut = head.rfind("\n")
+    if cut > EXCERPT_HEAD_CHARS // 2:
+        head = head[:cut]
+    tail = prompt[-EXCERPT_TAIL_CHARS:]
+    cut = tail.find("\n")
+    if -1 < cut < EXCERPT_TAIL_CHARS // 2:
+        tail = tail[cut + 1:]
+    omitted = len(prompt) - len(head) - len(tail)
+    lines = prompt.count("\n", len(head), len(prompt) - len(tail))
+    return (f"{head}\n[... {omitted:,} characters ({lines:,} lines) omitted; "
+            f"the full prompt is the user's message above ...]\n{tail}")
+
+def refine(hook_input: dict):
+    """Build the refinement instructions for a prompt, or None to skip."""
+    prompt = hook_input.get("prompt", "").strip()
+
+    if not prompt:
+        return None
+
+    # Autonomous mode: no refinement round trip
+    config = load_config()
+    if config.get("autoAccept"):
+        return None
+
+    # Check if should skip
+    if should_skip(prompt, config):
+        return None
+
+    # Long prompts are referenced, not echoed (nor refined if mostly pasted)
+    original = prompt
+    if len(prompt) > config.get("refine", {}).get("maxEcho", MAX_ECHO_CHARS):
+        if payload_share(prompt) >= PAYLOAD_SHARE:
+            return None
+        prompt = excerpt(prompt)
+        original = (f"[Summarize the user's message above in one line "
+                    f"({len(original):,} characters); do not repeat it]")
+
+    # For all other prompts, ask user if they want enhancement
+    return f"""<prompt-refinement>
 Before proceeding with the user's request, you MUST ask if they want prompt enhancement.
 
 **User's Original Prompt:**
@@ -94,7 +191,7 @@ Use AskUserQuestion tool NOW with:
    - Implicit requirements
 2. Present:
    ---
-   **Original:** {prompt}
+   **Original:** {original}
 
    **Enhanced:** [Your refined, detailed version]
 
@@ -121,7 +218,15 @@ Use AskUserQuestion tool NOW with:
 Proceed with the original prompt immediately.
 
 </prompt-refinement>"""
-        print(output)
+
+def main():
+    try:
+        input_data = sys.stdin.read()
+        if not input_data.strip():
+            sys.exit(0)
+
+        hook_input = json.loads(input_data)
+        emit(metrics.timed("refine-prompt", refine, hook_input))
         sys.exit(0)
 
     except json.JSONDecodeError:
@@ -4,52 +4,116 @@ Session Start Rules Loader
 
 Injects mandatory rules at the start of every session.
 These rules cannot be bypassed.
+
+Session start gets the core rules plus a compact digest of rules/*.md
+(see hooklib.rules). The full text of a rule file is injected once per
+session, when a role command that needs it is first used.
+
+Every injection is versioned; a resumed session that already has the
+current digest is not injected again.
+
+Usage:
+  python3 session-rules.py            # SessionStart
+  python3 session-rules.py <role>     # UserPromptSubmit for a role command
 """
 
 import sys
 import os
-from pathlib import Path
 
-def main():
-    # Get plugin root
-    plugin_root = os.environ.get('CLAUDE_PLUGIN_ROOT', '')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-    if plugin_root:
-        rules_path = Path(plugin_root) / "rules" / "research.md"
-    else:
+from hooklib import metrics, rules
+from hooklib.result import emit
+
+CORE_RULES = """COZE TOOLKIT ACTIVE - MANDATORY RULES (enforced by hooks, cannot be bypassed)
+
+RULE 1: RESEARCH PROOF REQUIRED - every claim needs SOURCE + EVIDENCE + CONCLUSION;
+never say "probably" or "likely" without proof; if you didn't find it, say "Not found"
+RULE 2: CONFIRMATION BEFORE ACTION - show plan before writing code, present options
+before deep diving, ask before modifying files
+RULE 3: PROTECTED FILES BLOCKED - .env, credentials, secrets are always blocked;
+the user must explicitly confirm protected file changes"""
+
+def get_plugin_root() -> str:
+    """Get the plugin root directory."""
+    plugin_root = os.environ.get('CLAUDE_PLUGIN_ROOT', '')
+    if not plugin_root:
         # Fallback
-        rules_path = Path(__file__).parent.parent / "rules" / "research.md"
+        plugin_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return plugin_root
 
-    rules = """
-╔══════════════════════════════════════════════════════════════╗
-║                    COZE TOOLKIT ACTIVE                       ║
-║                  MANDATORY RULES LOADED                      ║
-╚══════════════════════════════════════════════════════════════╝
+def digest_marker(version: str) -> str:
+    """Marker that identifies an injected digest version."""
+    return f"[S RULES v{version}]"
 
-RULE 1: RESEARCH PROOF REQUIRED
-- Every claim needs SOURCE + EVIDENCE + CONCLUSION
-- Never say "probably" or "likely" without proof
-- If you didn't find it, say "Not found" - don't imagine
+def session_rules(hook_input: dict = None) -> str:
+    """Build the rules digest injected at session start, or None if present."""
+    hook_input = hook_input or {}
+    compiled = rules.load(get_plugin_root())
+    version = compiled["digest_version"]
+    marker = digest_marker(version)
 
-RULE 2: CONFIRMATION BEFORE ACTION
-- Show plan before writing code
-- Present options before deep diving
-- Ask before modifying files
+    session_id = hook_input.get("session_id", "")
+    source = hook_input.get("source", "startup")
+    state = rules.load_session(session_id)
 
-RULE 3: PROTECTED FILES BLOCKED
-- .env, credentials, secrets → Always blocked
-- User must explicitly confirm protected file changes
+    if source == "resume" and (
+        state.get("digest") == version
+        or rules.transcript_has(hook_input.get("transcript_path"), marker)
+    ):
+        return None
 
-These rules are ENFORCED by hooks and cannot be bypassed.
-"""
+    note = ""
+    if source == "resume" and state.get("digest"):
+        note = " (rules updated since this session started)"
+    if source != "resume":
+        # Startup, /clear or compaction: earlier full rule text is gone
+        state["full"] = {}
+    state["digest"] = version
+    rules.save_session(session_id, state)
+
+    return f"""{marker}{note}
+{CORE_RULES}
+
+{compiled["digest"]}
+
+Full rule text is loaded with the role commands (rules/*.md)."""
+
+def role_rules(hook_input: dict, role: str) -> str:
+    """Build the full rule text a role command needs, once per session."""
+    compiled = rules.load(get_plugin_root())
+    session_id = hook_input.get("session_id", "")
+    state = rules.load_session(session_id)
+    injected = state.setdefault("full", {})
 
-    # Also load research.md if exists
-    if rules_path.exists():
-        with open(rules_path) as f:
-            research_content = f.read()
-        rules += f"\n--- FULL RESEARCH RULE ---\n{research_content}"
+    parts = []
+    for name in rules.ROLE_RULES.get(role, []):
+        version = compiled["text_versions"].get(name)
+        if version is None or injected.get(name) == version:
+            continue
+        parts.append(f"--- FULL RULE: {name} (v{version}) ---\n{compiled['texts'][name]}")
+        injected[name] = version
 
-    print(rules)
+    if not parts:
+        return None
+    rules.save_session(session_id, state)
+    return "\n".join(parts)
+
+def main():
+    import json
+
+    input_data = sys.stdin.read() if not sys.stdin.isatty() else ""
+    try:
+        hook_input = json.loads(input_data) if input_data.strip() else {}
+    except json.JSONDecodeError:
+        hook_input = {}
+    if not isinstance(hook_input, dict):
+        hook_input = {}
+
+    if len(sys.argv) > 1:
+        emit(metrics.timed("session-rules", role_rules, hook_input, sys.argv[1]))
+    else:
+        emit(metrics.timed("session-rules", session_rules, hook_input))
     sys.exit(0)
 
 if __name__ == "__main__":
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Task Index Query
+
+Answers task status questions from .claude/tasks/.index.json instead of
+reading every task file. The index is brought up to date first (one stat
+per task file; only changed files are re-read), and TRACKER.md is
+re-rendered when anything changed.
+
+Usage:
+  python3 task-index.py list [--status STATUS] [--json]
+  python3 task-index.py show TASK-001 [--section Report]
+  python3 task-index.py sync
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hooklib import project, taskindex
+
+def list_tasks(index: dict, status: str = None) -> list[dict]:
+    """Get index entries as rows, optionally filtered by status."""
+    rows = []
+    for name, entry in taskindex.sorted_tasks(index):
+        if status and entry["status"].lower() != status.lower():
+            continue
+        rows.append({
+            "id": entry["id"],
+            "title": entry["title"],
+            "status": entry["status"],
+            "file": name,
+            "sections": sorted(entry["sections"]),
+        })
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the S plugin task index")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", help="list tasks")
+    list_parser.add_argument("--status", help="only tasks with this status")
+    list_parser.add_argument("--json", action="store_true", help="print JSON")
+
+    show_parser = commands.add_parser("show", help="print a task or one of its sections")
+    show_parser.add_argument("task", help="task id (TASK-001, 001 or 1)")
+    show_parser.add_argument("--section", help="section heading (Assignment, Report, Review)")
+
+    commands.add_parser("sync", help="re-index changed files and re-render TRACKER.md")
+    args = parser.parse_args()
+
+    tasks_dir = taskindex.tasks_dir(project.get_project_root())
+    if not os.path.isdir(tasks_dir):
+        print(f"No task directory at {tasks_dir}", file=sys.stderr)
+        sys.exit(1)
+    index = taskindex.update(tasks_dir)
+
+    if args.command == "sync":
+        print(f"Indexed {len(index['tasks'])} tasks in {tasks_dir}")
+
+    elif args.command == "list":
+        rows = list_tasks(index, args.status)
+        if args.json:
+            print(json.dumps(rows, indent=2))
+        else:
+            for row in rows:
+                print(f"{row['id']:<10} {row['status'] or '-':<14} {row['title']}")
+
+    elif args.command == "show":
+        name, entry = taskindex.find_task(index, args.task)
+        if entry is None:
+            print(f"No task {args.task}", file=sys.stderr)
+            sys.exit(1)
+        if args.section:
+            text = taskindex.read_section(tasks_dir, name, entry, args.section)
+            if text is None:
+                print(f"{entry['id']} has no section {args.section!r} "
+                      f"(has: {', '.join(entry['sections'])})", file=sys.stderr)
+                sys.exit(1)
+            print(text.rstrip())
+        else:
+            with open(os.path.join(tasks_dir, name)) as f:
+                print(f.read().rstrip())
+
+    sys.exit(0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Transcript audit: built-in rules, candidate protectedPaths and candidate command patterns."""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from hooklib import audit
+
+CALLS = [
+    ("Bash", {"command": "cd app && sudo docker compose up -d"}),
+    ("Bash", {"command": "echo docker compose up"}),
+    ("Bash", {"command": "npm run dev"}),
+    ("Write", {"file_path": "certs/server.pem", "content": "x"}),
+    ("Write", {"file_path": ".env", "content": "x"}),
+]
+
+class AuditTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        os.makedirs(os.path.join(self.root, ".git"))
+        self.path = os.path.join(self.root, "session.jsonl")
+        with open(self.path, "w") as f:
+            for name, tool_input in CALLS:
+                f.write(json.dumps({"type": "assistant", "cwd": self.root, "sessionId": "s", "message": {
+                    "content": [{"type": "tool_use", "name": name, "input": tool_input}]}}) + "\n")
+
+    def hits(self, **options) -> dict:
+        result = audit.audit([self.path], workers=1, **options)
+        self.assertEqual(result["tool_calls"], len(CALLS))
+        return {(entry["check"], entry["rule"]): entry["hits"] for entry in result["rules"]}
+
+    def test_built_in_rules(self):
+        hits = self.hits()
+        self.assertEqual(hits, {("enforce-build-only", "dev server \\bnpm\\s+run\\s+dev\\b"): 1,
+                                ("enforce-write", "protected path '.env'"): 1})
+
+    def test_candidate_protected_paths(self):
+        hits = self.hits(candidate=(("*.pem",), ()))
+        self.assertEqual(hits[("enforce-write", "protected path '*.pem'")], 1)
+
+    def test_candidate_command_patterns(self):
+        hits = self.hits(commands=(r"^docker compose up\b", r"^kubectl\b"))
+        self.assertEqual(hits[("candidate", r"command ^docker compose up\b")], 1)
+        self.assertNotIn(("candidate", r"command ^kubectl\b"), hits)
+        self.assertIn(("enforce-build-only", "dev server \\bnpm\\s+run\\s+dev\\b"), hits)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""Latency budgets: hookBudgets lookup, fail-open/fail-closed fallbacks and the overrun log."""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from hooklib import budgets, config
+from hooklib.result import is_deny
+
+class BudgetTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "s-config.json")
+        patcher = mock.patch.object(config, "config_path", return_value=self.path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def configure(self, hook_budgets):
+        with open(self.path, "w") as f:
+            json.dump({"hookBudgets": hook_budgets}, f)
+        config._cache.clear()  # rewrites within one mtime tick
+
+    def test_registered_defaults_without_config(self):
+        self.assertEqual(budgets.budget("enforce-write", "enforce-write", 5.0, "closed"), (5.0, "deny"))
+        self.assertEqual(budgets.budget("enforce-research", "enforce-research", 5.0, "open"), (5.0, "allow"))
+
+    def test_label_then_script_then_default(self):
+        self.configure({"default": 3000, "discover-skills": 800, "discover-skills dev": 200})
+        self.assertEqual(budgets.budget("discover-skills dev", "discover-skills", 5.0, "open"), (0.2, "allow"))
+        self.assertEqual(budgets.budget("discover-skills ba", "discover-skills", 5.0, "open"), (0.8, "allow"))
+        self.assertEqual(budgets.budget("enforce-write", "enforce-write", 5.0, "closed"), (3.0, "deny"))
+
+    def test_on_overrun_overrides_the_fallback(self):
+        self.configure({"enforce-write": {"ms": 1000, "onOverrun": "allow"},
+                        "refine-prompt": {"onOverrun": "deny"}})
+        self.assertEqual(budgets.budget("enforce-write", "enforce-write", 5.0, "closed"), (1.0, "allow"))
+        self.assertEqual(budgets.budget("refine-prompt", "refine-prompt", 5.0, "open"), (5.0, "deny"))
+
+    def test_bad_values_keep_the_defaults(self):
+        for value in ("fast", -5, 0, True, None, [100], {"ms": "1s", "onOverrun": "maybe"}):
+            with self.subTest(value=value):
+                self.configure({"enforce-write": value, "default": 100})
+                self.assertEqual(budgets.budget("enforce-write", "enforce-write", 5.0, "closed"), (5.0, "deny"))
+
+    def test_hook_budgets_not_an_object(self):
+        self.configure([1000])
+        self.assertEqual(budgets.budget("enforce-write", "enforce-write", 5.0, "closed"), (5.0, "deny"))
+
+class FallbackTest(unittest.TestCase):
+    def test_fail_closed_denies(self):
+        result = budgets.fallback_result("enforce-write", 1.0, "deny")
+        self.assertTrue(is_deny(result))
+        reason = result["hookSpecificOutput"]["permissionDecisionReason"]
+        self.assertIn("1000 ms", reason)
+        self.assertIn("hookBudgets", reason)
+
+    def test_fail_open_says_nothing(self):
+        self.assertIsNone(budgets.fallback_result("enforce-research", 1.0, "allow"))
+
+    def test_watchdog_seconds(self):
+        with mock.patch.dict(os.environ, {"S_HOOK_WATCHDOG_MS": "250"}):
+            self.assertEqual(budgets.watchdog_seconds(), 0.25)
+        with mock.patch.dict(os.environ, {"S_HOOK_WATCHDOG_MS": "soon"}):
+            self.assertEqual(budgets.watchdog_seconds(), budgets.WATCHDOG_MS / 1000)
+
+class OverrunLogTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = mock.patch.dict(os.environ, {"S_CACHE_DIR": tmp.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_records_by_session(self):
+        bash = {"session_id": "a", "tool_name": "Bash", "tool_input": {"command": "x" * 500}}
+        budgets.record_overrun("enforce-write", bash, 1.0, "deny", "PreToolUse")
+        budgets.record_overrun("refine-prompt", {"session_id": "b", "prompt": "hi"}, 0.5, "allow")
+
+        records = budgets.load_overruns("a")
+        self.assertEqual(len(records), 1)
+        record = records[0]
+        self.assertEqual((record["hook"], record["tool"], record["budget_ms"], record["fallback"],
+                          record["event"]), ("enforce-write", "Bash", 1000, "deny", "PreToolUse"))
+        self.assertEqual(len(record["input"]), budgets.MAX_INPUT_CHARS)
+        self.assertEqual([r["input"] for r in budgets.load_overruns("b")], ["hi"])
+        self.assertEqual(len(budgets.load_overruns()), 2)
+
+    def test_rotated_log_is_still_read(self):
+        with mock.patch.object(budgets, "MAX_OVERRUNS_BYTES", 10):
+            budgets.record_overrun("first", {}, 1.0, "deny")
+            budgets.record_overrun("second", {}, 1.0, "deny")
+        self.assertTrue(os.path.exists(budgets.overruns_path() + ".1"))
+        self.assertEqual([r["hook"] for r in budgets.load_overruns()], ["first", "second"])
+
+if __name__ == "__main__":
+    unittest.main()
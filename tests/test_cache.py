@@ -0,0 +1,47 @@
+"""File modes of atomic writes: private caches and files in the project."""
+
+import os
+import stat
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from hooklib.cache import write_atomic
+
+def mode(path: str) -> int:
+    """Permission bits of a file."""
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+class WriteAtomicModeTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.old_umask = os.umask(0o022)
+
+    def tearDown(self):
+        os.umask(self.old_umask)
+        self.tmp.cleanup()
+
+    def test_cache_file_is_private(self):
+        path = os.path.join(self.tmp.name, "cache.bin")
+        write_atomic(path, b"x")
+        self.assertEqual(mode(path), 0o600)
+
+    def test_new_shared_file_follows_umask(self):
+        path = os.path.join(self.tmp.name, "TRACKER.md")
+        write_atomic(path, b"x", shared=True)
+        self.assertEqual(mode(path), 0o644)
+
+    def test_shared_file_keeps_its_mode(self):
+        path = os.path.join(self.tmp.name, "TRACKER.md")
+        with open(path, "w") as f:
+            f.write("old")
+        os.chmod(path, 0o664)
+        write_atomic(path, b"new", shared=True)
+        self.assertEqual(mode(path), 0o664)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"new")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+"""s-config.json loading: defaults, overrides and values of the wrong type."""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from hooklib import config, loader
+
+refine = loader.load_script("refine-prompt")
+
+PROMPT = {"prompt": "add a CSV export to the reports page"}
+
+class ConfigTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "s-config.json")
+        patcher = mock.patch.object(config, "config_path", return_value=self.path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def configure(self, values):
+        with open(self.path, "w") as f:
+            json.dump(values, f)
+        config._cache.clear()  # rewrites within one mtime tick
+
+    def test_defaults_without_a_file(self):
+        self.assertEqual(config.load_config(), config.DEFAULTS)
+
+    def test_nested_values_overlay_defaults(self):
+        self.configure({"refine": {"minLength": 3}, "skillBudget": 2000})
+        loaded = config.load_config()
+        self.assertEqual(loaded["refine"], {"minLength": 3, "skip": [], "maxEcho": 4000})
+        self.assertEqual(loaded["skillBudget"], 2000)
+
+    def test_section_that_is_not_an_object(self):
+        for value in ("off", 0, None, ["minLength"]):
+            with self.subTest(value=value):
+                self.configure({"refine": value, "protectedPaths": value})
+                loaded = config.load_config()
+                self.assertEqual(loaded["refine"], config.DEFAULTS["refine"])
+                self.assertEqual(loaded["protectedPaths"], config.DEFAULTS["protectedPaths"])
+                self.assertIsNotNone(refine.refine(PROMPT))
+
+    def test_keys_of_the_wrong_type(self):
+        self.configure({"refine": {"minLength": "5", "maxEcho": True, "skip": "^ok$"},
+                        "protectedPaths": {"deny": "*.pem", "allow": ["*.pub"]}})
+        loaded = config.load_config()
+        self.assertEqual(loaded["refine"], config.DEFAULTS["refine"])
+        self.assertEqual(loaded["protectedPaths"], {"deny": [], "allow": ["*.pub"]})
+        self.assertIsNotNone(refine.refine(PROMPT))
+
+    def test_not_an_object_at_all(self):
+        self.configure(["refine"])
+        self.assertEqual(config.load_config(), config.DEFAULTS)
+
+if __name__ == "__main__":
+    unittest.main()
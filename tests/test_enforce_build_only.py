@@ -0,0 +1,62 @@
+"""Dev-server commands enforce-build-only.py blocks, and those it lets through."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from hooklib import loader
+
+build_only = loader.load_script("enforce-build-only")
+
+BLOCKED = [
+    "npm run dev",
+    "sudo npm start",
+    "bash -c 'npm run dev'",
+    "npx next dev",
+    "python -m uvicorn app:app",
+    "npx nodemon server.js",
+    "npx tsx watch src/index.ts",
+    "npx ts-node-dev src/index.ts",
+    "poetry run uvicorn app:app",
+    "uv run uvicorn app:app",
+    "python -m flask run",
+    "pipenv run python manage.py runserver",
+    "npx -y nodemon server.js",
+    "pnpm dlx nodemon server.js",
+    "sudo -iu app npm start",
+    "bundle exec rails server",
+    "bundle exec rails s -p 3000",
+    "sh <<EOF\nnpm run dev\nEOF",
+    "echo npm run dev | bash",
+    "bash <<< 'yarn dev'",
+]
+
+ALLOWED = [
+    "npm run build",
+    "npm test",
+    "npx vite build",
+    "npx tsc --noEmit",
+    "python -m pytest -q",
+    "poetry run pytest",
+    "git commit -m 'go run is no longer needed'",
+    "cat <<'EOF' > NOTES.md\nnpm run dev\nEOF",
+    "echo npm run dev >> README.md",
+    "bundle exec rspec",
+    "sudo -uapp npm test",
+]
+
+class DevServerCommandTest(unittest.TestCase):
+    def test_blocked(self):
+        for command in BLOCKED:
+            with self.subTest(command=command):
+                self.assertIsNotNone(build_only.match_dev_server_command(command))
+
+    def test_allowed(self):
+        for command in ALLOWED:
+            with self.subTest(command=command):
+                self.assertIsNone(build_only.match_dev_server_command(command))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+"""Research reminder throttling, and its per-session counter under parallel hooks."""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+SCRIPTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts")
+sys.path.insert(0, SCRIPTS)
+
+from hooklib import loader
+
+research = loader.load_script("enforce-research")
+
+READ = {"session_id": "s1", "tool_name": "Read", "tool_input": {"file_path": "a.py"}}
+
+CALLER = """
+import sys
+sys.path.insert(0, sys.argv[1])
+from hooklib import loader
+research = loader.load_script("enforce-research")
+for _ in range(int(sys.argv[2])):
+    research.research_reminder({"session_id": "s1", "tool_name": "Grep"})
+"""
+
+class ResearchReminderTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.env = {"S_CACHE_DIR": tmp.name, "S_RESEARCH_REMINDER": "calls:3"}
+        patcher = mock.patch.dict(os.environ, self.env)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reminds_every_n_calls(self):
+        reminded = [research.research_reminder(READ) is not None for _ in range(7)]
+        self.assertEqual(reminded, [True, False, False, True, False, False, True])
+        research.research_reminder(READ)
+        research.research_reminder(READ)
+        self.assertIn("2 repeated reminders suppressed", research.research_reminder(READ))
+
+    def test_parallel_hooks_keep_every_call(self):
+        processes, calls = 6, 25
+        env = dict(os.environ, **self.env)
+        running = [subprocess.Popen([sys.executable, "-c", CALLER, SCRIPTS, str(calls)], env=env)
+                   for _ in range(processes)]
+        for process in running:
+            self.assertEqual(process.wait(timeout=60), 0)
+        state = research.load_state(research.state_path("s1"))
+        self.assertEqual(state["calls"], processes * calls)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+"""Edits of task files: required sections must survive, small files and mapped large ones."""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from hooklib import loader, taskindex
+from hooklib.result import is_deny
+
+task_files = loader.load_script("enforce-task-files")
+
+TASK = """# TASK-007: Export CSV
+
+Status: Todo
+
+## Assignment
+Add an export button.
+
+## Report
+Not started.
+
+## Review
+Pending.
+"""
+
+# Edits that keep every required section: (old_string, new_string, replace_all)
+KEEPING = [
+    ("Not started.", "Done, see PR."),
+    ("## Report\nNot started.", "## Report\nStarted."),
+    ("## Review", "### Review"),
+    ("Pending.", "Pending.\n\n## Notes\nnone"),
+    ("e", "E", True),
+    ("not in the file", "anything"),
+]
+
+# Edits that drop a required section, and the section reported
+REMOVING = [
+    ("## Report\nNot started.\n\n", "", "Report"),
+    ("## Review", "## Feedback", "Review"),
+    ("## Assignment\nAdd an export button.", "Add an export button.", "Assignment"),
+]
+
+class TaskEditTest(unittest.TestCase):
+    padding = ""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = os.path.realpath(tmp.name)
+        self.dir = os.path.join(self.root, ".claude", "tasks")
+        os.makedirs(self.dir)
+        self.path = os.path.join(self.dir, "task-007-export.md")
+        with open(self.path, "w") as f:
+            f.write(TASK + self.padding)
+
+    def validate(self, old, new, replace_all=False):
+        return task_files.validate_task_edit(self.path, old, new, replace_all)
+
+    def test_edits_keeping_sections_are_allowed(self):
+        for old, new, *replace_all in KEEPING:
+            with self.subTest(old=old, new=new):
+                self.assertIsNone(self.validate(old, new, *replace_all))
+
+    def test_edits_removing_a_section_are_denied(self):
+        for old, new, section in REMOVING:
+            with self.subTest(old=old, new=new):
+                self.assertEqual(self.validate(old, new), f"Edit would remove required sections: {section}")
+
+    def test_check_task_file_denies_the_edit(self):
+        cwd = os.getcwd()
+        os.chdir(self.root)
+        self.addCleanup(os.chdir, cwd)
+        with mock.patch.dict(os.environ, {"S_CACHE_DIR": os.path.join(self.root, "cache")}):
+            result = task_files.check_task_file({"tool_name": "Edit", "tool_input": {
+                "file_path": self.path, "old_string": "## Review", "new_string": "## Feedback"}})
+            self.assertTrue(is_deny(result))
+            result = task_files.check_task_file({"tool_name": "Edit", "tool_input": {
+                "file_path": self.path, "old_string": "Pending.", "new_string": "Approved."}})
+            self.assertIsNone(result)
+
+class LargeTaskEditTest(TaskEditTest):
+    """The same edits on a task file mapped with mmap (MMAP_THRESHOLD and up)."""
+
+    padding = "\n## Log\n" + "- ran the nightly export, no errors\n" * 8000
+
+    def test_file_is_mapped(self):
+        self.assertGreaterEqual(os.path.getsize(self.path), task_files.MMAP_THRESHOLD)
+
+    def test_current_index_supplies_the_headings(self):
+        taskindex.update(self.dir)
+        with mock.patch.object(taskindex, "heading_offsets", side_effect=AssertionError("rescanned")):
+            self.assertIsNone(self.validate("Not started.", "Done."))
+            self.assertIsNotNone(self.validate("## Review", "## Feedback"))
+
+    def test_stale_index_is_not_trusted(self):
+        taskindex.update(self.dir)
+        with open(self.path, "a") as f:
+            f.write("\n## Extra\n")
+        with mock.patch.object(taskindex, "heading_offsets", wraps=taskindex.heading_offsets) as scan:
+            self.assertIsNotNone(self.validate("## Review", "## Feedback"))
+            scan.assert_called_once()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+"""Keyword matching on token boundaries, with plural folding."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from hooklib.keywords import KeywordMatcher
+
+def matched(keywords: list, text: str) -> list:
+    """Keywords (of group 0) that hit in text."""
+    matcher = KeywordMatcher()
+    for keyword in keywords:
+        matcher.add(keyword, 0)
+    scores = matcher.build().score(text)
+    return scores[0][1] if scores else []
+
+class KeywordMatcherTest(unittest.TestCase):
+    def test_short_keyword_needs_exact_token(self):
+        self.assertEqual(matched(["go"], "this goes to prod"), [])
+        self.assertEqual(matched(["go"], "a good idea"), [])
+        self.assertEqual(matched(["ts"], "write the requirements"), [])
+        self.assertEqual(matched(["go"], "rewrite it in Go"), ["go"])
+
+    def test_plural_folding(self):
+        self.assertEqual(matched(["requirement"], "list the requirements"), ["requirement"])
+        self.assertEqual(matched(["class"], "two classes"), ["class"])
+        self.assertEqual(matched(["story"], "user stories"), ["story"])
+
+    def test_singular_and_plural_count_once(self):
+        self.assertEqual(matched(["story"], "one story, many stories"), ["story"])
+
+if __name__ == "__main__":
+    unittest.main()
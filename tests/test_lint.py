@@ -0,0 +1,93 @@
+"""Bulk linter: a fixture task directory and skill root, in one process and across the pool."""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from hooklib import lint
+
+def task(task_id: str, sections=("Assignment", "Report", "Review")) -> str:
+    body = "".join(f"## {section}\nText.\n\n" for section in sections)
+    return f"# Task: {task_id} Export CSV\n\nStatus: Todo\n\n{body}"
+
+SKILL = """---
+name: frontend-react
+description: React components
+role: dev
+keywords: [react:3, component]
+---
+
+## Components
+Use function components.
+"""
+
+class LintTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tasks = os.path.join(tmp.name, "tasks")
+        self.skills = os.path.join(tmp.name, "skills")
+        os.makedirs(self.tasks)
+        self.write(self.tasks, "TRACKER.md", "# Tracker\n")
+        self.write(self.tasks, "task-001-export.md", task("TASK-001"))
+        self.write(self.tasks, "task-002-import.md", task("TASK-002"))
+        self.write(self.skills, "dev/frontend-react/SKILL.md", SKILL)
+
+    def write(self, directory: str, name: str, content: str):
+        path = os.path.join(directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def codes(self, result: dict) -> list:
+        return [(os.path.basename(p["path"]), p["code"]) for p in result["problems"]]
+
+    def test_clean_directory(self):
+        result = lint.lint(self.tasks, [self.skills], workers=1)
+        self.assertEqual(result["files"], 3)
+        self.assertEqual(result["problems"], [])
+        self.assertEqual((result["errors"], result["warnings"]), (0, 0))
+
+    def test_duplicate_id_and_missing_section(self):
+        self.write(self.tasks, "task-003-copy.md", task("TASK-001", ("Assignment", "Report")))
+        result = lint.lint(self.tasks, [self.skills], workers=1)
+        self.assertEqual(self.codes(result), [("task-003-copy.md", "duplicate-id"),
+                                              ("task-003-copy.md", "missing-sections"),
+                                              ("task-003-copy.md", "id-mismatch")])
+        problems = {p["code"]: p for p in result["problems"]}
+        self.assertIn("Review", problems["missing-sections"]["message"])
+        self.assertIn("task-001-export.md", problems["duplicate-id"]["message"])
+        self.assertEqual(problems["id-mismatch"]["line"], 1)
+        self.assertEqual((result["errors"], result["warnings"]), (2, 1))
+
+    def test_large_task_file_is_mapped(self):
+        checks = lint.task_checks()
+        padding = "x" * checks.MMAP_THRESHOLD + "\n\n"
+        self.write(self.tasks, "task-004-big.md", "# Task: TASK-004 Big\n\n" + padding + "## Assignment\n")
+        result = lint.lint(self.tasks, None, workers=1)
+        self.assertEqual(self.codes(result), [("task-004-big.md", "missing-sections")])
+
+    def test_skill_problems(self):
+        self.write(self.skills, "dev/copy/SKILL.md", SKILL)
+        self.write(self.skills, "SKILL.md", "---\nname: loose\nrole: chef\nkeywords: [a:b]\n---\nNo sections.\n")
+        result = lint.lint(None, [self.skills], workers=1)
+        self.assertEqual(sorted(self.codes(result)), [
+            ("SKILL.md", "bad-weight"), ("SKILL.md", "duplicate-skill"), ("SKILL.md", "no-description"),
+            ("SKILL.md", "no-sections"), ("SKILL.md", "unknown-role")])
+        unknown = next(p for p in result["problems"] if p["code"] == "unknown-role")
+        self.assertEqual(unknown["line"], 3)
+
+    def test_pool_gives_the_same_result(self):
+        self.write(self.tasks, "task-003-copy.md", task("TASK-001", ("Assignment",)))
+        serial = lint.lint(self.tasks, [self.skills], workers=1)
+        with mock.patch.object(lint, "POOL_MIN_FILES", 2):
+            pooled = lint.lint(self.tasks, [self.skills], workers=2)
+        self.assertEqual(pooled, serial)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""Hook telemetry: opt-in recording, buffered appends and rotation."""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from hooklib import metrics
+from hooklib.result import deny
+
+HOOK_INPUT = {"session_id": "s1", "hook_event_name": "PreToolUse", "tool_name": "Bash"}
+
+class MetricsTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, ".claude", metrics.METRICS_FILE)
+        for patcher in (mock.patch.object(metrics, "claude_dir", return_value=os.path.dirname(self.path)),
+                        mock.patch.object(metrics, "_atexit_registered", True),
+                        mock.patch.dict(os.environ, {"S_HOOK_METRICS": "1"})):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(metrics._buffer.clear)
+
+    def read(self) -> list:
+        with open(self.path) as f:
+            return [json.loads(line) for line in f]
+
+    def test_opt_in(self):
+        for value in ("", "0"):
+            with self.subTest(value=value), mock.patch.dict(os.environ, {"S_HOOK_METRICS": value}):
+                self.assertFalse(metrics.enabled())
+                self.assertEqual(metrics.timed("h", lambda hook_input: "ok", HOOK_INPUT), "ok")
+                self.assertEqual(metrics._buffer, [])
+        metrics.flush()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_timed_records_are_written_on_flush(self):
+        self.assertEqual(metrics.timed("enforce-write", lambda hook_input, extra: deny(extra),
+                                       HOOK_INPUT, "no", parse_ms=1.23456), deny("no"))
+        metrics.timed("inject-context", lambda hook_input: "context", HOOK_INPUT, event="UserPromptSubmit")
+        metrics.timed("audit", lambda hook_input: None, {})
+        self.assertFalse(os.path.exists(self.path))
+
+        metrics.flush()
+        records = self.read()
+        self.assertEqual([(r["hook"], r["event"], r["tool"], r["decision"]) for r in records], [
+            ("enforce-write", "PreToolUse", "Bash", "deny"),
+            ("inject-context", "UserPromptSubmit", "Bash", "context"),
+            ("audit", "", "", "none"),
+        ])
+        self.assertEqual(records[0]["parse_ms"], 1.235)
+        self.assertEqual(records[0]["output_bytes"], len(json.dumps(deny("no"))) + 1)
+        self.assertEqual(records[1]["output_bytes"], len("context") + 1)
+        self.assertEqual(metrics._buffer, [])
+
+        metrics.record("audit", HOOK_INPUT, {"systemMessage": "hi"}, 0, 0)
+        metrics.flush()
+        self.assertEqual(len(self.read()), 4)
+        self.assertEqual(self.read()[-1]["decision"], "message")
+
+    def test_rotation(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w") as f:
+            f.write("x" * (metrics.MAX_METRICS_BYTES + 1))
+        metrics.record("audit", HOOK_INPUT, None, 0, 0)
+        metrics.flush()
+        self.assertEqual(os.path.getsize(self.path + ".1"), metrics.MAX_METRICS_BYTES + 1)
+        self.assertEqual(len(self.read()), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+"""Lazy payload decoding must give exactly what json.loads gives."""
+
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from hooklib import payload
+
+def large_text(size: int) -> str:
+    """Text with every kind of escape, including backslash runs at chunk edges."""
+    pieces = ['line "quoted" \\ back\\\\slash \t tab / é ✓ 😀 \u0000 \n', "\\" * 7 + '"', "x" * 255 + "\\"]
+    text = ""
+    while len(text) < size:
+        text += "".join(pieces)
+    return text
+
+class PayloadTest(unittest.TestCase):
+    def write_payload(self, content: str) -> dict:
+        return {
+            "session_id": "s1",
+            "hook_event_name": "PreToolUse",
+            "tool_name": "Write",
+            "tool_input": {"file_path": "src/a \"b\".ts", "content": content,
+                           "lines": [content[:100]] * 2000, "nested": {"n": 1.5, "ok": True, "no": None}},
+        }
+
+    def test_matches_json_loads_on_a_large_payload(self):
+        value = self.write_payload(large_text(payload.MIN_LAZY_PAYLOAD * 2))
+        raw = json.dumps(value)
+        parsed = payload.parse(raw)
+        self.assertIsInstance(parsed, payload.LazyDict)
+        self.assertEqual(parsed, json.loads(raw))
+        self.assertEqual(json.loads(json.dumps(parsed)), value)  # key order may differ
+
+    def test_non_ascii_json_matches_too(self):
+        raw = json.dumps(self.write_payload(large_text(payload.MIN_LAZY_PAYLOAD)), ensure_ascii=False, indent=1)
+        self.assertEqual(payload.parse(raw), json.loads(raw))
+
+    def test_large_values_wait_until_read(self):
+        content = large_text(payload.MIN_LAZY_PAYLOAD)
+        parsed = payload.parse(json.dumps(self.write_payload(content)))
+        tool_input = parsed["tool_input"]
+        self.assertEqual(tool_input["file_path"], 'src/a "b".ts')
+        self.assertTrue(tool_input.is_pending("content"))
+        self.assertGreater(tool_input.raw_size("content"), payload.LAZY_BYTES)
+        self.assertIn("content", tool_input)
+        self.assertEqual(tool_input.get("content"), content)
+        self.assertFalse(tool_input.is_pending("content"))
+        self.assertEqual(tool_input.copy()["lines"], [content[:100]] * 2000)
+
+    def test_small_and_odd_payloads_use_json_loads(self):
+        for raw in ('{"tool_name": "Read"}', "[1, 2]", '"text"',
+                    "{" + '"a": "' + "x" * payload.MIN_LAZY_PAYLOAD + '"} trailing'):
+            with self.subTest(raw=raw[:30]):
+                try:
+                    expected = json.loads(raw)
+                except ValueError:
+                    self.assertRaises(ValueError, payload.parse, raw)
+                    continue
+                self.assertEqual(payload.parse(raw), expected)
+
+    def test_unterminated_payload_raises(self):
+        raw = '{"a": "' + "x" * payload.MIN_LAZY_PAYLOAD
+        self.assertRaises(ValueError, payload.parse, raw)
+
+if __name__ == "__main__":
+    unittest.main()
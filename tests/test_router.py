@@ -0,0 +1,149 @@
+"""Router dispatch: deny wins, failing checks, inline (daemon) mode and the watchdog."""
+
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stderr
+from unittest import mock
+
+SCRIPTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts")
+sys.path.insert(0, SCRIPTS)
+
+from hooklib import router
+from hooklib.result import deny, is_deny
+
+BASH = {"session_id": "", "tool_name": "Bash", "tool_input": {"command": "make"}}
+
+def reason(result) -> str:
+    """The reason of a deny decision."""
+    return result["hookSpecificOutput"]["permissionDecisionReason"]
+
+def start_in_reverse(count: int):
+    """A _thread.start_new_thread that runs the workers to the end, last started first."""
+    pending = []
+
+    def start(function, args):
+        pending.append((function, args))
+        if len(pending) == count:
+            for function, args in reversed(pending):
+                function(*args)
+    return start
+
+class RouterTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        for patcher in (
+            mock.patch.dict(os.environ, {"S_CACHE_DIR": tmp.name, "CLAUDE_PROJECT_DIR": tmp.name}),
+            mock.patch.object(router, "ROUTES", {}),
+            mock.patch.object(router, "get_check", lambda route: self.checks[route["check"]]),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.checks = {}
+
+    def add(self, name: str, check, fail: str = "closed", timeout: float = router.CHECK_TIMEOUT):
+        """Register a check for Bash under PreToolUse."""
+        self.checks[name] = check
+        router.register("PreToolUse", "enforce-write", name, tools=["Bash"], fail=fail, timeout=timeout)
+
+    def dispatch(self):
+        stderr = io.StringIO()
+        with redirect_stderr(stderr):
+            result = router.dispatch("PreToolUse", BASH)
+        return result, stderr.getvalue()
+
+    def test_deny_wins_over_other_results(self):
+        self.add("allow", lambda hook_input: None)
+        self.add("context", lambda hook_input: {"systemMessage": "note"})
+        self.add("deny", lambda hook_input: deny("no"))
+        result, _ = self.dispatch()
+        self.assertTrue(is_deny(result))
+        self.assertEqual(reason(result), "no")
+
+    def test_first_registered_deny_among_finished(self):
+        self.add("first", lambda hook_input: deny("first"))
+        self.add("second", lambda hook_input: deny("second"))
+        with mock.patch("_thread.start_new_thread", start_in_reverse(2)):
+            result, _ = self.dispatch()
+        self.assertEqual(reason(result), "first")
+
+    def test_check_that_raises_is_reported_and_skipped(self):
+        def broken(hook_input):
+            raise RuntimeError("boom")
+        self.add("broken", broken)
+        self.add("context", lambda hook_input: {"systemMessage": "note"})
+        result, stderr = self.dispatch()
+        self.assertEqual(result, {"systemMessage": "note"})
+        self.assertIn("boom", stderr)
+
+    def test_overrun_fails_closed(self):
+        self.add("slow", lambda hook_input: time.sleep(0.3), timeout=0.06)
+        result, stderr = self.dispatch()
+        self.assertTrue(is_deny(result))
+        self.assertIn("overran", stderr)
+
+    def test_overrun_fails_open(self):
+        self.add("slow", lambda hook_input: time.sleep(0.3) or deny("late"), fail="open", timeout=0.06)
+        result, _ = self.dispatch()
+        self.assertIsNone(result)
+
+class InlineRouterTest(RouterTest):
+    """The same behavior with checks run in the calling thread (hook daemon)."""
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(router, "INLINE", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_inline_stops_at_first_deny(self):
+        ran = []
+        self.add("first", lambda hook_input: ran.append("first") or deny("first"))
+        self.add("second", lambda hook_input: ran.append("second") or deny("second"))
+        result, _ = self.dispatch()
+        self.assertEqual(reason(result), "first")
+        self.assertEqual(ran, ["first"])
+
+    def test_watchdog_not_armed(self):
+        router.start_watchdog("PreToolUse", "Bash", "")
+        self.assertIsNone(router._answer)
+
+HANGING_ROUTER = """
+import sys, time
+sys.path.insert(0, sys.argv[1])
+from hooklib import router
+router.ROUTES.clear()
+router.register("PreToolUse", "enforce-write", "hang", tools=["Bash"], fail=sys.argv[2])
+router.get_check = lambda route: lambda hook_input: time.sleep(30)
+router.main(["hook-router", "PreToolUse"], watchdog=True)
+"""
+
+class WatchdogTest(unittest.TestCase):
+    def run_hanging(self, fail: str):
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ, S_HOOK_WATCHDOG_MS="200", S_CACHE_DIR=tmp, CLAUDE_PROJECT_DIR=tmp)
+            start = time.monotonic()
+            done = subprocess.run([sys.executable, "-c", HANGING_ROUTER, SCRIPTS, fail],
+                                  input=json.dumps(BASH), capture_output=True, text=True,
+                                  env=env, timeout=20)
+            return done, time.monotonic() - start
+
+    def test_hung_protection_check_is_denied(self):
+        done, elapsed = self.run_hanging("closed")
+        self.assertEqual(done.returncode, 0)
+        self.assertTrue(is_deny(json.loads(done.stdout)))
+        self.assertLess(elapsed, router.CHECK_TIMEOUT)
+
+    def test_hung_advisory_check_is_allowed(self):
+        done, elapsed = self.run_hanging("open")
+        self.assertEqual((done.returncode, done.stdout), (0, ""))
+        self.assertLess(elapsed, router.CHECK_TIMEOUT)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+"""Skill sections: splitting at headings, ranking against a prompt and packing under a budget."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from hooklib import sections
+
+SKILL = """---
+name: frontend-react
+keywords: [react]
+---
+React skill for components.
+
+## Forms
+Controlled inputs and validation for forms.
+
+```markdown
+## Not a heading
+```
+
+### Validation
+Validate on blur.
+
+## Styling
+CSS modules and themes.
+
+## Testing
+React Testing Library queries.
+"""
+
+class SplitTest(unittest.TestCase):
+    def test_split_sections(self):
+        found = sections.split_sections(SKILL)
+        self.assertEqual([(s["heading"], s["level"]) for s in found],
+                         [("", 0), ("Forms", 2), ("Validation", 3), ("Styling", 2), ("Testing", 2)])
+        self.assertNotIn("name:", found[0]["text"])
+        self.assertIn("## Not a heading", found[1]["text"])
+        self.assertEqual(found[2]["parent"], "## Forms")
+        self.assertIn("form", found[2]["heading_tokens"])
+        self.assertEqual(found[1]["size"], len(found[1]["text"].encode()))
+
+    def test_whitespace_and_case_do_not_change_the_hash(self):
+        a = sections.split_sections("## A\nSome   text\n")[0]
+        b = sections.split_sections("## a\n\nsome text\n\n")[0]
+        self.assertEqual(a["hash"], b["hash"])
+
+class RankTest(unittest.TestCase):
+    def test_prompt_terms(self):
+        terms = sections.prompt_terms("Please add validation to the forms", ["React", "tsx"])
+        self.assertEqual(terms, {"validation", "form", "react", "tsx"})
+
+    def test_pack_best_sections_first(self):
+        skill = sections.split_sections(SKILL)
+        terms = sections.prompt_terms("fix form validation", [])
+        picked = sections.pack_sections([("react", skill, terms)], budget=10_000)
+        self.assertEqual([skill[i]["heading"] for _, i in picked], ["", "Validation", "Forms"])
+
+    def test_pack_respects_the_budget(self):
+        skill = sections.split_sections(SKILL)
+        terms = sections.prompt_terms("fix form validation", [])
+        budget = skill[0]["size"] + skill[2]["size"]
+        picked = sections.pack_sections([("react", skill, terms)], budget)
+        self.assertEqual(picked, [("react", 0), ("react", 2)])
+        self.assertEqual(sections.pack_sections([("react", skill, terms)], 0), [])
+
+    def test_pack_skips_duplicates_across_skills(self):
+        skill = sections.split_sections(SKILL)
+        terms = sections.prompt_terms("styling themes", [])
+        picked = sections.pack_sections([("a", skill, terms), ("b", skill, terms)], budget=10_000)
+        self.assertEqual(picked, [("a", 0), ("a", 3)])
+
+    def test_pack_drops_weak_matches(self):
+        skill = sections.split_sections(SKILL)
+        terms = sections.prompt_terms("styling blur", ["modules", "themes", "css"])
+        picked = sections.pack_sections([("react", skill, terms)], budget=10_000)
+        self.assertEqual([skill[i]["heading"] for _, i in picked], ["", "Styling"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+"""Skill registry: SKILL.md frontmatter, roles from directories, user skill roots and reparsing."""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from hooklib import config, skillregistry
+
+REACT = """---
+name: frontend-react
+description: >
+  React components,
+  state and styling
+role: dev
+keywords: [react:3, "component", hook:x]
+---
+
+## Components
+Function components.
+"""
+
+# (frontmatter, expected)
+FRONTMATTER = [
+    ("---\nname: a\n---\n", {"name": "a"}),
+    ("---\nname: 'quoted'\nroles:\n  - dev\n  - tester\n---\n", {"name": "quoted", "roles": ["dev", "tester"]}),
+    ("---\nkeywords: [a, 'b c', ]\n# comment\nnote\n---\n", {"keywords": ["a", "b c"]}),
+    ("---\ndescription: |\n  one\n  two\n---\n", {"description": "one two"}),
+    ("no frontmatter\n", {}),
+    ("---\nname: unterminated\n", {}),
+]
+
+class FrontmatterTest(unittest.TestCase):
+    def test_parse_frontmatter(self):
+        for content, expected in FRONTMATTER:
+            with self.subTest(content=content):
+                self.assertEqual(skillregistry.parse_frontmatter(content), expected)
+
+    def test_parse_keywords(self):
+        self.assertEqual(skillregistry.parse_keywords("react:3, hook, tsx:0.5, a:b"),
+                         [{"keyword": "react", "weight": 3.0}, "hook",
+                          {"keyword": "tsx", "weight": 0.5}, "a:b"])
+        self.assertEqual(skillregistry.parse_keywords(None), [])
+
+    def test_skill_roles(self):
+        root = os.path.join(os.sep, "skills")
+        path = os.path.join(root, "Dev", "backend", "SKILL.md")
+        self.assertEqual(skillregistry.skill_roles({}, root, path), ["dev"])
+        self.assertEqual(skillregistry.skill_roles({"role": "Tester"}, root, path), ["tester"])
+        self.assertEqual(skillregistry.skill_roles({"roles": "dev, ba"}, root, path), ["dev", "ba"])
+        self.assertEqual(skillregistry.skill_roles({}, root, os.path.join(root, "SKILL.md")), [])
+
+class BuildTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.plugin = os.path.join(tmp.name, "plugin")
+        self.user = os.path.join(tmp.name, "user")
+        self.roots = [os.path.join(self.plugin, "skills"), self.user]
+        self.write(self.roots[0], "dev/frontend-react/SKILL.md", REACT)
+        self.write(self.roots[0], "dev/frontend-react/PATTERNS.md", "## Hooks\nCustom hooks.\n")
+        self.write(self.roots[0], "tech-lead/SKILL.md", "## Review\nCheck the design.\n")
+        self.write(self.roots[0], "dev/node_modules/x/SKILL.md", "## Ignored\n")
+        self.write(self.roots[0], "dev/.hidden/SKILL.md", "## Ignored\n")
+
+    def write(self, directory: str, name: str, content: str) -> str:
+        path = os.path.join(directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def test_build(self):
+        registry = skillregistry.build(self.plugin, roots=self.roots)
+        self.assertEqual(sorted(registry["roles"]), ["dev", "tech-lead"])
+        self.assertEqual(registry["reparsed"], 3)
+
+        dev = registry["roles"]["dev"]
+        self.assertEqual(dev["name"], "Developer")
+        react, = dev["skills"]
+        self.assertEqual(react["description"], "React components, state and styling")
+        self.assertEqual(react["keywords"], [{"keyword": "react", "weight": 3.0}, "component", "hook:x"])
+        self.assertEqual(react["companions"], [os.path.join(os.path.dirname(react["path"]), "PATTERNS.md")])
+        self.assertEqual([s["heading"] for s in registry["files"][react["companions"][0]]["sections"]],
+                         ["Hooks"])
+
+        lead, = registry["roles"]["tech-lead"]["skills"]
+        self.assertEqual((lead["name"], lead["keywords"]), ("tech-lead", ["tech", "lead"]))
+
+    def test_user_skill_overrides_plugin_skill(self):
+        self.write(self.user, "mine/SKILL.md", "---\nname: frontend-react\nrole: dev\n---\n## Mine\n")
+        self.write(self.user, "extra/SKILL.md", "---\nname: extra\nrole: tester\n---\n## Extra\n")
+        roles = skillregistry.build(self.plugin, roots=self.roots)["roles"]
+        react, = roles["dev"]["skills"]
+        self.assertTrue(react["path"].startswith(self.user))
+        self.assertEqual([s["name"] for s in roles["tester"]["skills"]], ["extra"])
+
+    def test_only_changed_files_are_reparsed(self):
+        first = skillregistry.build(self.plugin, roots=self.roots)
+        again = skillregistry.build(self.plugin, first["files"], self.roots)
+        self.assertEqual(again["reparsed"], 0)
+        self.assertEqual(again["roles"], first["roles"])
+
+        path = first["roles"]["tech-lead"]["skills"][0]["path"]
+        self.write(os.path.dirname(path), "SKILL.md", "---\nkeywords: [architecture]\n---\n## Review\nLonger.\n")
+        changed = skillregistry.build(self.plugin, first["files"], self.roots)
+        self.assertEqual(changed["reparsed"], 1)
+        self.assertEqual(changed["roles"]["tech-lead"]["skills"][0]["keywords"], ["architecture"])
+
+    def test_skill_roots(self):
+        path = os.path.join(self.plugin, "s-config.json")
+        with open(path, "w") as f:
+            json.dump({"skillDirs": [self.user, "team/skills", "", 3]}, f)
+        config._cache.clear()
+        self.addCleanup(config._cache.clear)
+        with mock.patch.object(config, "config_path", return_value=path), \
+                mock.patch("hooklib.project.get_project_root", return_value=self.plugin):
+            self.assertEqual(skillregistry.skill_roots(self.plugin),
+                             [self.roots[0], self.user, os.path.join(self.plugin, "team", "skills")])
+            with mock.patch.dict(os.environ, {"S_SKILL_DIRS": os.pathsep.join(["a", self.roots[0]])}):
+                self.assertEqual(skillregistry.skill_roots(self.plugin),
+                                 [self.roots[0], os.path.join(self.plugin, "a")])
+
+if __name__ == "__main__":
+    unittest.main()
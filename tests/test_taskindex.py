@@ -0,0 +1,101 @@
+"""Task index: indexing, deleted tasks, TRACKER.md rendering and section reads."""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from hooklib import taskindex
+
+TASK_ONE = """# TASK-001: Login form
+
+**Status:** In Progress
+
+## Requirements
+Email and password fields.
+
+## Acceptance Criteria
+- [ ] Errors are shown inline
+"""
+
+TASK_TWO = """# TASK-002: Logout | cleanup
+
+Status: Done
+
+## Requirements
+Clear the session.
+"""
+
+class TaskIndexTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = os.path.join(tmp.name, ".claude", "tasks")
+        os.makedirs(self.dir)
+        self.write("task-001-login.md", TASK_ONE)
+        self.write("task-002-logout.md", TASK_TWO)
+
+    def write(self, name: str, text: str):
+        with open(os.path.join(self.dir, name), "w") as f:
+            f.write(text)
+
+    def tracker(self) -> str:
+        with open(os.path.join(self.dir, taskindex.TRACKER_FILE)) as f:
+            return f.read()
+
+    def test_indexes_every_task(self):
+        index = taskindex.update(self.dir)
+        self.assertEqual(sorted(index["tasks"]), ["task-001-login.md", "task-002-logout.md"])
+        entry = index["tasks"]["task-001-login.md"]
+        self.assertEqual((entry["id"], entry["title"], entry["status"]),
+                         ("TASK-001", "Login form", "In Progress"))
+        self.assertEqual(list(entry["sections"]), ["Requirements", "Acceptance Criteria"])
+        self.assertEqual(taskindex.read_index(self.dir), index)
+
+    def test_deleted_task_is_dropped(self):
+        taskindex.update(self.dir)
+        os.remove(os.path.join(self.dir, "task-002-logout.md"))
+        index = taskindex.update(self.dir, ["task-002-logout.md"])
+        self.assertEqual(list(index["tasks"]), ["task-001-login.md"])
+        self.assertNotIn("TASK-002", self.tracker())
+
+    def test_changed_task_is_reindexed(self):
+        taskindex.update(self.dir)
+        self.write("task-001-login.md", TASK_ONE.replace("In Progress", "Done"))
+        index = taskindex.update(self.dir, ["task-001-login.md"])
+        self.assertEqual(index["tasks"]["task-001-login.md"]["status"], "Done")
+        self.assertIn("Done: 2", self.tracker())
+
+    def test_tracker_keeps_text_outside_the_markers(self):
+        self.write(taskindex.TRACKER_FILE, "# Sprint 4\n\nNotes before.\n")
+        taskindex.update(self.dir)
+        with open(os.path.join(self.dir, taskindex.TRACKER_FILE), "a") as f:
+            f.write("\nNotes after.\n")
+
+        self.write("task-003-signup.md", "# TASK-003: Signup\n\nStatus: Todo\n")
+        taskindex.update(self.dir, ["task-003-signup.md"])
+        tracker = self.tracker()
+        self.assertTrue(tracker.startswith("# Sprint 4\n\nNotes before.\n"))
+        self.assertTrue(tracker.endswith("\nNotes after.\n"))
+        self.assertEqual(tracker.count(taskindex.TRACKER_BEGIN), 1)
+        self.assertIn("| TASK-003 | Signup | Todo |", tracker)
+        self.assertIn("| TASK-002 | Logout \\| cleanup | Done |", tracker)
+
+    def test_unchanged_tracker_is_not_rewritten(self):
+        taskindex.update(self.dir)
+        block = taskindex.render_tracker_block(taskindex.read_index(self.dir))
+        self.assertFalse(taskindex.write_tracker(self.dir, block))
+
+    def test_read_section_uses_byte_ranges(self):
+        self.write("task-004-i18n.md", "# TASK-004: Übersetzung ✓\n\n## Notes\nÄnderungen\n\n## Done\nyes\n")
+        index = taskindex.update(self.dir)
+        name, entry = taskindex.find_task(index, "task-4")
+        self.assertEqual(name, "task-004-i18n.md")
+        self.assertEqual(taskindex.read_section(self.dir, name, entry, "notes"), "## Notes\nÄnderungen\n\n")
+        self.assertEqual(taskindex.read_section(self.dir, name, entry, "Done"), "## Done\nyes\n")
+        self.assertIsNone(taskindex.read_section(self.dir, name, entry, "Missing"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+"""Session verdict cache: writes only on new verdicts, counts every tool call."""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from hooklib import loader, verdicts
+
+class VerdictCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.dict(os.environ, {"S_CACHE_DIR": self.tmp.name,
+                                               "CLAUDE_PROJECT_DIR": self.tmp.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_hit_does_not_rewrite_the_file(self):
+        state = verdicts.load("session")
+        verdicts.count(state, hit=False)
+        verdicts.store(state, "key", {"decision": "allow"})
+        verdicts.save(state)
+        path = verdicts.verdicts_path("session")
+        written = os.stat(path).st_mtime_ns
+        os.utime(path, ns=(written - 10**9, written - 10**9))
+
+        state = verdicts.load("session")
+        self.assertEqual(verdicts.lookup(state, "key"), (True, {"decision": "allow"}))
+        verdicts.count(state, hit=True)
+        verdicts.save(state)
+        self.assertEqual(os.stat(path).st_mtime_ns, written - 10**9)
+
+        stats = verdicts.stats("session")
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 1, 1))
+
+    def test_scripts_listed_once_per_generation(self):
+        verdicts.scripts_signature()
+        with mock.patch("os.scandir") as scandir:
+            verdicts.scripts_signature()
+            scandir.assert_not_called()
+        with mock.patch.object(loader, "generation", loader.generation + 1):
+            with mock.patch("os.scandir", wraps=os.scandir) as scandir:
+                verdicts.scripts_signature()
+                self.assertTrue(scandir.called)
+
+if __name__ == "__main__":
+    unittest.main()